@@ -1,4 +1,5 @@
 # Agents package initialization
 from .robot_agent import RobotAgent
+from .population import AgentPopulation
 
-__all__ = ['RobotAgent']
\ No newline at end of file
+__all__ = ['RobotAgent', 'AgentPopulation']
@@ -1,32 +1,191 @@
 # Communication protocols for multi-agent system
 
+from collections import deque
+from utils.spatial_hash import SpatialHash
+from utils.tracing import NULL_TRACER
+
 class Message:
     """Message object for agent communication"""
-    def __init__(self, sender_id, message_type, content, timestamp):
+    def __init__(self, sender_id, message_type, content, timestamp, sequence=None, recipients=None):
         self.sender_id = sender_id
         self.message_type = message_type
         self.content = content
         self.timestamp = timestamp
-        self.read_by = set()
+        self.sequence = sequence  # Position in the broadcast log (None for direct messages)
+        self.recipients = recipients  # Agent ids in range when broadcast (None = everyone)
+    
+    @property
+    def is_batch(self):
+        """True for a merged batch of reports (see CommunicationProtocol.flush)"""
+        return self.sender_id is None
+    
+    def reports_for(self, agent_id):
+        """
+        Report contents of this message meant for an agent.
+        A plain message is a single report; a batch holds one report per
+        reported cell (the first reporter's content), minus those the agent
+        was not reached by. A report's recipients are None (every agent but
+        its sender) or the exact set of agents it informs.
+        
+        Returns:
+            List of content dicts (each with 'position', 'agent_id', ...)
+        """
+        if not self.is_batch:
+            return [self.content]
+        return [content for sender_id, recipients, content in self.content['reports']
+                if (sender_id != agent_id if recipients is None else agent_id in recipients)]
     
     def __repr__(self):
         return f"Message(from={self.sender_id}, type={self.message_type}, content={self.content})"
 
 
+OVERFLOW_POLICIES = ('block', 'drop_oldest_read', 'coalesce')
+BATCHED_TYPES = ('DEAD_END', 'WRONG_PATH')  # Position reports merged into per-step batches
+PRIORITY_TYPES = ('EXIT_FOUND',)  # Never held back: room is made (or the ring grows) for these
+
+
 class CommunicationProtocol:
     """
-    Communication protocol for agent-to-agent messaging
+    Communication protocol for agent-to-agent messaging.
+    Broadcasts live in a fixed-capacity ring buffer. A message counts as read
+    once every registered agent's cursor has moved past it; unread messages
+    are never dropped - a full buffer is handled by the overflow policy:
+        'block'            hold the send in a queue until readers have made
+                           room; held messages are published, in order, by
+                           end_step() / clear_old_messages()
+        'drop_oldest_read' evict the oldest message if everyone has read it,
+                           otherwise block
+        'coalesce'         fold a DEAD_END/WRONG_PATH/... message into a
+                           retained one with the same type, position and
+                           trap flag, otherwise behave like 'drop_oldest_read'
+    PRIORITY_TYPES (EXIT_FOUND) are never held: they evict a read message
+    if there is one and otherwise grow the ring.
+    With a comm_range, broadcasts are range-limited: a spatial hash of agent
+    positions (kept current through update_position) picks the agents within
+    comm_range of the sender, and only they receive the message.
+    With a coalesce_window, DEAD_END/WRONG_PATH reports are deduplicated by
+    (type, position, is_trap) whoever sends them: a report whose cell was
+    already reported to the same agents within the window is dropped, and
+    reports of one cell in the same step merge into a single entry reaching
+    the union of their recipients. The rest are merged into one batch
+    message per type, published by flush() at the end of each step.
     """
     
-    def __init__(self):
+    def __init__(self, capacity=256, overflow_policy='drop_oldest_read', comm_range=None,
+                 coalesce_window=None, tracer=None):
         """
         Initialize communication protocol
+        
+        Args:
+            capacity: Maximum number of retained broadcasts
+            overflow_policy: What to do when a broadcast finds the buffer full
+                             (one of OVERFLOW_POLICIES)
+            comm_range: Manhattan broadcast radius (None = unlimited range)
+            coalesce_window: Steps during which a repeated report is suppressed
+                             (None = no deduplication or batching)
+            tracer: EventTracer recording published broadcasts (None = no tracing)
         """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow_policy}' (expected one of {OVERFLOW_POLICIES})")
         self.message_queue = []
-        self.broadcast_messages = []  # Messages sent to all agents
         self.direct_messages = {}  # Direct messages to specific agents
         self.message_counter = 0
         
+        # Broadcast ring: sequence numbers broadcast_base .. broadcast_seq - 1
+        # are retained, message n sits in slot n % capacity. Each agent only
+        # keeps the sequence number of the first broadcast it has not read yet.
+        self.capacity = capacity
+        self.overflow_policy = overflow_policy
+        self._ring = [None] * capacity
+        self.broadcast_base = 0
+        self.broadcast_seq = 0
+        self.read_cursors = {}  # agent_id -> next unread sequence number
+        self._coalesce_index = {}  # (message_type, position, is_trap) -> sequence of retained message
+        
+        # Overflow counters
+        self.dropped_read = 0  # Read messages evicted to make room
+        self.blocked_sends = 0  # Broadcasts held because the buffer was full of unread messages
+        self.grown = 0  # Times the ring grew to fit a priority message
+        self._held = deque()  # Blocked broadcasts waiting for room, oldest first
+        self.coalesced = 0  # Broadcasts folded into an already retained message
+        self.expired = 0  # Read messages evicted by clear_old_messages
+        
+        # Range-limited delivery
+        self.comm_range = comm_range
+        self.spatial_index = SpatialHash(comm_range) if comm_range is not None else None
+        
+        # Report deduplication and batching
+        self.coalesce_window = coalesce_window
+        self.step = 0
+        self._recent_reports = {}  # (type, position, is_trap) -> (step last reported, recipients covered)
+        self._pending_reports = {}  # message_type -> {(type, position, is_trap): [sender_id, recipients, content]}
+        self.deduplicated = 0  # Reports suppressed as repeats or merged into one from another sender
+        self.batched = 0  # Reports delivered inside batch messages
+        
+        self.tracer = NULL_TRACER if tracer is None else tracer
+    
+    @property
+    def broadcast_messages(self):
+        """Retained broadcast messages, oldest first"""
+        return self._slice(self.broadcast_base)
+    
+    def _slice(self, start):
+        """Retained broadcasts from sequence number `start` on"""
+        ring, capacity = self._ring, self.capacity
+        return [ring[seq % capacity] for seq in range(start, self.broadcast_seq)]
+    
+    def register_agent(self, agent_id, position=None):
+        """Add a reader; it receives only broadcasts sent from now on"""
+        self.read_cursors[agent_id] = self.broadcast_seq
+        if position is not None:
+            self.update_position(agent_id, position)
+    
+    def retire_agent(self, agent_id):
+        """Remove a reader that will never read again (escaped or dead)"""
+        self.read_cursors.pop(agent_id, None)
+        if self.spatial_index is not None:
+            self.spatial_index.remove(agent_id)
+    
+    def update_position(self, agent_id, position):
+        """Record an agent's position for range-limited delivery"""
+        if self.spatial_index is not None:
+            self.spatial_index.update(agent_id, position[0], position[1])
+    
+    def agents_in_range(self, position):
+        """
+        Agents within comm_range of a position (every known reader if unlimited)
+        
+        Returns:
+            List of agent ids
+        """
+        if self.spatial_index is None:
+            return list(self.read_cursors)
+        return self.spatial_index.query(position[0], position[1], self.comm_range)
+    
+    def _read_watermark(self):
+        """Sequence number below which every registered agent has read everything"""
+        return min(self.read_cursors.values(), default=self.broadcast_seq)
+    
+    def _evict_oldest(self):
+        """Drop the oldest retained broadcast"""
+        seq = self.broadcast_base
+        slot = seq % self.capacity
+        message = self._ring[slot]
+        self._ring[slot] = None
+        self.broadcast_base += 1
+        key = self._coalesce_key(message)
+        if key is not None and self._coalesce_index.get(key) == seq:
+            del self._coalesce_index[key]
+    
+    @staticmethod
+    def _coalesce_key(message):
+        """Messages with equal keys carry the same news (e.g. one DEAD_END cell)"""
+        content = message.content
+        position = content.get('position') if isinstance(content, dict) else None
+        if position is None:
+            return None
+        return (message.message_type, position, bool(content.get('is_trap')))
+        
     def send_message(self, sender_id, receiver_id, message_type, content):
         """
         Send a direct message from one agent to another
@@ -48,22 +207,187 @@ class CommunicationProtocol:
     
     def broadcast(self, sender_id, message_type, content):
         """
-        Broadcast message to all agents
+        Broadcast message to all agents (those within comm_range in range-limited mode)
         
         Args:
             sender_id: ID of sending agent
             message_type: Type of message (DEAD_END, EXIT_FOUND, WRONG_PATH, etc.)
             content: Message content (position, path, etc.)
+            
+        Returns:
+            The retained Message, or None if the send was held until there
+            is room, was suppressed as a repeat or was queued for the next batch
         """
-        message = Message(sender_id, message_type, content, self.message_counter)
+        recipients = self._recipients_of(sender_id)
+        
+        if (self.coalesce_window is not None and message_type in BATCHED_TYPES
+                and content.get('position') is not None):
+            report_key = (message_type, content['position'], bool(content.get('is_trap')))
+            reach = (None if recipients is None else recipients - {sender_id}, sender_id)
+            recent = self._recent_reports.get(report_key)
+            if recent is not None and self.step - recent[0] < self.coalesce_window:
+                informed = recent[1]
+                if self._reach_covers(informed, reach):
+                    # Every agent this report would reach has already heard about the cell
+                    self.deduplicated += 1
+                    return None
+                # Only tell the agents that have not heard about it yet
+                news = (self._reach_set(reach) - self._reach_set(informed), sender_id)
+                self._recent_reports[report_key] = (self.step, self._merge_reach(informed, reach))
+                if not news[0]:  # Only retired agents were left out
+                    self.deduplicated += 1
+                    return None
+            else:
+                news = reach
+                self._recent_reports[report_key] = (self.step, reach)
+            
+            pending = self._pending_reports.setdefault(message_type, {})
+            entry = pending.get(report_key)
+            if entry is None:
+                pending[report_key] = [sender_id, news[0], content]
+            else:
+                # Same cell reported by another agent this step - one entry, wider reach
+                entry[1] = self._merge_reach((entry[1], entry[0]), news)[0]
+                self.deduplicated += 1
+            return None
+        
+        return self._publish(Message(sender_id, message_type, content, self.message_counter,
+                                     self.broadcast_seq, recipients))
+    
+    def _reach_set(self, reach):
+        """Explicit set of agents a (recipients, sender) reach informs"""
+        recipients, sender_id = reach
+        if recipients is None:
+            return frozenset(self.read_cursors) - {sender_id}
+        return recipients
+    
+    def _merge_reach(self, first, second):
+        """(recipients, sender) reach informing everyone either one informs"""
+        if first[0] is None and second[0] is None and first[1] == second[1]:
+            return first
+        return (self._reach_set(first) | self._reach_set(second), first[1])
+    
+    @staticmethod
+    def _reach_covers(informed, reach):
+        """True if every agent `reach` informs is already in `informed`"""
+        (covered, covered_sender), (recipients, sender_id) = informed, reach
+        if covered is None:
+            if recipients is None:
+                return sender_id == covered_sender
+            return covered_sender not in recipients
+        return recipients is not None and recipients <= covered
+    
+    def _recipients_of(self, sender_id):
+        """Ids a broadcast from sender_id reaches (None = everyone)"""
+        if self.spatial_index is None or sender_id not in self.spatial_index:
+            return None
+        return frozenset(self.agents_in_range(self.spatial_index.positions[sender_id]))
+    
+    def _grow(self):
+        """Double the ring capacity, keeping every retained message"""
+        retained = self._slice(self.broadcast_base)
+        self.capacity *= 2
+        self._ring = [None] * self.capacity
+        for seq, message in enumerate(retained, self.broadcast_base):
+            self._ring[seq % self.capacity] = message
+        self.grown += 1
+    
+    def _publish(self, message):
+        """Append a message to the broadcast ring, applying the overflow policy"""
+        recipients = message.recipients
+        key = self._coalesce_key(message)
+        priority = message.message_type in PRIORITY_TYPES
+        
+        if self._held and not priority:
+            # Keep broadcast order: nothing overtakes a held message
+            self._held.append(message)
+            self.blocked_sends += 1
+            return None
+        
+        if self.broadcast_seq - self.broadcast_base >= self.capacity:
+            # Buffer full - apply the overflow policy, never dropping unread messages
+            retained = None
+            if self.overflow_policy == 'coalesce' and key in self._coalesce_index:
+                retained = self._ring[self._coalesce_index[key] % self.capacity]
+            if retained is not None and (retained.recipients is None or
+                                         (recipients is not None and recipients <= retained.recipients)):
+                # Same news already on its way to (at least) the same agents
+                self.coalesced += 1
+                return retained
+            if ((self.overflow_policy != 'block' or priority)
+                    and self.broadcast_base < self._read_watermark()):
+                self._evict_oldest()
+                self.dropped_read += 1
+            elif priority:
+                self._grow()
+            else:
+                self._held.append(message)
+                self.blocked_sends += 1
+                return None
+        
+        return self._append(message)
+    
+    def _append(self, message):
+        """Write a message into the next ring slot (the caller made room)"""
+        key = self._coalesce_key(message)
         self.message_counter += 1
-        self.broadcast_messages.append(message)
+        message.sequence = self.broadcast_seq
+        self._ring[self.broadcast_seq % self.capacity] = message
+        if key is not None:
+            self._coalesce_index[key] = self.broadcast_seq
+        if message.sender_id is not None and self.read_cursors.get(message.sender_id) == self.broadcast_seq:
+            # Senders never receive their own broadcasts - a caught-up sender stays caught up
+            self.read_cursors[message.sender_id] += 1
+        self.broadcast_seq += 1
+        if self.tracer.broadcast:
+            self.tracer.record_broadcast(message)
         
         return message
     
+    def flush(self):
+        """Publish the queued reports as one batch message per type"""
+        pending, self._pending_reports = self._pending_reports, {}
+        for message_type, entries in pending.items():
+            reports = [tuple(entry) for entry in entries.values()]
+            if any(recipients is None for _, recipients, _ in reports):
+                recipients = None
+            else:
+                recipients = frozenset().union(*(recipients for _, recipients, _ in reports))
+            content = {
+                'positions': [report['position'] for _, _, report in reports],
+                'reports': reports,
+            }
+            self.batched += len(reports)
+            self._publish(Message(None, message_type, content, self.message_counter,
+                                  self.broadcast_seq, recipients))
+    
+    def _release_held(self):
+        """Publish held broadcasts, oldest first, while there is room for them"""
+        held = self._held
+        while held:
+            if self.broadcast_seq - self.broadcast_base >= self.capacity:
+                if self.overflow_policy == 'block' or self.broadcast_base >= self._read_watermark():
+                    return
+                self._evict_oldest()
+                self.dropped_read += 1
+            self._append(held.popleft())
+    
+    def end_step(self):
+        """Publish held broadcasts and this step's batches, advance the deduplication clock"""
+        self._release_held()
+        self.flush()
+        self.step += 1
+        window = self.coalesce_window
+        if window and self.step % window == 0:
+            self._recent_reports = {key: recent for key, recent in self._recent_reports.items()
+                                    if self.step - recent[0] < window}
+    
     def receive_messages(self, agent_id):
         """
-        Retrieve unread messages for a specific agent
+        Retrieve unread messages for a specific agent.
+        Only registered readers receive broadcasts: an unknown or retired
+        agent gets its direct messages only, and no cursor is created for
+        it, so it never holds ring slots it will not read.
         
         Args:
             agent_id: ID of the agent
@@ -71,13 +395,18 @@ class CommunicationProtocol:
         Returns:
             List of messages for this agent
         """
-        messages = []
+        if self._pending_reports:
+            self.flush()
         
-        # Get broadcast messages not yet read by this agent
-        for msg in self.broadcast_messages:
-            if agent_id not in msg.read_by and msg.sender_id != agent_id:
-                messages.append(msg)
-                msg.read_by.add(agent_id)
+        # Get broadcast messages not yet read by this agent: everything from
+        # its cursor on (or from the oldest retained message, if older ones
+        # were already cleared), minus its own broadcasts
+        messages = []
+        cursor = self.read_cursors.get(agent_id)
+        if cursor is not None:
+            messages = [msg for msg in self._slice(max(cursor, self.broadcast_base))
+                        if msg.sender_id != agent_id and (msg.recipients is None or agent_id in msg.recipients)]
+            self.read_cursors[agent_id] = self.broadcast_seq
         
         # Get direct messages
         if agent_id in self.direct_messages:
@@ -88,9 +417,37 @@ class CommunicationProtocol:
     
     def get_recent_broadcasts(self, count=10):
         """Get recent broadcast messages"""
-        return self.broadcast_messages[-count:] if self.broadcast_messages else []
+        return self._slice(max(self.broadcast_base, self.broadcast_seq - count))
     
     def clear_old_messages(self, max_age=100):
-        """Clear old messages to prevent memory buildup"""
-        if len(self.broadcast_messages) > max_age:
-            self.broadcast_messages = self.broadcast_messages[-max_age:]
+        """
+        Clear old messages to prevent memory buildup.
+        Keeps at most max_age broadcasts (and at most half the capacity, so
+        held broadcasts find room), but only evicts messages every
+        registered agent has already read. Held broadcasts that now fit are
+        published.
+        """
+        keep = min(max_age, self.capacity // 2)
+        excess = min(self.broadcast_seq - self.broadcast_base - keep,
+                     self._read_watermark() - self.broadcast_base)
+        for _ in range(excess):
+            self._evict_oldest()
+            self.expired += 1
+        self._release_held()
+    
+    def get_stats(self):
+        """Broadcast buffer occupancy and overflow counters"""
+        return {
+            'retained': self.broadcast_seq - self.broadcast_base,
+            'capacity': self.capacity,
+            'overflow_policy': self.overflow_policy,
+            'dropped_read': self.dropped_read,
+            'blocked_sends': self.blocked_sends,
+            'held': len(self._held),
+            'grown': self.grown,
+            'coalesced': self.coalesced,
+            'expired': self.expired,
+            'deduplicated': self.deduplicated,
+            'batched': self.batched,
+        }
+
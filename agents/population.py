@@ -0,0 +1,125 @@
+# agents/population.py
+
+import numpy as np
+
+# Status bits (one uint8 per agent)
+REACHED_EXIT = 0x01
+DEAD = 0x02
+EVACUATING = 0x04
+FINISHED = REACHED_EXIT | DEAD  # Agent no longer acts
+
+NO_POSITION = -1  # last_x / last_y value before the first move
+
+# Per-agent arrays (one element per agent)
+FIELDS = ('x', 'y', 'last_x', 'last_y', 'energy', 'max_energy', 'status',
+          'stuck_counter', 'stuck_in_loop_counter', 'nodes_expanded', 'exit_step')
+
+
+class AgentPopulation:
+    """
+    Struct-of-arrays store for the per-agent scalar state of a swarm.
+    Row i holds agent i's position, previous position, energy, status bits and
+    counters, so swarm-wide questions (who is active, has anyone reached the
+    exit, where is everybody) are single NumPy operations instead of a walk
+    over thousands of objects. RobotAgent reads and writes its row through
+    properties, so agent code is unchanged.
+    """
+
+    def __init__(self, size, start_x, start_y, energy):
+        """
+        Initialize the population
+
+        Args:
+            size: Number of agents
+            start_x: Starting X coordinate for every agent
+            start_y: Starting Y coordinate for every agent
+            energy: Starting (and maximum) energy for every agent
+        """
+        self.size = size
+        self.x = np.full(size, start_x, dtype=np.int32)
+        self.y = np.full(size, start_y, dtype=np.int32)
+        self.last_x = np.full(size, NO_POSITION, dtype=np.int32)
+        self.last_y = np.full(size, NO_POSITION, dtype=np.int32)
+        self.energy = np.full(size, energy, dtype=np.int32)
+        self.max_energy = np.full(size, energy, dtype=np.int32)
+        self.status = np.zeros(size, dtype=np.uint8)
+        self.stuck_counter = np.zeros(size, dtype=np.int32)
+        self.stuck_in_loop_counter = np.zeros(size, dtype=np.int32)
+        self.nodes_expanded = np.zeros(size, dtype=np.int64)
+        self.exit_step = np.full(size, NO_POSITION, dtype=np.int32)  # Step the exit was reached (-1 = not yet)
+
+    def __len__(self):
+        return self.size
+    
+    def view(self, start, stop):
+        """
+        Population of agents start .. stop - 1 sharing this population's
+        memory: writes through either one are seen by both. Lets several
+        simulations keep their agents in one stacked population.
+        """
+        sub = AgentPopulation.__new__(AgentPopulation)
+        sub.size = stop - start
+        for field in FIELDS:
+            setattr(sub, field, getattr(self, field)[start:stop])
+        return sub
+
+    def set_status(self, index, bit, value):
+        """Set or clear one status bit of agent `index`"""
+        if value:
+            self.status[index] |= bit
+        else:
+            self.status[index] &= 0xFF ^ bit
+
+    def has_status(self, index, bit):
+        """Check one status bit of agent `index`"""
+        return bool(self.status[index] & bit)
+
+    def active_mask(self):
+        """Boolean array: True for agents that have neither escaped nor died"""
+        return (self.status & FINISHED) == 0
+
+    def active_indices(self):
+        """Indices of active agents, in ascending order"""
+        return np.flatnonzero(self.active_mask())
+
+    def indices_with(self, bit):
+        """Indices of agents with a status bit set, in ascending order"""
+        return np.flatnonzero(self.status & bit)
+
+    def count(self, bit):
+        """Number of agents with a status bit set"""
+        return int(np.count_nonzero(self.status & bit))
+
+    def all_finished(self):
+        """True when every agent has either reached the exit or died"""
+        return bool(np.all(self.status & FINISHED))
+
+    def record_arrivals(self, step):
+        """Stamp `step` on agents that reached the exit since the last call; returns how many"""
+        arrived = ((self.status & REACHED_EXIT) != 0) & (self.exit_step < 0)
+        self.exit_step[arrived] = step
+        return int(np.count_nonzero(arrived))
+
+    def move(self, indices, xs, ys):
+        """Move agents `indices` to (xs, ys), remembering where each came from"""
+        self.last_x[indices] = self.x[indices]
+        self.last_y[indices] = self.y[indices]
+        self.x[indices] = xs
+        self.y[indices] = ys
+
+    def positions(self):
+        """(size, 2) array of current (x, y) positions"""
+        return np.column_stack((self.x, self.y))
+
+    def reset(self, start_x, start_y):
+        """Put every agent back at the start with full energy and cleared state"""
+        self.x.fill(start_x)
+        self.y.fill(start_y)
+        self.last_x.fill(NO_POSITION)
+        self.last_y.fill(NO_POSITION)
+        self.energy[:] = self.max_energy
+        self.status.fill(0)
+        self.stuck_counter.fill(0)
+        self.stuck_in_loop_counter.fill(0)
+        self.nodes_expanded.fill(0)
+        self.exit_step.fill(NO_POSITION)
@@ -2,24 +2,105 @@
 
 import random
 from collections import deque
+from types import MappingProxyType
+from agents.population import AgentPopulation, REACHED_EXIT, DEAD, EVACUATING, FINISHED, NO_POSITION
+from coordination.evacuation import EvacuationField
+from coordination.exit_path import ExitPath
+from environment.cell import WALL, EXIT, DEAD_END, TRAP
+from utils.pathfinding import find_path
+from utils.tracing import NULL_TRACER
+
+# Local map entry per cell flag byte, shared read-only by all agents so
+# perception does not build a fresh dict for every visible cell
+_LOCAL_MAP_ENTRIES = tuple(
+    MappingProxyType({'is_wall': bool(flags & WALL), 'is_exit': bool(flags & EXIT)})
+    for flags in range(256)
+)
+
+
+def _population_property(field, doc):
+    """Property reading/writing this agent's row of an AgentPopulation array"""
+    def getter(self):
+        return getattr(self.population, field).item(self.index)
+
+    def setter(self, value):
+        getattr(self.population, field)[self.index] = value
+
+    return property(getter, setter, doc=doc)
+
+
+def _status_property(bit, doc):
+    """Property exposing one AgentPopulation status bit as a bool"""
+    def getter(self):
+        return bool(self.population.status.item(self.index) & bit)
+
+    def setter(self, value):
+        self.population.set_status(self.index, bit, value)
+
+    return property(getter, setter, doc=doc)
+
 
 class RobotAgent:
     """
     Individual robot agent that explores the maze.
     Features: local memory, energy management, communication capability.
+    Scalar state (position, energy, status, counters) lives in a shared
+    AgentPopulation row; an agent created on its own gets a population of one.
     """
     
-    def __init__(self, agent_id, start_x, start_y, energy, vision_range, comm_range):
+    __slots__ = (
+        'id', 'population', 'index', 'vision_range', 'communication_range', 'search_algorithm',
+        'path_history', 'visit_counts', 'local_map', 'current_target', 'backtrack_positions', 'recent_positions',
+        'known_dead_ends', 'known_wrong_paths', 'known_traps', 'exit_location', 'exit_path',
+        'exit_field', 'received_messages', 'tracer',
+    )
+    
+    x = _population_property('x', "Current X coordinate")
+    y = _population_property('y', "Current Y coordinate")
+    energy = _population_property('energy', "Remaining energy")
+    max_energy = _population_property('max_energy', "Starting energy")
+    stuck_counter = _population_property('stuck_counter', "Steps without progress")
+    stuck_in_loop_counter = _population_property('stuck_in_loop_counter', "Count how many steps we've been in same area")
+    nodes_expanded = _population_property('nodes_expanded', "Total search nodes expanded by this agent's BFS calls")
+    reached_exit = _status_property(REACHED_EXIT, "True once the agent stands on the exit")
+    is_dead = _status_property(DEAD, "True when agent enters a dead end (permanent death)")
+    should_evacuate = _status_property(EVACUATING, "True when exit is found by any agent")
+    
+    def __init__(self, agent_id, start_x, start_y, energy, vision_range, comm_range,
+                 search_algorithm='bfs', population=None, index=None, tracer=None):
+        """
+        Initialize the agent
+
+        Args:
+            agent_id: Unique agent id
+            start_x, start_y: Starting position
+            energy: Starting energy
+            vision_range: Perception radius
+            comm_range: Communication radius (None = unlimited)
+            search_algorithm: utils.pathfinding algorithm name
+            population: Shared AgentPopulation holding this agent's scalar state
+                        (a private population of one is created if omitted)
+            index: Row of this agent in the population (defaults to agent_id)
+            tracer: EventTracer for death/evacuation/oscillation events (None = no tracing)
+        """
         self.id = agent_id
+        if population is None:
+            population = AgentPopulation(1, start_x, start_y, energy)
+            index = 0
+        self.population = population
+        self.index = agent_id if index is None else index
+        
         self.x = start_x
         self.y = start_y
         self.energy = energy
         self.max_energy = energy
         self.vision_range = vision_range
         self.communication_range = comm_range
+        self.search_algorithm = search_algorithm  # utils.pathfinding algorithm name
         
         # Memory and state
         self.path_history = [(start_x, start_y)]
+        self.visit_counts = {(start_x, start_y): 1}  # Position -> occurrences in path_history
         self.local_map = {}  # Local knowledge of maze
         self.current_target = None
         self.reached_exit = False
@@ -29,50 +110,74 @@ class RobotAgent:
         self.last_position = None  # Track previous position to prevent immediate backtracking
         self.stuck_in_loop_counter = 0  # Count how many steps we've been in same area
         self.recent_positions = deque(maxlen=10)  # Track last 10 positions for loop detection
+        self.nodes_expanded = 0  # Total search nodes expanded by this agent's BFS calls
         
         # Communication
         self.known_dead_ends = set()  # Dead ends learned from messages (TRUE dead ends - can't go back)
         self.known_wrong_paths = set()  # Wrong paths learned from messages (can backtrack)
         self.known_traps = set()  # Trap locations learned from messages
         self.exit_location = None  # Exit location if discovered
-        self.exit_path = None  # Path to exit shared by discovering agent
+        self.exit_path = None  # ExitPath shared by discovering agent (same instance for everyone)
+        self.exit_field = None  # Shared EvacuationField for exit_path (next step per cell)
         self.should_evacuate = False  # True when exit is found by any agent
         self.received_messages = []  # Store received messages
+        self.tracer = NULL_TRACER if tracer is None else tracer
+    
+    @property
+    def last_position(self):
+        """Previous position (None before the first move)"""
+        i = self.index
+        last_x = self.population.last_x[i]
+        if last_x == NO_POSITION:
+            return None
+        return (int(last_x), int(self.population.last_y[i]))
+    
+    @last_position.setter
+    def last_position(self, position):
+        i = self.index
+        if position is None:
+            self.population.last_x[i] = self.population.last_y[i] = NO_POSITION
+        else:
+            self.population.last_x[i], self.population.last_y[i] = position
         
     def get_position(self):
         """Get current position as tuple"""
-        return (self.x, self.y)
+        i = self.index
+        return (self.population.x.item(i), self.population.y.item(i))
     
     def manhattan_distance(self, target):
         """Calculate Manhattan distance to target"""
-        return abs(self.x - target[0]) + abs(self.y - target[1])
+        x, y = self.get_position()
+        return abs(x - target[0]) + abs(y - target[1])
     
     def can_communicate_with(self, other_agent):
-        """Check if agent can communicate with another agent - unlimited range"""
-        # All agents can communicate with each other regardless of distance
-        return True
+        """Check if agent can communicate with another agent (unlimited if communication_range is None)"""
+        if self.communication_range is None:
+            return True
+        return self.manhattan_distance(other_agent.get_position()) <= self.communication_range
     
     def perceive_environment(self, maze):
         """
         Perceive the environment within vision range.
-        Returns visible cells.
+        The visible window is sliced out of the maze flag array in one go and
+        the local map is filled from that block with shared read-only entries.
+        
+        Returns:
+            ((x0, y0), block): the window's lowest corner and its uint8 flag
+            block (a view; block[i, j] holds the flags of cell (x0 + i, y0 + j))
         """
-        visible_cells = []
+        (x, y), reach = self.get_position(), self.vision_range
+        x0, y0 = max(0, x - reach), max(0, y - reach)
+        block = maze.flags[x0:x + reach + 1, y0:y + reach + 1]
         
-        for dx in range(-self.vision_range, self.vision_range + 1):
-            for dy in range(-self.vision_range, self.vision_range + 1):
-                nx, ny = self.x + dx, self.y + dy
-                if 0 <= nx < maze.width and 0 <= ny < maze.height:
-                    cell = maze.get_cell(nx, ny)
-                    if cell:
-                        visible_cells.append(cell)
-                        # Update local map
-                        self.local_map[(nx, ny)] = {
-                            'is_wall': cell.is_wall,
-                            'is_exit': cell.is_exit
-                        }
+        # Update local map
+        local_map = self.local_map
+        entries = _LOCAL_MAP_ENTRIES
+        for nx, column in enumerate(block.tolist(), x0):
+            for ny, flags in enumerate(column, y0):
+                local_map[(nx, ny)] = entries[flags]
         
-        return visible_cells
+        return (x0, y0), block
     
     def process_messages(self, communication_protocol):
         """
@@ -84,25 +189,29 @@ class RobotAgent:
             self.received_messages.append(msg)
             
             if msg.message_type == 'DEAD_END':
-                # Another agent found a TRUE dead end (can't go back)
-                dead_end_pos = msg.content.get('position')
-                if dead_end_pos:
-                    self.known_dead_ends.add(dead_end_pos)
-                    if msg.content.get('is_trap'):
-                        self.known_traps.add(dead_end_pos)
+                # Other agents found TRUE dead ends (can't go back) - one report, or a batch
+                for report in msg.reports_for(self.id):
+                    dead_end_pos = report.get('position')
+                    if dead_end_pos:
+                        self.known_dead_ends.add(dead_end_pos)
+                        if report.get('is_trap'):
+                            self.known_traps.add(dead_end_pos)
                     
             elif msg.message_type == 'WRONG_PATH':
-                # Another agent found an unproductive path (CAN backtrack but wastes time)
-                wrong_path_pos = msg.content.get('position')
-                if wrong_path_pos:
-                    self.known_wrong_paths.add(wrong_path_pos)
+                # Other agents found unproductive paths (CAN backtrack but wastes time)
+                for report in msg.reports_for(self.id):
+                    wrong_path_pos = report.get('position')
+                    if wrong_path_pos:
+                        self.known_wrong_paths.add(wrong_path_pos)
                     
             elif msg.message_type == 'EXIT_FOUND':
                 # Another agent found the exit! Get the path!
                 self.exit_location = msg.content.get('position')
                 self.exit_path = msg.content.get('path')  # Get the successful path
+                self.exit_field = msg.content.get('flow_field')  # Shared, built once by the finder
                 self.should_evacuate = True
-                print(f"DEBUG: Agent {self.id} received EXIT_FOUND message! Path length: {len(self.exit_path) if self.exit_path else 0}")
+                if self.tracer.evacuation:
+                    self.tracer.record_reroute(self.id, self.get_position(), 'exit_found')
                 
             elif msg.message_type == 'PATH_SHARED':
                 # Another agent shared a useful path
@@ -118,7 +227,8 @@ class RobotAgent:
         5. Exploration strategy
         """
         current_pos = self.get_position()
-        current_cell = maze.get_cell(self.x, self.y)
+        x, y = current_pos
+        cell_flags = int(maze.flags[current_pos])  # Flag bits of the current cell
         
         # Track position for oscillation detection
         self.recent_positions.append(current_pos)
@@ -130,11 +240,11 @@ class RobotAgent:
             if len(unique_recent) <= 3:
                 # We're stuck oscillating!
                 self.stuck_in_loop_counter += 1
-                print(f"Agent {self.id} oscillating between {unique_recent}! Counter: {self.stuck_in_loop_counter}")
+                if self.tracer.oscillation:
+                    self.tracer.record_oscillation(self.id, unique_recent, self.stuck_in_loop_counter)
                 
                 if self.stuck_in_loop_counter > 5:
                     # Force staying put to wait for rescue
-                    print(f"Agent {self.id} stuck oscillating - STAYING PUT and waiting")
                     self.stuck_in_loop_counter = 0  # Reset counter
                     self.recent_positions.clear()  # Clear history
                     return None  # Stay put and wait
@@ -143,12 +253,16 @@ class RobotAgent:
                 self.stuck_in_loop_counter = 0
         
         # PRIORITY 0: Check if at exit (ALWAYS CHECK FIRST!)
-        if current_cell and current_cell.is_exit:
+        if cell_flags & EXIT:
             if not self.reached_exit:
                 self.reached_exit = True
                 
-                # Calculate CLEAN path from start to exit (no dead ends, no backtracking)
-                clean_path = self._calculate_clean_path(maze)
+                # Calculate CLEAN path from start to exit (no dead ends, no backtracking),
+                # packed once into an immutable ExitPath every agent and the blackboard share
+                clean_path = ExitPath(self._calculate_clean_path(maze), maze.height)
+                
+                # Build the evacuation flow field ONCE - every receiver shares it
+                flow_field = EvacuationField(maze, clean_path)
                 
                 # BROADCAST: I found the exit AND share the CLEAN path!
                 communication_protocol.broadcast(
@@ -157,7 +271,8 @@ class RobotAgent:
                     {
                         'position': current_pos, 
                         'agent_id': self.id,
-                        'path': clean_path  # Share the CLEAN path without dead ends!
+                        'path': clean_path,  # Share the CLEAN path without dead ends!
+                        'flow_field': flow_field
                     }
                 )
                 blackboard.add_path_to_exit(clean_path, self.id)
@@ -167,89 +282,65 @@ class RobotAgent:
         # CRITICAL FIX: If exit path is known, NO AGENT CAN DIE - EVER!
         # Even if on dead end, they MUST be able to escape using the shared path!
         if self.should_evacuate and self.exit_path:
-            # Use BFS to find shortest path from current position to ANY point on the exit path
-            # This is MUCH smarter than just moving towards closest point!
-            from collections import deque
+            # The flow field holds, for every cell, the first step of the shortest
+            # BFS route to ANY point on the exit path - a lookup instead of a search
+            if self.exit_field is None:
+                self.exit_field = EvacuationField(maze, self.exit_path)
             
             def bfs_to_exit_path():
-                """Find shortest path from current position to the exit path using BFS"""
-                queue = deque([(current_pos, [current_pos])])
-                visited = {current_pos}
-                
-                while queue:
-                    pos, path = queue.popleft()
-                    
-                    # If we reached the exit path, return the next step!
-                    if pos in self.exit_path:
-                        # Return the SECOND element in path (first step to take)
-                        if len(path) > 1:
-                            return path[1]  # Next immediate step
-                        return None  # Already on path
-                    
-                    # Explore neighbors
-                    for neighbor in maze.get_neighbors(pos[0], pos[1]):
-                        if neighbor in visited:
-                            continue
-                        
-                        # Check if neighbor is safe (not wall)
-                        cell = maze.get_cell(neighbor[0], neighbor[1])
-                        if not cell or cell.is_wall:
-                            continue
-                        
-                        # During evacuation, we can go ANYWHERE (even dead ends) to reach the path!
-                        # This is rescue mode - survival is guaranteed if we reach the path!
-                        
-                        visited.add(neighbor)
-                        queue.append((neighbor, path + [neighbor]))
-                
-                return None  # No path found
+                """Next step of the shortest path from current position to the exit path"""
+                # During evacuation, we can go ANYWHERE (even dead ends) to reach the path!
+                # This is rescue mode - survival is guaranteed if we reach the path!
+                return self.exit_field.step_toward_path(current_pos)  # None if on path or cut off
             
             # Check if we're already on the exit path
-            if current_pos in self.exit_path:
+            current_index = self.exit_field.index_of(current_pos)
+            if current_index is not None:
                 # We're on the path! Follow it to exit
-                current_index = self.exit_path.index(current_pos)
                 if current_index < len(self.exit_path) - 1:
                     # Move to next step on the path
                     next_step = self.exit_path[current_index + 1]
                     
                     # Check if next step is accessible
-                    neighbors = maze.get_neighbors(self.x, self.y)
-                    if next_step in neighbors:
-                        next_cell = maze.get_cell(next_step[0], next_step[1])
-                        if next_cell and not next_cell.is_wall:
-                            return next_step
+                    neighbors = maze.get_neighbors(x, y)
+                    if next_step in neighbors and not maze.has_flag(next_step[0], next_step[1], WALL):
+                        return next_step
                     
                     # Next step blocked! Use BFS to navigate around obstacle
-                    print(f"Agent {self.id} on path but next step {next_step} blocked! Finding alternate route...")
+                    if self.tracer.evacuation:
+                        self.tracer.record_reroute(self.id, current_pos, 'next_step_blocked')
                     alternate = bfs_to_exit_path()
                     if alternate:
                         return alternate
                     
                     # If BFS fails, just pick best available neighbor toward exit
-                    safe_neighbors = [n for n in neighbors if not maze.get_cell(n[0], n[1]).is_wall]
+                    safe_neighbors = [n for n in neighbors if not maze.has_flag(n[0], n[1], WALL)]
                     if safe_neighbors:
                         # Move toward exit
                         exit_pos = self.exit_path[-1]
                         best = min(safe_neighbors, key=lambda n: abs(n[0] - exit_pos[0]) + abs(n[1] - exit_pos[1]))
                         return best
                     
-                    print(f"Agent {self.id} STUCK on path! Staying put...")
+                    if self.tracer.evacuation:
+                        self.tracer.record_reroute(self.id, current_pos, 'stuck_on_path')
                     return None  # Stay put - don't die
                 else:
                     # We're at the end of path - should be at exit
                     return None
             
             # Not on path yet - use BFS to find shortest route TO the path
-            print(f"Agent {self.id} at {current_pos} navigating TO exit path using BFS...")
+            if self.tracer.evacuation:
+                self.tracer.record_reroute(self.id, current_pos, 'joining_path')
             next_move = bfs_to_exit_path()
             if next_move:
                 return next_move
             
             # BFS failed - fall back to simple navigation toward closest path point
-            print(f"Agent {self.id} BFS failed! Using simple navigation...")
-            closest_path_pos = min(self.exit_path, key=lambda p: abs(p[0] - self.x) + abs(p[1] - self.y))
-            neighbors = maze.get_neighbors(self.x, self.y)
-            safe_neighbors = [n for n in neighbors if not maze.get_cell(n[0], n[1]).is_wall]
+            if self.tracer.evacuation:
+                self.tracer.record_reroute(self.id, current_pos, 'path_unreachable')
+            closest_path_pos = min(self.exit_path, key=lambda p: abs(p[0] - x) + abs(p[1] - y))
+            neighbors = maze.get_neighbors(x, y)
+            safe_neighbors = [n for n in neighbors if not maze.has_flag(n[0], n[1], WALL)]
             
             if closest_path_pos in safe_neighbors:
                 return closest_path_pos
@@ -262,16 +353,18 @@ class RobotAgent:
             
             # ABSOLUTE LAST RESORT: Even if truly stuck, DON'T DIE!
             # Stay put and wait for rescue or path to clear
-            print(f"Agent {self.id} has exit path but NO moves available! STAYING PUT - will NOT die!")
+            if self.tracer.evacuation:
+                self.tracer.record_reroute(self.id, current_pos, 'no_moves')
             return None
         
         # CHECK: Are we on a TRUE DEAD END cell? (Cannot move at all!)
         # BUT ONLY DIE if exit path is NOT known yet!
-        if current_cell and current_cell.is_dead_end:
+        if cell_flags & DEAD_END:
             # We stepped on a dead end cell - we're DEAD! No escape, no rescue!
             # This agent is finished - permanently stuck
             if not self.reached_exit and not self.is_dead:
-                print(f"Agent {self.id} DIED in dead end at {current_pos}! RIP ☠️")
+                if self.tracer.death:
+                    self.tracer.record_death(self.id, current_pos)
                 self.is_dead = True  # Mark as permanently dead
                 
                 # Broadcast that we died here - warn others!
@@ -292,27 +385,25 @@ class RobotAgent:
         
         # PRIORITY 2: If exit found but no path yet, navigate toward exit location
         if self.should_evacuate and self.exit_location:
-            neighbors = maze.get_neighbors(self.x, self.y)
+            neighbors = maze.get_neighbors(x, y)
             
             # CRITICAL: Filter out dead ends FIRST!
             safe_neighbors = []
             for n in neighbors:
-                cell = maze.get_cell(n[0], n[1])
-                if cell and cell.is_dead_end:
+                if maze.has_flag(n[0], n[1], DEAD_END):
                     # Don't go to dead ends during evacuation!
                     continue
                 safe_neighbors.append(n)
             
             if not safe_neighbors:
                 # No safe neighbors - backtrack if possible
-                print(f"Agent {self.id} stuck navigating to exit location! Attempting backtrack.")
+                if self.tracer.evacuation:
+                    self.tracer.record_reroute(self.id, current_pos, 'backtrack_to_exit')
                 if len(self.path_history) > 1:
                     prev_pos = self.path_history[-2]
-                    all_neighbors = maze.get_neighbors(self.x, self.y)
-                    if prev_pos in all_neighbors:
-                        prev_cell = maze.get_cell(prev_pos[0], prev_pos[1])
-                        if prev_cell and not prev_cell.is_dead_end:
-                            return prev_pos
+                    all_neighbors = maze.get_neighbors(x, y)
+                    if prev_pos in all_neighbors and not maze.has_flag(prev_pos[0], prev_pos[1], DEAD_END):
+                        return prev_pos
                 # Stay put instead of dying
                 return None
             
@@ -343,7 +434,7 @@ class RobotAgent:
             return None
         
         # Check if we're in a trap (only broadcast once)
-        if current_cell and current_cell.is_trap and current_pos not in self.known_traps:
+        if cell_flags & TRAP and current_pos not in self.known_traps:
             # BROADCAST: I'm in a trap!
             communication_protocol.broadcast(
                 self.id,
@@ -359,7 +450,7 @@ class RobotAgent:
             self.known_traps.add(current_pos)
         
         # Get ALL neighbors
-        neighbors = maze.get_neighbors(self.x, self.y)
+        neighbors = maze.get_neighbors(x, y)
         
         # Filter out ONLY known dead ends from messages or blackboard
         # BUT: If we have the exit path (evacuation mode), also filter out actual dead end cells!
@@ -376,11 +467,9 @@ class RobotAgent:
                 continue
             
             # CRITICAL: If we're evacuating (exit found), check the actual cell to avoid dead ends!
-            if self.should_evacuate:
-                cell = maze.get_cell(n[0], n[1])
-                if cell and cell.is_dead_end:
-                    # Don't go there! We know the exit path, no need to explore dead ends!
-                    continue
+            if self.should_evacuate and maze.has_flag(n[0], n[1], DEAD_END):
+                # Don't go there! We know the exit path, no need to explore dead ends!
+                continue
             
             # This neighbor is safe (or unknown - which is fine for exploration!)
             safe_neighbors.append(n)
@@ -389,12 +478,8 @@ class RobotAgent:
         preferred_neighbors = [n for n in safe_neighbors if n not in self.known_wrong_paths]
         
         # Also avoid cells we've already explored multiple times (unless necessary)
-        # Count how many times we've visited each safe neighbor
-        visit_counts = {}
-        for n in safe_neighbors:
-            visit_counts[n] = sum(1 for pos in self.path_history if pos == n)
-        
         # Prefer unvisited or rarely visited cells
+        visit_counts = self.visit_counts
         fresh_neighbors = [n for n in safe_neighbors if visit_counts.get(n, 0) <= 1]
         
         # Use best available neighbors in priority order
@@ -410,7 +495,7 @@ class RobotAgent:
             blackboard.add_dead_end(current_pos, self.id)
             
             # Check if it's a trap
-            is_trap = current_cell and current_cell.is_trap
+            is_trap = bool(cell_flags & TRAP)
             
             # BROADCAST: Dead end found here! DON'T COME HERE!
             communication_protocol.broadcast(
@@ -425,7 +510,7 @@ class RobotAgent:
             
             # Backtrack if possible
             if len(self.path_history) > 1:
-                self.path_history.pop()
+                self._forget_visit(self.path_history.pop())
                 backtrack_pos = self.path_history[-1]
                 self.backtrack_positions.add(current_pos)
                 
@@ -445,13 +530,12 @@ class RobotAgent:
         
         # Strategy 1: Move toward exit if visible
         for nx, ny in valid_neighbors:
-            cell = maze.get_cell(nx, ny)
-            if cell and cell.is_exit:
+            if maze.has_flag(nx, ny, EXIT):
                 blackboard.post_message(self.id, 'exit_visible', {'position': (nx, ny)})
                 return (nx, ny)
         
         # Strategy 2: Prioritize UNVISITED cells to avoid re-exploration
-        unvisited = [n for n in valid_neighbors if n not in self.path_history]
+        unvisited = [n for n in valid_neighbors if n not in visit_counts]
         
         if unvisited:
             # Check if target is assigned via negotiation
@@ -462,9 +546,9 @@ class RobotAgent:
             unexplored_by_all = [n for n in unvisited if not blackboard.is_explored(n)]
             
             if unexplored_by_all:
-                target = min(unexplored_by_all, key=lambda n: self.manhattan_distance(n))
+                target = min(unexplored_by_all, key=lambda n: abs(n[0] - x) + abs(n[1] - y))
             else:
-                target = min(unvisited, key=lambda n: self.manhattan_distance(n))
+                target = min(unvisited, key=lambda n: abs(n[0] - x) + abs(n[1] - y))
             
             self.current_target = target
             blackboard.update_agent_target(self.id, target)
@@ -473,9 +557,7 @@ class RobotAgent:
         
         # Strategy 3: All neighbors visited - choose least visited
         # This means we're likely backtracking or in a complex area
-        visit_counts = {}
-        for n in valid_neighbors:
-            visit_counts[n] = sum(1 for pos in self.path_history if pos == n)
+        visit_counts = {n: visit_counts.get(n, 0) for n in valid_neighbors}
         
         if visit_counts:
             # Check if we're going in circles
@@ -503,27 +585,11 @@ class RobotAgent:
         Calculate clean path from start to current position (exit) using BFS.
         This avoids dead ends and gives the shortest path.
         """
-        from collections import deque
-        
-        start = maze.start_pos
-        goal = self.get_position()
-        
-        # BFS to find shortest path
-        queue = deque([(start, [start])])
-        visited = {start}
-        
-        while queue:
-            current, path = queue.popleft()
-            
-            if current == goal:
-                return path
-            
-            # Get neighbors
-            neighbors = maze.get_neighbors(current[0], current[1])
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
+        # BFS (or the configured search) to find shortest path
+        result = find_path(maze, maze.start_pos, (self.get_position(),), self.search_algorithm)
+        self.nodes_expanded += result.expanded
+        if result.path:
+            return result.path
         
         # Fallback: if BFS fails, return path_history
         return self.path_history.copy()
@@ -531,11 +597,24 @@ class RobotAgent:
     def move(self, target_pos):
         """Move to target position - no energy consumption"""
         if target_pos:
-            self.last_position = (self.x, self.y)  # Remember where we came from
+            self.last_position = self.get_position()  # Remember where we came from
             self.x, self.y = target_pos
-            self.path_history.append(target_pos)
+            self.record_move(target_pos)
             # No energy consumption - agents can explore indefinitely
+    
+    def record_move(self, target_pos):
+        """Add a move to the path history (position already set, e.g. by AgentPopulation.move)"""
+        self.path_history.append(target_pos)
+        self.visit_counts[target_pos] = self.visit_counts.get(target_pos, 0) + 1
             
+    def _forget_visit(self, position):
+        """Undo one visit count after a position is popped off path_history"""
+        remaining = self.visit_counts[position] - 1
+        if remaining:
+            self.visit_counts[position] = remaining
+        else:
+            del self.visit_counts[position]
+    
     def share_knowledge(self, blackboard):
         """Share discovered information with the blackboard"""
         current_pos = self.get_position()
@@ -543,15 +622,12 @@ class RobotAgent:
         blackboard.update_agent_position(self.id, current_pos)
         
         # Mark cell as explored in maze
-        cell = None
-        if hasattr(blackboard, 'maze'):
-            cell = blackboard.maze.get_cell(self.x, self.y)
-            if cell:
-                cell.explored_by.add(self.id)
+        if getattr(blackboard, 'maze', None) is not None:
+            blackboard.maze.mark_explored(current_pos[0], current_pos[1], self.id)
     
     def is_active(self):
         """Check if agent can still act - no energy limit, only death or exit matters"""
-        return not self.reached_exit and not self.is_dead
+        return not self.population.status.item(self.index) & FINISHED
     
     def __repr__(self):
         return f"Robot{self.id}@({self.x},{self.y})"
\ No newline at end of file
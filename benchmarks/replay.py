@@ -0,0 +1,158 @@
+# benchmarks/replay.py
+#
+# Replays a fixed series of seeded simulations on this tree and on a baseline
+# revision, checks that both produce the same results step for step and
+# reports the simulation time per agent count side by side. Each tree runs in
+# its own interpreter, so the two versions of the packages never mix.
+#
+#     python benchmarks/replay.py                        # against the root commit
+#     python benchmarks/replay.py --baseline HEAD~5 --seeds 12 --agents 1 5 20
+
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Result fields every version of Simulator.get_results reports
+RESULT_KEYS = ('steps', 'completed', 'winner', 'agents_reached_exit', 'total_cells_explored',
+               'dead_ends_found', 'paths_found', 'best_path_length')
+AGENT_KEYS = ('id', 'final_position', 'energy_remaining', 'path_length', 'reached_exit')
+
+
+def replay(tree, settings):
+    """
+    Run the series with the packages of one source tree (worker side)
+
+    Args:
+        tree: Root directory of the source tree to import from
+        settings: Dict of series parameters (see main)
+
+    Returns:
+        List of per-run records: seed, agents, simulation time and the results
+        restricted to RESULT_KEYS / AGENT_KEYS
+    """
+    sys.path.insert(0, tree)
+    from environment.maze import Maze
+    from simulation.simulator import Simulator
+    seeded = 'seed' in inspect.signature(Maze).parameters
+
+    records = []
+    for num_agents in settings['agents']:
+        for seed in range(settings['seeds']):
+            # Older trees print progress on every step; keep it off the report
+            with contextlib.redirect_stdout(io.StringIO()) as console:
+                random.seed(seed)  # Trees without Maze(seed=...) draw from the global RNG
+                options = {'seed': seed} if seeded else {}
+                maze = Maze(settings['size'], settings['size'], settings['wall_density'],
+                            use_fixed_maze=not settings['random_maze'], **options)
+                maze.generate()
+                simulator = Simulator(maze, num_agents, settings['energy'],
+                                      settings['vision_range'], settings['comm_range'])
+                start = time.perf_counter()
+                results = simulator.run_until_complete(max_steps=settings['max_steps'])
+                elapsed = time.perf_counter() - start
+                console.truncate(0)
+            record = {key: results[key] for key in RESULT_KEYS}
+            record['agent_stats'] = [[stats[key] for key in AGENT_KEYS] for stats in results['agent_stats']]
+            records.append({'seed': seed, 'agents': num_agents, 'time': elapsed,
+                            'results': json.loads(json.dumps(record))})
+    return records
+
+
+def export_revision(revision, directory):
+    """Write the files of a git revision into a directory"""
+    archive = subprocess.run(['git', '-C', REPO_ROOT, 'archive', '--format=tar', revision],
+                             check=True, capture_output=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+
+
+def run_tree(tree, settings):
+    """Replay the series in a fresh interpreter importing from `tree`"""
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', tree,
+                             '--settings', json.dumps(settings)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def report(baseline, current):
+    """
+    Print the per-agent-count comparison table
+
+    Returns:
+        True if every run produced the same results on both trees
+    """
+    print(f"{'Agents':>6} {'Runs':>5} {'Steps':>7} {'Baseline (s)':>13} {'Current (s)':>12} "
+          f"{'Speedup':>8}  Results")
+    all_match = True
+    totals = [0, 0.0, 0.0]
+    for num_agents in dict.fromkeys(record['agents'] for record in current):
+        pairs = [(old, new) for old, new in zip(baseline, current) if new['agents'] == num_agents]
+        steps = sum(new['results']['steps'] for _, new in pairs)
+        old_time = sum(old['time'] for old, _ in pairs)
+        new_time = sum(new['time'] for _, new in pairs)
+        mismatched = [new['seed'] for old, new in pairs if old['results'] != new['results']]
+        all_match = all_match and not mismatched
+        totals[0] += steps
+        totals[1] += old_time
+        totals[2] += new_time
+        verdict = 'match' if not mismatched else f"DIFFER (seeds {mismatched})"
+        print(f"{num_agents:>6} {len(pairs):>5} {steps:>7} {old_time:>13.3f} {new_time:>12.3f} "
+              f"{old_time / new_time:>7.2f}x  {verdict}")
+    print(f"{'total':>6} {len(current):>5} {totals[0]:>7} {totals[1]:>13.3f} {totals[2]:>12.3f} "
+          f"{totals[1] / totals[2]:>7.2f}x")
+    return all_match
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay seeded runs against a baseline revision')
+    parser.add_argument('--baseline', default=None,
+                        help='Git revision to compare against (default: the root commit)')
+    parser.add_argument('--seeds', type=int, default=12, help='Runs per agent count (seeds 0 .. N-1)')
+    parser.add_argument('--agents', type=int, nargs='+', default=[1, 5, 20], help='Agent counts')
+    parser.add_argument('--size', type=int, default=46, help='Maze width and height')
+    parser.add_argument('--random-maze', action='store_true', help='Use random mazes instead of the fixed layout')
+    parser.add_argument('--max-steps', type=int, default=1000, help='Step limit per run')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--settings', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(replay(args.worker, json.loads(args.settings)), sys.stdout)
+        return
+
+    sys.path.insert(0, REPO_ROOT)
+    import config
+    settings = {
+        'seeds': args.seeds, 'agents': args.agents, 'size': args.size,
+        'random_maze': args.random_maze, 'max_steps': args.max_steps,
+        'wall_density': config.WALL_DENSITY, 'energy': config.AGENT_ENERGY,
+        'vision_range': config.AGENT_VISION_RANGE, 'comm_range': config.COMMUNICATION_RANGE,
+    }
+    revision = args.baseline
+    if revision is None:
+        revision = subprocess.run(['git', '-C', REPO_ROOT, 'rev-list', '--max-parents=0', 'HEAD'],
+                                  check=True, capture_output=True, text=True).stdout.split()[0]
+
+    with tempfile.TemporaryDirectory() as baseline_tree:
+        export_revision(revision, baseline_tree)
+        print(f"Replaying {args.seeds} seeds x agents {args.agents} on a "
+              f"{args.size}x{args.size} {'random' if args.random_maze else 'fixed'} maze "
+              f"(baseline {revision[:12]})\n")
+        baseline = run_tree(baseline_tree, settings)
+    current = run_tree(REPO_ROOT, settings)
+    sys.exit(0 if report(baseline, current) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,28 @@
 MAZE_WIDTH = 46  # Reduced by 4 (2 from each side) - was 50
 MAZE_HEIGHT = 46  # Reduced by 4 (2 from each side) - was 50
 WALL_DENSITY = 0.3  # Probability of a cell being a wall
+MAZE_SEED = None  # Set an integer for reproducible mazes (None = different maze every run)
+MAZE_CACHE_DIR = '.maze_cache'  # Where seeded benchmark mazes are cached on disk
+SEARCH_ALGORITHM = 'bfs'  # Pathfinding for maze checks and agents: 'bfs', 'dijkstra', 'astar' or 'greedy'
 
 # Agent Configuration
 NUM_AGENTS = 5
 AGENT_ENERGY = 250  # Increased for larger maze
 AGENT_VISION_RANGE = 2  # How far agents can see
 COMMUNICATION_RANGE = 10  # Increased for larger maze
+COMMUNICATION_MODE = 'global'  # 'global' (every agent hears every broadcast) or 'range' (within COMMUNICATION_RANGE)
+BROADCAST_CAPACITY = 256  # Broadcast ring buffer size (unread messages are never dropped)
+BROADCAST_OVERFLOW_POLICY = 'drop_oldest_read'  # When full: 'block', 'drop_oldest_read' or 'coalesce'
+BROADCAST_COALESCE_WINDOW = 10  # Steps a repeated DEAD_END/WRONG_PATH report is suppressed (None = off)
+ASSIGNMENT_METHOD = 'greedy'  # Negotiation target assignment: 'greedy' (original heuristic), 'hungarian' or 'auction' (optimal)
+EVACUATION_RESERVATION_HORIZON = None  # Steps of space-time reservations planned for evacuees (None = off)
 
 # Simulation Configuration
 MAX_STEPS = 5000  # Increased for larger maze
 SIMULATION_SPEED = 3  # Faster default speed for larger maze
+BENCHMARK_WORKERS = None  # Benchmark trial processes (None = one per CPU, 1 = serial)
+TRACE_EVENTS = ()  # Event categories to record: 'conflict', 'death', 'broadcast', 'evacuation', 'oscillation'
+TRACE_FILE = 'events.jsonl'  # Where recorded events are written (one compact JSON object per line)
 
 # Visualization Configuration
 CELL_SIZE = 20  # Smaller cells to fit larger maze on screen
@@ -0,0 +1,2 @@
+# Test configuration: pytest loads this file first, so the package root is on
+# sys.path and tests import the repo's modules the same way main.py does
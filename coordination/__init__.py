@@ -2,5 +2,7 @@
 
 from .blackboard import Blackboard
 from .negotiation import Negotiator
+from .evacuation import EvacuationField
+from .exit_path import ExitPath
 
-__all__ = ['Blackboard', 'Negotiator']
\ No newline at end of file
+__all__ = ['Blackboard', 'Negotiator', 'EvacuationField', 'ExitPath']
\ No newline at end of file
@@ -0,0 +1,185 @@
+# coordination/assignment.py
+#
+# Agent-to-target assignment solvers. Costs are Manhattan distances from each
+# agent to each candidate target; a solver returns the assignment that
+# minimizes the total distance (each agent gets at most one target and each
+# target at most one agent; with more agents than targets some agents stay
+# unassigned).
+
+import numpy as np
+
+# 'greedy' is the original Negotiator heuristic, kept for comparison runs
+ASSIGNMENT_METHODS = ('hungarian', 'auction', 'greedy')
+
+
+def distance_matrix(agents, targets):
+    """(agents x targets) Manhattan distance matrix"""
+    positions = np.array([(agent.x, agent.y) for agent in agents], dtype=np.int64).reshape(-1, 2)
+    cells = np.array(targets, dtype=np.int64).reshape(-1, 2)
+    return (np.abs(positions[:, None, 0] - cells[None, :, 0]) +
+            np.abs(positions[:, None, 1] - cells[None, :, 1]))
+
+
+def hungarian(cost):
+    """
+    Optimal minimum-cost assignment (Hungarian algorithm with potentials,
+    O(n^2 m) for n rows and m >= n columns; rows are vectorized with NumPy)
+
+    Args:
+        cost: (rows, columns) cost matrix
+
+    Returns:
+        List of (row, column) pairs, one per row if rows <= columns,
+        else one per column
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return []
+
+    u = np.zeros(n + 1)            # Row potentials (1-based, 0 unused)
+    v = np.zeros(m + 1)            # Column potentials (column 0 is the virtual start)
+    owner = np.zeros(m + 1, dtype=np.int64)  # Row matched to each column (0 = none)
+    way = np.zeros(m + 1, dtype=np.int64)    # Previous column on the augmenting path
+
+    for row in range(1, n + 1):
+        owner[0] = row
+        column = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current_row = owner[column]
+            free = ~used[1:]
+            slack = cost[current_row - 1] - u[current_row] - v[1:]
+            better = free & (slack < min_slack[1:])
+            min_slack[1:][better] = slack[better]
+            way[1:][better] = column
+            masked = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(masked)) + 1
+            delta = masked[next_column - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_slack[1:][free] -= delta
+            column = next_column
+            if owner[column] == 0:
+                break
+        # Augment along the path back to the virtual column
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    pairs = [(int(owner[j]) - 1, j - 1) for j in range(1, m + 1) if owner[j]]
+    if transposed:
+        pairs = [(column, row) for row, column in pairs]
+    return sorted(pairs)
+
+
+class AuctionAssigner:
+    """
+    Incremental auction solver (Bertsekas' forward auction with epsilon
+    scaling). Target prices survive between calls, keyed by target
+    position, so when the frontier only changes a little from one step to
+    the next most agents win their previous target on the first bid and the
+    solve is mostly warm. The final epsilon is below 1 / size, so for the
+    integer distance costs used here the result is optimal either way.
+    """
+
+    def __init__(self):
+        self.prices = {}  # target position -> price carried over from the last solve
+
+    def reset(self):
+        """Forget carried-over prices"""
+        self.prices.clear()
+
+    def solve(self, cost, targets):
+        """
+        Assign rows (agents) to columns (targets)
+
+        Args:
+            cost: (agents x targets) integer cost matrix
+            targets: Target positions, the keys for carried-over prices
+
+        Returns:
+            List of (row, column) pairs
+        """
+        cost = np.asarray(cost, dtype=np.float64)
+        n, m = cost.shape
+        if n == 0 or m == 0:
+            return []
+
+        # Pad to a square problem with zero-cost dummy agents (they soak up
+        # surplus targets) or dummy targets (surplus agents stay unassigned).
+        # A square auction is optimal from ANY starting prices, which is what
+        # makes warm starts safe.
+        size = max(n, m)
+        square = np.zeros((size, size))
+        square[:n, :m] = cost
+        value = -square
+
+        prices = np.zeros(size)
+        carried = [self.prices.get(target) for target in targets]
+        prices[:m] = [0.0 if price is None else price for price in carried]
+        prices -= prices.min()  # Only price differences matter
+        warm = sum(price is not None for price in carried) * 2 >= m
+
+        # Cold: scale epsilon down from the cost range. Warm: prices are
+        # already nearly right, so bid at the final epsilon straight away.
+        final_epsilon = 1.0 / (size + 1)
+        epsilon = final_epsilon if warm else max(final_epsilon, float(np.ptp(square)) / 4)
+        while True:
+            owner = np.full(size, -1, dtype=np.int64)
+            assigned = np.full(size, -1, dtype=np.int64)
+            unassigned = list(range(size - 1, -1, -1))
+            while unassigned:
+                row = unassigned.pop()
+                net = value[row] - prices
+                best = int(np.argmax(net))
+                best_value = net[best]
+                net[best] = -np.inf
+                second_value = net.max() if size > 1 else best_value
+                prices[best] += best_value - second_value + epsilon
+                previous = owner[best]
+                if previous >= 0:
+                    assigned[previous] = -1
+                    unassigned.append(previous)
+                owner[best] = row
+                assigned[row] = best
+            if epsilon <= final_epsilon:
+                break
+            epsilon = max(final_epsilon, epsilon / 4)
+
+        self.prices = {target: float(prices[j]) for j, target in enumerate(targets)}
+        return [(row, int(assigned[row])) for row in range(n) if assigned[row] < m]
+
+
+def assign_targets(agents, targets, method='hungarian', auction=None):
+    """
+    Assign agents to distinct targets minimizing total Manhattan distance
+
+    Args:
+        agents: Agents to assign
+        targets: Candidate target positions
+        method: 'hungarian' (optimal) or 'auction' (optimal, incremental)
+        auction: AuctionAssigner carrying prices between calls (for 'auction')
+
+    Returns:
+        Dict agent_id -> target position
+    """
+    if method not in ('hungarian', 'auction'):
+        raise ValueError(f"Unknown assignment method '{method}' (expected 'hungarian' or 'auction')")
+    agents = list(agents)
+    targets = sorted(targets)  # Deterministic column order
+    if not agents or not targets:
+        return {}
+
+    cost = distance_matrix(agents, targets)
+    if method == 'hungarian':
+        pairs = hungarian(cost)
+    else:
+        pairs = (auction or AuctionAssigner()).solve(cost, targets)
+    return {agents[row].id: targets[column] for row, column in pairs}
@@ -1,26 +1,361 @@
 # coordination/blackboard.py
 
+from collections import deque
+
+import numpy as np
+
+from environment.maze import DIRECTIONS
+from utils.spatial_hash import SpatialHash
+
+
+class CellLayer:
+    """
+    Set of maze cells stored as a boolean array sized to the maze.
+    Supports the set operations the blackboard used (add, `in`, len,
+    iteration, clear) plus bulk updates from index arrays that touch only
+    the given cells, an O(1) count and a mask export.
+    Adding a cell outside the current shape grows the array, so a layer
+    created without a maze still works.
+    """
+    
+    def __init__(self, width=0, height=0):
+        self._resize(width, height)
+        
+    def _resize(self, width, height):
+        """Reallocate the array, keeping the cells already set"""
+        bits = np.zeros((width, height), dtype=bool)
+        old = getattr(self, 'bits', None)
+        if old is not None:
+            bits[:old.shape[0], :old.shape[1]] = old
+        self.bits = bits
+        self.width, self.height = width, height
+        self._flat = memoryview(bits.reshape(-1))  # Fast scalar access for add / `in`
+        self.count = int(np.count_nonzero(bits))
+        
+    def add(self, position):
+        """Add one cell"""
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            self._resize(max(self.width, x + 1), max(self.height, y + 1))
+        i = x * self.height + y
+        if not self._flat[i]:
+            self._flat[i] = True
+            self.count += 1
+            
+    def __contains__(self, position):
+        x, y = position
+        return 0 <= x < self.width and 0 <= y < self.height and self._flat[x * self.height + y]
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        for x, y in np.argwhere(self.bits).tolist():
+            yield (x, y)
+            
+    def update(self, positions):
+        """
+        Bulk union with an iterable of cells or a (width, height) boolean mask
+        
+        Returns:
+            Number of cells that were not in the layer before
+        """
+        if isinstance(positions, np.ndarray) and positions.dtype == bool:
+            mask = positions
+            if mask.shape != self.bits.shape:
+                self._resize(max(self.width, mask.shape[0]), max(self.height, mask.shape[1]))
+                mask = np.pad(mask, ((0, self.width - mask.shape[0]), (0, self.height - mask.shape[1])))
+            added = int(np.count_nonzero(mask & ~self.bits))
+            self.bits |= mask
+            self.count += added
+            return added
+        cells = np.asarray(list(positions), dtype=np.int64).reshape(-1, 2)
+        return len(self.add_indices(cells[:, 0], cells[:, 1])[0])
+    
+    def add_indices(self, xs, ys):
+        """
+        Add the cells (xs[i], ys[i]), writing only those entries of the array
+        
+        Returns:
+            (xs, ys) arrays of the cells that were not in the layer before
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        if xs.size == 0:
+            return xs, ys
+        width, height = int(xs.max()) + 1, int(ys.max()) + 1
+        if width > self.width or height > self.height:
+            self._resize(max(self.width, width), max(self.height, height))
+        flat = self.bits.reshape(-1)
+        cells = np.unique(xs * self.height + ys)
+        fresh = cells[~flat[cells]]
+        flat[fresh] = True
+        self.count += len(fresh)
+        return np.divmod(fresh, self.height)
+    
+    def discard(self, position):
+        """Remove one cell (no-op if absent)"""
+        if position in self:
+            x, y = position
+            self._flat[x * self.height + y] = False
+            self.count -= 1
+    
+    def discard_indices(self, xs, ys):
+        """
+        Remove the cells (xs[i], ys[i]) that are in the layer
+        
+        Returns:
+            (xs, ys) arrays of the cells that were removed
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        inside = (xs < self.width) & (ys < self.height)
+        flat = self.bits.reshape(-1)
+        cells = np.unique(xs[inside] * self.height + ys[inside])
+        gone = cells[flat[cells]]
+        flat[gone] = False
+        self.count -= len(gone)
+        return np.divmod(gone, self.height)
+    
+    def mask(self):
+        """Read-only (width, height) boolean view of the layer"""
+        view = self.bits.view()
+        view.flags.writeable = False
+        return view
+    
+    def clear(self):
+        """Remove every cell"""
+        self.bits.fill(False)
+        self.count = 0
+        
+    def __repr__(self):
+        return f"CellLayer({self.count} of {self.width}x{self.height} cells)"
+
+
+class Frontier:
+    """
+    Exploration frontier: open cells next to explored space that are neither
+    explored nor known dead ends. A CellLayer gives O(1) membership and a
+    SpatialHash answers nearest-frontier queries by looking only at nearby
+    buckets.
+    """
+    
+    def __init__(self, width=0, height=0, cell_size=8):
+        self.cells = CellLayer(width, height)
+        self.index = SpatialHash(cell_size)
+        
+    def add(self, position):
+        if position not in self.cells:
+            self.cells.add(position)
+            self.index.update(position, position[0], position[1])
+            
+    def discard(self, position):
+        if position in self.cells:
+            self.cells.discard(position)
+            self.index.remove(position)
+    
+    def update(self, xs, ys):
+        """Add the cells (xs[i], ys[i])"""
+        fresh_xs, fresh_ys = self.cells.add_indices(xs, ys)
+        for x, y in zip(fresh_xs.tolist(), fresh_ys.tolist()):
+            self.index.update((x, y), x, y)
+    
+    def difference_update(self, xs, ys):
+        """Remove the cells (xs[i], ys[i])"""
+        gone_xs, gone_ys = self.cells.discard_indices(xs, ys)
+        for x, y in zip(gone_xs.tolist(), gone_ys.tolist()):
+            self.index.remove((x, y))
+            
+    def __contains__(self, position):
+        return position in self.cells
+    
+    def __len__(self):
+        return len(self.cells)
+    
+    def __iter__(self):
+        return iter(self.cells)
+    
+    def nearest(self, position, max_distance=None):
+        """
+        Closest frontier cell by Manhattan distance (ties: smallest (x, y))
+        
+        Args:
+            position: Query position (x, y)
+            max_distance: Give up beyond this distance (None = whole maze)
+            
+        Returns:
+            Frontier cell, or None if there is none in range
+        """
+        if not len(self.cells):
+            return None
+        x, y = position
+        limit = max_distance if max_distance is not None else self.cells.width + self.cells.height
+        radius = min(self.index.cell_size, limit)
+        while True:
+            found = self.index.query(x, y, radius)
+            if found:
+                return min(found, key=lambda c: (abs(c[0] - x) + abs(c[1] - y), c))
+            if radius >= limit:
+                return None
+            radius = min(radius * 2, limit)
+            
+    def clear(self):
+        self.cells.clear()
+        self.index = SpatialHash(self.index.cell_size)
+
+
+class MessageStore:
+    """
+    Bounded store of blackboard messages.
+    Keeps the last `capacity` messages overall and, per message type, the
+    last `capacity` messages of that type, plus an all-time counter per
+    type - so "last N dead_end messages" or "how many 'exploring' messages
+    so far" never scan, and memory stays flat over long runs.
+    """
+    
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self._recent = deque(maxlen=capacity)
+        self._by_type = {}  # type -> deque of that type's latest messages
+        self.counts = {}    # type -> messages ever posted
+        self.total = 0
+        
+    def append(self, message):
+        """Store a message dict (its 'type' key selects the index)"""
+        msg_type = message.get('type')
+        self._recent.append(message)
+        index = self._by_type.get(msg_type)
+        if index is None:
+            index = self._by_type[msg_type] = deque(maxlen=self.capacity)
+        index.append(message)
+        self.counts[msg_type] = self.counts.get(msg_type, 0) + 1
+        self.total += 1
+        
+    def recent(self, count=10, msg_type=None):
+        """
+        Last `count` messages, optionally only of one type (oldest first).
+        Follows list slicing (messages[-count:]), so count=0 returns every
+        retained message.
+        """
+        messages = self._recent if msg_type is None else self._by_type.get(msg_type, ())
+        if 0 < count < len(messages):
+            return [messages[i] for i in range(len(messages) - count, len(messages))]
+        return list(messages)[-count:]
+    
+    def count(self, msg_type=None):
+        """Messages ever posted, optionally only of one type"""
+        return self.total if msg_type is None else self.counts.get(msg_type, 0)
+    
+    def __len__(self):
+        return len(self._recent)
+    
+    def __iter__(self):
+        return iter(self._recent)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._recent)[index]
+        return self._recent[index]
+    
+    def clear(self):
+        """Drop every message and reset the counters"""
+        self._recent.clear()
+        self._by_type.clear()
+        self.counts.clear()
+        self.total = 0
+
+
 class Blackboard:
     """
     Shared knowledge base for agent communication.
     Agents can read and write information here.
     """
     
-    def __init__(self):
-        self.explored_cells = set()  # All cells explored by any agent
-        self.dead_ends = set()       # Known dead ends
+    def __init__(self, maze=None, message_capacity=1000):
+        """
+        Initialize the blackboard
+        
+        Args:
+            maze: Maze the knowledge layers are sized to (optional - they grow on demand)
+            message_capacity: Messages retained overall and per message type
+        """
+        width, height = (maze.width, maze.height) if maze is not None else (0, 0)
+        self.maze = maze
+        self.explored_cells = CellLayer(width, height)  # All cells explored by any agent
+        self.dead_ends = CellLayer(width, height)       # Known dead ends
+        self.frontier = Frontier(width, height)         # Open unexplored cells next to explored ones (needs maze)
         self.paths_to_exit = []      # Successful paths found
         self.agent_positions = {}    # Current position of each agent
         self.agent_targets = {}      # Current target of each agent
-        self.messages = []           # Communication messages
+        self.messages = MessageStore(message_capacity)  # Communication messages (bounded)
         
     def add_explored_cell(self, position, agent_id):
         """Mark a cell as explored by an agent"""
+        if position in self.explored_cells:
+            return
         self.explored_cells.add(position)
         
+        # Frontier update touches only this cell and its neighbors
+        self.frontier.discard(position)
+        if self.maze is not None:
+            for neighbor in self.maze.get_neighbors(position[0], position[1]):
+                if neighbor not in self.explored_cells and neighbor not in self.dead_ends:
+                    self.frontier.add(neighbor)
+        
+    def add_explored_cells(self, positions):
+        """
+        Mark many cells as explored at once: the explored layer is written
+        in place at the given cells only, and the frontier is updated from
+        the maze's open-direction masks of the newly explored cells, so the
+        cost follows the number of cells rather than the maze size
+        
+        Args:
+            positions: (width, height) boolean mask, (n, 2) index array or
+                       iterable of (x, y) cells
+            
+        Returns:
+            Number of newly explored cells
+        """
+        if isinstance(positions, np.ndarray) and positions.dtype == bool:
+            xs, ys = np.nonzero(positions)
+        else:
+            cells = np.asarray(positions if isinstance(positions, np.ndarray) else list(positions),
+                               dtype=np.int64).reshape(-1, 2)
+            xs, ys = cells[:, 0], cells[:, 1]
+        new_xs, new_ys = self.explored_cells.add_indices(xs, ys)
+        added = len(new_xs)
+        if not added or self.maze is None:
+            return added
+        
+        # Open neighbours of the new cells (bit i of open_dirs: neighbour at
+        # DIRECTIONS[i] is open), minus explored cells and known dead ends
+        open_dirs = self.maze.get_open_dirs()[new_xs, new_ys]
+        reached_xs, reached_ys = [], []
+        for bit, (dx, dy) in enumerate(DIRECTIONS):
+            has = (open_dirs & (1 << bit)) != 0
+            reached_xs.append(new_xs[has] + dx)
+            reached_ys.append(new_ys[has] + dy)
+        reached_xs = np.concatenate(reached_xs)
+        reached_ys = np.concatenate(reached_ys)
+        keep = ~(self.explored_cells.bits[reached_xs, reached_ys] |
+                 self.dead_ends.bits[reached_xs, reached_ys])
+        
+        self.frontier.difference_update(new_xs, new_ys)
+        self.frontier.update(reached_xs[keep], reached_ys[keep])
+        return added
+    
+    def explored_mask(self):
+        """Boolean (width, height) array of explored cells, e.g. for the renderer"""
+        return self.explored_cells.mask()
+    
+    def dead_end_mask(self):
+        """Boolean (width, height) array of known dead ends"""
+        return self.dead_ends.mask()
+        
     def add_dead_end(self, position, agent_id):
         """Mark a position as a dead end"""
         self.dead_ends.add(position)
+        self.frontier.discard(position)
         self.messages.append({
             'type': 'dead_end',
             'agent_id': agent_id,
@@ -28,7 +363,7 @@ class Blackboard:
         })
         
     def add_path_to_exit(self, path, agent_id):
-        """Add a successful path to the exit"""
+        """Add a successful path to the exit (the shared ExitPath is stored, not copied)"""
         self.paths_to_exit.append({
             'path': path,
             'agent_id': agent_id,
@@ -51,6 +386,14 @@ class Blackboard:
         """Check if a position is a known dead end"""
         return position in self.dead_ends
     
+    def is_frontier(self, position):
+        """Check if a position is on the exploration frontier"""
+        return position in self.frontier
+    
+    def nearest_frontier(self, position, max_distance=None):
+        """Closest frontier cell to a position (Manhattan), or None"""
+        return self.frontier.nearest(position, max_distance)
+    
     def get_unexplored_neighbors(self, position, maze):
         """Get unexplored neighboring positions"""
         neighbors = maze.get_neighbors(position[0], position[1])
@@ -78,14 +421,19 @@ class Blackboard:
             'data': data
         })
     
-    def get_recent_messages(self, count=10):
-        """Get recent messages"""
-        return self.messages[-count:]
+    def get_recent_messages(self, count=10, msg_type=None):
+        """Get recent messages, optionally only of one type"""
+        return self.messages.recent(count, msg_type)
+    
+    def count_messages(self, msg_type=None):
+        """Number of messages ever posted, optionally only of one type"""
+        return self.messages.count(msg_type)
     
     def reset(self):
         """Reset the blackboard"""
         self.explored_cells.clear()
         self.dead_ends.clear()
+        self.frontier.clear()
         self.paths_to_exit.clear()
         self.agent_positions.clear()
         self.agent_targets.clear()
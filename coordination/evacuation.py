@@ -0,0 +1,113 @@
+# coordination/evacuation.py
+
+import numpy as np
+
+from coordination.exit_path import ExitPath
+from environment.maze import DIRECTIONS
+from utils.pathfinding import distance_field
+
+NO_STEP = 255  # next_dir value for cells with no move toward the exit path
+
+
+class EvacuationField:
+    """
+    Shared evacuation flow field toward the exit, built once per EXIT_FOUND.
+    One multi-source BFS from every exit-path cell gives each cell its
+    distance to the path; each off-path cell then stores the direction of its
+    first neighbor (in maze neighbor order) that is one step closer. That is
+    exactly the first move a BFS from the cell to the path would pick, so
+    every evacuating agent gets its next step with an O(1) lookup.
+    """
+
+    def __init__(self, maze, exit_path):
+        """
+        Build the field
+
+        Args:
+            maze: Maze object
+            exit_path: ExitPath (or list of cells) from start to exit shared in EXIT_FOUND
+        """
+        if not isinstance(exit_path, ExitPath):
+            exit_path = ExitPath(exit_path, maze.height)
+        self.exit_path = exit_path
+        self.exit_pos = exit_path[-1] if exit_path else None
+        self.height = maze.height
+
+        # Position -> index on the exit path, shared with the ExitPath itself
+        self.path_index = exit_path.path_index
+
+        self.distance = distance_field(maze, self.path_index)
+
+        # Vectorized next-step table: first direction whose neighbor is one closer
+        distance = self.distance
+        width, height = distance.shape
+        padded = np.pad(distance, 1, constant_values=-1)  # Out of bounds = unreachable
+        next_dir = np.full(distance.shape, NO_STEP, dtype=np.uint8)
+        needs_step = distance > 0
+        for bit, (dx, dy) in enumerate(DIRECTIONS):
+            neighbor_distance = padded[1 + dx:1 + dx + width, 1 + dy:1 + dy + height]
+            closer = needs_step & (neighbor_distance == distance - 1)
+            next_dir[closer] = bit
+            needs_step &= ~closer
+        self.next_dir = next_dir
+        self._next_dir_bytes = next_dir.tobytes()
+        self._exit_distance = {}  # Memo for distance_to_exit
+
+    def index_of(self, position):
+        """Index of a position on the exit path, or None if it is off the path"""
+        return self.path_index.get(position)
+
+    def step_toward_path(self, position):
+        """
+        Next move toward the nearest exit-path cell.
+
+        Returns:
+            Neighbor position, or None if already on the path or cut off from it
+        """
+        x, y = position
+        direction = self._next_dir_bytes[x * self.height + y]
+        if direction == NO_STEP:
+            return None
+        dx, dy = DIRECTIONS[direction]
+        return (x + dx, y + dy)
+
+    def distance_to_path(self, position):
+        """Moves from a position to the exit path (-1 if unreachable)"""
+        return int(self.distance[position[0], position[1]])
+
+    def next_cell(self, position):
+        """
+        Next evacuation move from a position: along the exit path when on it,
+        otherwise toward it (the route evacuating agents take)
+
+        Returns:
+            Neighbor position, or None at the exit or when cut off
+        """
+        index = self.path_index.get(position)
+        if index is None:
+            return self.step_toward_path(position)
+        if index < len(self.exit_path) - 1:
+            return self.exit_path[index + 1]
+        return None
+
+    def distance_to_exit(self, position):
+        """Moves to the exit following next_cell (-1 if the route never gets there)"""
+        memo = self._exit_distance
+        route = []
+        current = position
+        while current not in memo:
+            if current == self.exit_pos:
+                memo[current] = 0
+                break
+            route.append(current)
+            nxt = self.next_cell(current)
+            if nxt is None or len(route) > len(self.distance.flat):
+                memo[current] = -1
+                route.pop()
+                break
+            current = nxt
+        distance = memo[current]
+        for cell in reversed(route):
+            distance = distance + 1 if distance >= 0 else -1
+            memo[cell] = distance
+        return memo[position]
@@ -0,0 +1,83 @@
+# coordination/exit_path.py
+
+import numpy as np
+
+
+class ExitPath:
+    """
+    Immutable start-to-exit path shared by every agent and the blackboard.
+    Cells are packed as flat indices (x * height + y) in a read-only int32
+    array, with a position -> index hash for O(1) membership and lookup.
+    It behaves like the list of (x, y) tuples it replaces: len(), indexing,
+    iteration, `in` and .index() all work, so one instance can be handed
+    around in EXIT_FOUND payloads instead of a copy per agent.
+    """
+
+    __slots__ = ('height', 'cells', 'path_index')
+
+    def __init__(self, positions, height):
+        """
+        Pack a path
+
+        Args:
+            positions: Sequence of (x, y) cells from start to exit
+            height: Maze height (to pack and unpack coordinates)
+        """
+        if isinstance(positions, ExitPath):
+            positions = list(positions)
+        cells = np.array([x * height + y for x, y in positions], dtype=np.int32)
+        cells.flags.writeable = False
+        object.__setattr__(self, 'height', height)
+        object.__setattr__(self, 'cells', cells)
+
+        # Position -> index on the path (first occurrence, like list.index)
+        path_index = {}
+        for i, position in enumerate(positions):
+            path_index.setdefault(tuple(position), i)
+        object.__setattr__(self, 'path_index', path_index)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ExitPath is immutable")
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [divmod(flat, self.height) for flat in self.cells[i].tolist()]
+        return divmod(int(self.cells[i]), self.height)
+
+    def __iter__(self):
+        height = self.height
+        for flat in self.cells.tolist():
+            yield divmod(flat, height)
+
+    def __contains__(self, position):
+        return position in self.path_index
+
+    def index(self, position):
+        """Index of a position on the path (ValueError if absent, like list.index)"""
+        try:
+            return self.path_index[position]
+        except KeyError:
+            raise ValueError(f"{position} is not on the exit path") from None
+
+    def index_of(self, position):
+        """Index of a position on the path, or None if it is off the path"""
+        return self.path_index.get(position)
+
+    def to_list(self):
+        """Unpacked copy as a list of (x, y) tuples"""
+        return list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, ExitPath):
+            return self.height == other.height and np.array_equal(self.cells, other.cells)
+        if isinstance(other, (list, tuple)):
+            return self.to_list() == [tuple(p) for p in other]
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ExitPath(length={len(self)}, exit={self[-1] if len(self) else None})"
@@ -2,18 +2,31 @@
 
 import random
 
+from coordination.assignment import assign_targets
+
 class Negotiator:
     """Handles negotiation between agents for path conflicts"""
     
     @staticmethod
-    def resolve_target_conflict(agents_in_conflict, targets, blackboard):
+    def resolve_target_conflict(agents_in_conflict, targets, blackboard, method='greedy', auction=None):
         """
         Resolve conflicts when multiple agents want the same target.
-        Strategy: Priority based on distance and energy.
+        
+        Args:
+            agents_in_conflict: Agents to (re)assign
+            targets: Candidate target positions
+            blackboard: Shared blackboard
+            method: 'greedy' - priority based on distance and energy (original heuristic),
+                    'hungarian' / 'auction' - minimum total distance assignment
+                    (see coordination.assignment)
+            auction: AuctionAssigner reused across steps for method='auction'
         """
         if not agents_in_conflict:
             return {}
         
+        if method != 'greedy':
+            return assign_targets(agents_in_conflict, targets, method, auction)
+        
         assignments = {}
         available_targets = list(targets)
         
@@ -42,28 +55,38 @@ class Negotiator:
         return assignments
     
     @staticmethod
-    def coordinate_exploration(agents, maze, blackboard):
+    def coordinate_exploration(agents, maze, blackboard, method='greedy', auction=None):
         """
         Coordinate exploration to minimize redundancy.
         Assigns unexplored areas to different agents.
+        method / auction select the conflict solver (see resolve_target_conflict).
         """
-        unexplored_positions = set()
+        # A target is contestable if it is an unexplored, non-dead-end cell
+        # next to one of these agents. The blackboard's incrementally kept
+        # frontier answers the first part in O(1) (every active agent stands
+        # on an explored cell, so their open unexplored neighbors are exactly
+        # the frontier cells next to them); without a maze fall back to the
+        # explicit checks.
+        if getattr(blackboard, 'maze', None) is not None:
+            is_open_unexplored = blackboard.is_frontier
+        else:
+            def is_open_unexplored(position):
+                return not blackboard.is_explored(position) and not blackboard.is_dead_end(position)
+        agent_positions = {(agent.x, agent.y) for agent in agents}
+        contestable = {}  # target -> bool, each target checked once
         
-        # Find all unexplored adjacent positions
-        for agent in agents:
-            neighbors = maze.get_neighbors(agent.x, agent.y)
-            for nx, ny in neighbors:
-                if not blackboard.is_explored((nx, ny)) and not blackboard.is_dead_end((nx, ny)):
-                    unexplored_positions.add((nx, ny))
+        def is_contestable(target):
+            if target not in contestable:
+                contestable[target] = is_open_unexplored(target) and any(
+                    n in agent_positions for n in maze.get_neighbors(target[0], target[1]))
+            return contestable[target]
         
-        if not unexplored_positions:
-            return {}
-        
-        # Find conflicts (multiple agents wanting same target)
+        # Find conflicts (multiple agents wanting same target) - only the
+        # agents' current targets are looked at, no neighbor scan
         target_counts = {}
         for agent in agents:
             target = blackboard.get_agent_target(agent.id)
-            if target and target in unexplored_positions:
+            if target and is_contestable(target):
                 if target not in target_counts:
                     target_counts[target] = []
                 target_counts[target].append(agent)
@@ -80,11 +103,21 @@ class Negotiator:
                 conflicted_targets.append(target)
         
         if conflicted_agents:
+            # Candidate targets: every open unexplored cell next to an agent
+            # (only built when there is something to resolve)
+            unexplored_positions = set()
+            for agent in agents:
+                for n in maze.get_neighbors(agent.x, agent.y):
+                    if is_open_unexplored(n):
+                        unexplored_positions.add(n)
+            
             # Use negotiator to resolve
             resolved = Negotiator.resolve_target_conflict(
                 conflicted_agents,
                 unexplored_positions,
-                blackboard
+                blackboard,
+                method,
+                auction
             )
             assignments.update(resolved)
         
@@ -0,0 +1,89 @@
+# coordination/reservation.py
+
+
+class ReservationTable:
+    """
+    Space-time reservation table for evacuation (windowed cooperative planning).
+    Each step, evacuating agents plan their next `horizon` moves along the
+    shared evacuation route in order of distance to the exit - the convoy
+    leader first. A move into cell c at time t claims the slot (c, t) and the
+    edge it travels; a later agent whose next slot is already claimed, or
+    whose move would swap cells with a claimed move, waits instead of
+    contesting the cell, and an agent that stops holds its cell for the rest
+    of the horizon. Followers therefore queue up behind the agents ahead of
+    them and the whole column advances together. The simulator executes the
+    reserved first move of every planned agent.
+    """
+
+    def __init__(self, horizon=8):
+        """
+        Initialize the table
+
+        Args:
+            horizon: Number of future steps each agent plans and reserves
+        """
+        self.horizon = horizon
+        self.slots = {}  # (cell, t) -> agent id entering cell at step t
+        self.edges = {}  # (from cell, to cell, t) -> agent id moving along it at step t
+        self.waits = 0   # Evacuation moves held back because the slot was taken
+
+    def clear(self):
+        """Drop all reservations"""
+        self.slots.clear()
+        self.edges.clear()
+
+    def is_free(self, origin, cell, t):
+        """True if cell can be entered from origin at step t (no claim, no swap)"""
+        return (cell, t) not in self.slots and (cell, origin, t) not in self.edges
+
+    def reserve(self, origin, cell, t, agent_id):
+        """Claim entering cell from origin at step t"""
+        self.slots[(cell, t)] = agent_id
+        self.edges[(origin, cell, t)] = agent_id
+
+    def plan(self, agents, step, occupied=()):
+        """
+        Plan the next moves of evacuating agents
+
+        Args:
+            agents: Agents following a shared EvacuationField (agent.exit_field)
+            step: Current simulation step (moves happen at step + 1, ...)
+            occupied: Cells of other agents, which may stay put next step
+
+        Returns:
+            Dict agent_id -> next position, or None if the agent must wait
+        """
+        self.clear()
+        end = step + 1 + self.horizon
+        for cell in occupied:
+            self.slots[(cell, step + 1)] = None
+
+        def priority(agent):
+            distance = agent.exit_field.distance_to_exit(agent.get_position())
+            return (distance if distance >= 0 else float('inf'), agent.id)
+
+        moves = {}
+        for agent in sorted(agents, key=priority):
+            field = agent.exit_field
+            position = agent.get_position()
+            first_move = None
+            t = step + 1
+            while t < end:
+                cell = field.next_cell(position)
+                if cell is None or not self.is_free(position, cell, t):
+                    break
+                self.reserve(position, cell, t, agent.id)
+                if first_move is None:
+                    first_move = cell
+                position = cell
+                t += 1
+            # Stopped short of the horizon: the agent holds its cell from then
+            # on, so agents behind it queue up instead of planning through it
+            # (escaped agents leave the maze, so the exit is never held)
+            if position != field.exit_pos:
+                for hold in range(t, end):
+                    self.slots.setdefault((position, hold), agent.id)
+            if first_move is None and field.next_cell(agent.get_position()) is not None:
+                self.waits += 1
+            moves[agent.id] = first_move
+        return moves
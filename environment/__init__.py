@@ -1,7 +1,9 @@
 from .maze import Maze
-from .cell import Cell
+from .cell import Cell, CellView
+from .maze_cache import MazeCache
+from .maze_io import MazeFormatError
 
-__all__ = ['Maze', 'Cell']
+__all__ = ['Maze', 'Cell', 'CellView', 'MazeCache', 'MazeFormatError']
 
 # Environment package initialization
 
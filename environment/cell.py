@@ -1,5 +1,16 @@
 # environment/cell.py
 
+# Bit flags packed into the Maze flag array (one uint8 per cell)
+WALL = 0x01
+START = 0x02
+EXIT = 0x04
+DEAD_END = 0x08
+TRAP = 0x10
+VISITED = 0x20
+
+FLAG_BITS = 0xFF
+
+
 class Cell:
     """Represents a single cell in the maze grid"""
     
@@ -18,7 +29,7 @@ class Cell:
         return f"Cell({self.x}, {self.y})"
     
     def __eq__(self, other):
-        if isinstance(other, Cell):
+        if isinstance(other, (Cell, CellView)):
             return self.x == other.x and self.y == other.y
         return False
     
@@ -28,4 +39,91 @@ class Cell:
     def reset_exploration(self):
         """Reset exploration status"""
         self.visited = False
-        self.explored_by.clear()
\ No newline at end of file
+        self.explored_by.clear()
+
+
+def _flag_property(flag, doc):
+    """Build a read/write boolean property backed by one bit of the flag array"""
+    def getter(self):
+        return bool(self._maze.flags[self.x, self.y] & flag)
+
+    def setter(self, value):
+        # Go through the maze so wall edits invalidate its adjacency cache
+        if value:
+            self._maze._set(self.x, self.y, flag)
+        else:
+            self._maze._clear(self.x, self.y, flag)
+
+    return property(getter, setter, doc=doc)
+
+
+class CellView:
+    """
+    Cell-compatible view onto one entry of a Maze flag array.
+    Reads and writes go straight to the maze's uint8 flags, so views are
+    cheap to create and never hold state of their own.
+    """
+
+    __slots__ = ('_maze', 'x', 'y')
+
+    def __init__(self, maze, x, y):
+        self._maze = maze
+        self.x = x
+        self.y = y
+
+    is_wall = _flag_property(WALL, "True if the cell is impassable")
+    is_start = _flag_property(START, "True for the start cell")
+    is_exit = _flag_property(EXIT, "True for the exit cell")
+    is_dead_end = _flag_property(DEAD_END, "True if the cell is a dead end")
+    is_trap = _flag_property(TRAP, "True for dead-end traps with no escape")
+    visited = _flag_property(VISITED, "True once any agent has explored the cell")
+
+    @property
+    def explored_by(self):
+        """Set of agent IDs that have explored this cell (allocated on demand)"""
+        return self._maze.explored_by.setdefault((self.x, self.y), set())
+
+    def __repr__(self):
+        return f"Cell({self.x}, {self.y})"
+
+    def __eq__(self, other):
+        if isinstance(other, (Cell, CellView)):
+            return self.x == other.x and self.y == other.y
+        return False
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def reset_exploration(self):
+        """Reset exploration status"""
+        self.visited = False
+        self._maze.explored_by.pop((self.x, self.y), None)
+
+
+class GridView:
+    """Compatibility accessor so ``maze.grid[x][y]`` keeps returning cells"""
+
+    __slots__ = ('_maze',)
+
+    def __init__(self, maze):
+        self._maze = maze
+
+    def __len__(self):
+        return self._maze.width
+
+    def __getitem__(self, x):
+        return _GridColumn(self._maze, x)
+
+
+class _GridColumn:
+    __slots__ = ('_maze', '_x')
+
+    def __init__(self, maze, x):
+        self._maze = maze
+        self._x = x
+
+    def __len__(self):
+        return self._maze.height
+
+    def __getitem__(self, y):
+        return CellView(self._maze, self._x, y)
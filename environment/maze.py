@@ -1,43 +1,142 @@
 # environment/maze.py
 
 import random
-from environment.cell import Cell
+import numpy as np
+from environment.cell import (CellView, GridView, WALL, START, EXIT, DEAD_END,
+                              TRAP, VISITED, FLAG_BITS)
+from environment.maze_cache import MazeCache
+from environment.maze_io import read_maze_file, write_maze_file
+from utils.pathfinding import find_path, open_dirs_from_walls
+
+# Neighbor order used throughout the maze; bit i of an open-direction mask
+# means the cell at offset DIRECTIONS[i] is in bounds and not a wall
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+_MASK_OFFSETS = tuple(
+    tuple(d for i, d in enumerate(DIRECTIONS) if mask & (1 << i))
+    for mask in range(16)
+)
 
 class Maze:
     """Maze environment for the simulation"""
     
-    def __init__(self, width, height, wall_density=0.3, use_fixed_maze=True):
+    def __init__(self, width, height, wall_density=0.3, use_fixed_maze=True,
+                 seed=None, cache=None, search_algorithm='bfs'):
         self.width = width
         self.height = height
         self.wall_density = wall_density
         self.use_fixed_maze = use_fixed_maze
-        self.grid = [[Cell(x, y) for y in range(height)] for x in range(width)]
+        self.seed = seed  # None = unseeded; otherwise generate() is reproducible
+        self.rng = random.Random(seed)  # Private RNG - never touches the global random module
+        self.cache = cache  # Optional MazeCache used for seeded generation
+        self.search_algorithm = search_algorithm  # utils.pathfinding algorithm for find_path
+        # One uint8 of bit flags per cell, indexed [x, y]; see environment.cell
+        self.flags = np.zeros((width, height), dtype=np.uint8)
+        self.grid = GridView(self)  # Compatibility view: grid[x][y] -> CellView
+        self.explored_by = {}  # (x, y) -> set of agent IDs, only for explored cells
         self.start_pos = None
         self.exit_pos = None
         self.correct_path_cells = set()  # Store correct path cells to avoid placing dead ends on them
         
-    def generate(self):
-        """Generate a solvable maze"""
+        # Adjacency cache: 4-bit open-direction mask per cell plus lazily built
+        # neighbor tuples (flat index x * height + y). Wall edits mark cells dirty
+        # and only those cells and their neighbors are rebuilt on the next lookup.
+        self.open_dirs = np.zeros((width, height), dtype=np.uint8)
+        self._neighbor_cache = []  # Sized on the first refresh
+        self._open_dirs_bytes = None  # Flat bytes copy of open_dirs for the search engine
+        self._adjacency_stale = True
+        self._dirty_cells = set()
+        
+    def generate(self, seed=None):
+        """
+        Generate a solvable maze.
+        With a seed (passed here or to the constructor) the result is fully
+        determined by (size, generator, seed, wall density) and is loaded from
+        the cache when one is attached.
+        
+        Returns:
+            Number of dead ends in the maze (for the caller to report)
+        """
+        if seed is not None:
+            self.seed = seed
+        if self.seed is not None:
+            self.rng = random.Random(self.seed)
+            if self.cache is not None:
+                key = self.cache_key()
+                if self.cache.load(self, key):
+                    return self.count_dead_ends()
+        
+        self._adjacency_stale = True  # Generators rewrite most walls - rebuild once at the end
         if self.use_fixed_maze:
-            self._generate_fixed_maze()
+            dead_end_count = self._generate_fixed_maze()
         else:
-            self._generate_random_maze()
+            dead_end_count = self._generate_random_maze()
+        self._adjacency_stale = True  # Searches during generation may have left dirty cells
+        self._refresh_adjacency()
+        
+        if self.seed is not None and self.cache is not None:
+            self.cache.store(self, key)
+        return dead_end_count
+    
+    def cache_key(self):
+        """Content address of the maze generate() builds for the current seed"""
+        return MazeCache.make_key(
+            self.width, self.height,
+            'fixed' if self.use_fixed_maze else 'random',
+            self.seed,
+            {'wall_density': self.wall_density}
+        )
+    
+    def set_flags(self, flags):
+        """
+        Replace the whole flag array (e.g. when loading a stored maze).
+        The array is used as-is, so a memory-mapped array stays mapped;
+        adjacency is rebuilt lazily on the first neighbor lookup.
+        """
+        if flags.shape != (self.width, self.height):
+            raise ValueError(f"flag array shape {flags.shape} does not match "
+                             f"maze size {(self.width, self.height)}")
+        self.flags = flags if flags.dtype == np.uint8 else flags.astype(np.uint8)
+        self.explored_by.clear()
+        self._adjacency_stale = True
+    
+    def save(self, path):
+        """Write the maze to a binary maze file (see environment.maze_io)"""
+        write_maze_file(path, self.flags, self.start_pos, self.exit_pos,
+                        self.correct_path_cells)
+    
+    @classmethod
+    def load(cls, path, mmap=True, **kwargs):
+        """
+        Load a maze saved with save().
+        With mmap=True the flag array is mapped copy-on-write from the file, so
+        opening costs the same regardless of maze size and the file is never
+        modified. Extra keyword arguments are passed to the constructor.
+        """
+        data = read_maze_file(path, mmap=mmap)
+        maze = cls(data['width'], data['height'], **kwargs)
+        maze._restore(data)
+        return maze
+    
+    def _restore(self, data):
+        """Adopt flags and layout read by environment.maze_io.read_maze_file"""
+        self.set_flags(data['flags'])
+        self.start_pos = data['start_pos']
+        self.exit_pos = data['exit_pos']
+        self.correct_path_cells = data['correct_path_cells']
     
     def _generate_fixed_maze(self):
         """Generate a PROPER COMPLEX maze with dense walls, corridors, and challenges"""
-        # Start with ALL WALLS
-        for x in range(self.width):
-            for y in range(self.height):
-                self.grid[x][y].is_wall = True
-                self.grid[x][y].is_trap = False
+        # Start with ALL WALLS (and no leftover flags from a previous generation)
+        self.flags.fill(WALL)
+        self.explored_by.clear()
         
         # Keep only border as walls
         for x in range(self.width):
-            self.grid[x][0].is_wall = True
-            self.grid[x][self.height - 1].is_wall = True
+            self._set(x, 0, WALL)
+            self._set(x, self.height - 1, WALL)
         for y in range(self.height):
-            self.grid[0][y].is_wall = True
-            self.grid[self.width - 1][y].is_wall = True
+            self._set(0, y, WALL)
+            self._set(self.width - 1, y, WALL)
         
         # Set start and exit positions
         self.start_pos = (2, 2)
@@ -69,13 +168,13 @@ class Maze:
         self._create_rooms()
         
         # Ensure start and exit are accessible
-        self.grid[self.start_pos[0]][self.start_pos[1]].is_wall = False
-        self.grid[self.start_pos[0]][self.start_pos[1]].is_start = True
-        self.grid[self.exit_pos[0]][self.exit_pos[1]].is_wall = False
-        self.grid[self.exit_pos[0]][self.exit_pos[1]].is_exit = True
+        self._clear(self.start_pos[0], self.start_pos[1], WALL)
+        self._set(self.start_pos[0], self.start_pos[1], START)
+        self._clear(self.exit_pos[0], self.exit_pos[1], WALL)
+        self._set(self.exit_pos[0], self.exit_pos[1], EXIT)
         
         # IMPORTANT: Analyze and mark all actual dead ends in addition to manually created ones
-        self._identify_all_dead_ends()
+        return self._identify_all_dead_ends()
     
     def _carve_maze_passages(self):
         """Carve passages through the walls to create a DENSE maze with narrow corridors"""
@@ -86,8 +185,8 @@ class Maze:
         stack = []
         
         # Start from a random internal point
-        start_x = random.randint(3, self.width - 4)
-        start_y = random.randint(3, self.height - 4)
+        start_x = self.rng.randint(3, self.width - 4)
+        start_y = self.rng.randint(3, self.height - 4)
         stack.append((start_x, start_y))
         
         directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]
@@ -95,7 +194,7 @@ class Maze:
         # Carve passages using recursive backtracking
         while stack:
             x, y = stack[-1]
-            self.grid[x][y].is_wall = False
+            self._clear(x, y, WALL)
             visited.add((x, y))
             
             # Find unvisited neighbors
@@ -108,24 +207,24 @@ class Maze:
             
             if neighbors:
                 # Choose random neighbor
-                nx, ny, dx, dy = random.choice(neighbors)
+                nx, ny, dx, dy = self.rng.choice(neighbors)
                 # Carve path to neighbor
-                self.grid[x + dx // 2][y + dy // 2].is_wall = False
+                self._clear(x + dx // 2, y + dy // 2, WALL)
                 stack.append((nx, ny))
             else:
                 stack.pop()
         
         # Add MANY MORE random connections to create multiple paths and loops
         for _ in range(100):  # Increased from 30 to 100 for MUCH more open maze
-            x = random.randint(3, self.width - 4)
-            y = random.randint(3, self.height - 4)
-            if not self.grid[x][y].is_start and not self.grid[x][y].is_exit:
-                self.grid[x][y].is_wall = False
+            x = self.rng.randint(3, self.width - 4)
+            y = self.rng.randint(3, self.height - 4)
+            if not self._has(x, y, START | EXIT):
+                self._clear(x, y, WALL)
                 # Also carve adjacent cell to create passage
-                direction = random.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
+                direction = self.rng.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
                 nx, ny = x + direction[0], y + direction[1]
                 if 2 < nx < self.width - 2 and 2 < ny < self.height - 2:
-                    self.grid[nx][ny].is_wall = False
+                    self._clear(nx, ny, WALL)
     
     def _create_complex_winding_path(self):
         """Create the MAIN winding path FIRST - this is the solution path"""
@@ -145,10 +244,10 @@ class Maze:
             
             if direction == 'right' and x < ex:
                 # Move right for several steps
-                steps = random.randint(4, 8)
+                steps = self.rng.randint(4, 8)
                 for _ in range(steps):
                     if x < ex:
-                        self.grid[x][y].is_wall = False
+                        self._clear(x, y, WALL)
                         path_cells.append((x, y))
                         x += 1
                         moved = True
@@ -163,10 +262,10 @@ class Maze:
                     
             elif direction == 'down' and y < ey:
                 # Move down for several steps
-                steps = random.randint(4, 8)
+                steps = self.rng.randint(4, 8)
                 for _ in range(steps):
                     if y < ey:
-                        self.grid[x][y].is_wall = False
+                        self._clear(x, y, WALL)
                         path_cells.append((x, y))
                         y += 1
                         moved = True
@@ -179,10 +278,10 @@ class Maze:
                     
             elif direction == 'left' and x > sx + 3:
                 # Move left to create zigzag
-                steps = random.randint(3, 5)
+                steps = self.rng.randint(3, 5)
                 for _ in range(steps):
                     if x > sx + 3:
-                        self.grid[x][y].is_wall = False
+                        self._clear(x, y, WALL)
                         path_cells.append((x, y))
                         x -= 1
                         moved = True
@@ -191,10 +290,10 @@ class Maze:
                 
             elif direction == 'up' and y > sy + 3:
                 # Move up occasionally
-                steps = random.randint(2, 4)
+                steps = self.rng.randint(2, 4)
                 for _ in range(steps):
                     if y > sy + 3:
-                        self.grid[x][y].is_wall = False
+                        self._clear(x, y, WALL)
                         path_cells.append((x, y))
                         y -= 1
                         moved = True
@@ -204,26 +303,26 @@ class Maze:
             # Safety: if stuck, move directly to goal
             if not moved:
                 if x < ex:
-                    self.grid[x][y].is_wall = False
+                    self._clear(x, y, WALL)
                     path_cells.append((x, y))
                     x += 1
                 elif y < ey:
-                    self.grid[x][y].is_wall = False
+                    self._clear(x, y, WALL)
                     path_cells.append((x, y))
                     y += 1
                 elif x > ex:
-                    self.grid[x][y].is_wall = False
+                    self._clear(x, y, WALL)
                     path_cells.append((x, y))
                     x -= 1
                 elif y > ey:
-                    self.grid[x][y].is_wall = False
+                    self._clear(x, y, WALL)
                     path_cells.append((x, y))
                     y -= 1
                 else:
                     break
         
         # Mark exit
-        self.grid[ex][ey].is_wall = False
+        self._clear(ex, ey, WALL)
         path_cells.append((ex, ey))
         
         # Store the correct path
@@ -242,37 +341,20 @@ class Maze:
             for j in range(sy + 5, ey - 5, 3):
                 # If this is on the diagonal, and NOT on our winding path
                 if abs(i - sx - (j - sy)) < 2 and (i, j) not in self.correct_path_cells:
-                    if random.random() < 0.6:  # Only 60% chance to block
-                        self.grid[i][j].is_wall = True
+                    if self.rng.random() < 0.6:  # Only 60% chance to block
+                        self._set(i, j, WALL)
         
         # Add some strategic walls but not complete blocks
         # This makes the correct path less obvious without creating clear barriers
     
     def _verify_path_exists(self):
         """Verify the winding path is still intact"""
-        # Quick BFS check
-        from collections import deque
-        visited = set()
-        queue = deque([self.start_pos])
-        
-        while queue:
-            pos = queue.popleft()
-            if pos == self.exit_pos:
-                return True  # Path exists
-            if pos in visited:
-                continue
-            visited.add(pos)
-            
-            x, y = pos
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if (0 <= nx < self.width and 0 <= ny < self.height and
-                    not self.grid[nx][ny].is_wall and (nx, ny) not in visited):
-                    queue.append((nx, ny))
+        if self._path_exists():
+            return True  # Path exists
         
         # If no path, clear the winding path again
         for px, py in self.correct_path_cells:
-            self.grid[px][py].is_wall = False
+            self._clear(px, py, WALL)
         
         return False
     
@@ -289,42 +371,42 @@ class Maze:
         
         # Place FEWER wall patterns - maze should be mostly open
         for _ in range(10):  # Reduced from 30 to 10
-            cx = random.randint(5, self.width - 6)
-            cy = random.randint(5, self.height - 6)
-            pattern = random.choice(wall_patterns)
+            cx = self.rng.randint(5, self.width - 6)
+            cy = self.rng.randint(5, self.height - 6)
+            pattern = self.rng.choice(wall_patterns)
             
             # Place the pattern - but DON'T block the winding path
             for dx, dy in pattern:
                 x, y = cx + dx, cy + dy
                 if (3 < x < self.width - 3 and 3 < y < self.height - 3 and
-                    not self.grid[x][y].is_start and not self.grid[x][y].is_exit and
+                    not self._has(x, y, START | EXIT) and
                     (x, y) not in self.correct_path_cells):  # DON'T block winding path
-                    self.grid[x][y].is_wall = True
+                    self._set(x, y, WALL)
         
         # Add FEWER long wall segments 
         for _ in range(5):  # Reduced from 15 to 5
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 # Horizontal wall
-                sx = random.randint(4, self.width - 15)
-                sy = random.randint(4, self.height - 4)
-                length = random.randint(3, 5)  # Shorter walls
+                sx = self.rng.randint(4, self.width - 15)
+                sy = self.rng.randint(4, self.height - 4)
+                length = self.rng.randint(3, 5)  # Shorter walls
                 for i in range(length):
                     x = sx + i
                     if (3 < x < self.width - 3 and
-                        not self.grid[x][sy].is_start and not self.grid[x][sy].is_exit and
+                        not self._has(x, sy, START | EXIT) and
                         (x, sy) not in self.correct_path_cells):  # DON'T block winding path
-                        self.grid[x][sy].is_wall = True
+                        self._set(x, sy, WALL)
             else:
                 # Vertical wall
-                sx = random.randint(4, self.width - 4)
-                sy = random.randint(4, self.height - 15)
-                length = random.randint(3, 5)  # Shorter walls
+                sx = self.rng.randint(4, self.width - 4)
+                sy = self.rng.randint(4, self.height - 15)
+                length = self.rng.randint(3, 5)  # Shorter walls
                 for i in range(length):
                     y = sy + i
                     if (3 < y < self.height - 3 and
-                        not self.grid[sx][y].is_start and not self.grid[sx][y].is_exit and
+                        not self._has(sx, y, START | EXIT) and
                         (sx, y) not in self.correct_path_cells):  # DON'T block winding path
-                        self.grid[sx][y].is_wall = True
+                        self._set(sx, y, WALL)
         
         # NO random walls - keep it open
         # Agents need to be able to navigate!
@@ -342,25 +424,25 @@ class Maze:
                 for x in range(rx, rx + rw):
                     for y in range(ry, ry + rh):
                         if (2 < x < self.width - 2 and 2 < y < self.height - 2 and
-                            not self.grid[x][y].is_start and not self.grid[x][y].is_exit):
-                            self.grid[x][y].is_wall = False
+                            not self._has(x, y, START | EXIT)):
+                            self._clear(x, y, WALL)
                 
                 # Add 2-3 doorways
-                num_doors = random.randint(2, 3)
+                num_doors = self.rng.randint(2, 3)
                 for _ in range(num_doors):
-                    side = random.choice(['top', 'bottom', 'left', 'right'])
+                    side = self.rng.choice(['top', 'bottom', 'left', 'right'])
                     if side == 'top' and ry > 2:
-                        dx = random.randint(0, rw - 1)
-                        self.grid[rx + dx][ry - 1].is_wall = False
+                        dx = self.rng.randint(0, rw - 1)
+                        self._clear(rx + dx, ry - 1, WALL)
                     elif side == 'bottom' and ry + rh < self.height - 2:
-                        dx = random.randint(0, rw - 1)
-                        self.grid[rx + dx][ry + rh].is_wall = False
+                        dx = self.rng.randint(0, rw - 1)
+                        self._clear(rx + dx, ry + rh, WALL)
                     elif side == 'left' and rx > 2:
-                        dy = random.randint(0, rh - 1)
-                        self.grid[rx - 1][ry + dy].is_wall = False
+                        dy = self.rng.randint(0, rh - 1)
+                        self._clear(rx - 1, ry + dy, WALL)
                     elif side == 'right' and rx + rw < self.width - 2:
-                        dy = random.randint(0, rh - 1)
-                        self.grid[rx + rw][ry + dy].is_wall = False
+                        dy = self.rng.randint(0, rh - 1)
+                        self._clear(rx + rw, ry + dy, WALL)
     
     def _create_dead_end_corridors(self):
         """Create TRUE dead ends - single cells where if you step in, you CANNOT move (even back)"""
@@ -380,8 +462,8 @@ class Maze:
         
         while len(dead_end_positions) < num_dead_ends and attempts < max_attempts:
             attempts += 1
-            dx = random.randint(5, self.width - 6)
-            dy = random.randint(5, self.height - 6)
+            dx = self.rng.randint(5, self.width - 6)
+            dy = self.rng.randint(5, self.height - 6)
             
             # Skip if on correct path
             if (dx, dy) in self.correct_path_cells:
@@ -408,26 +490,25 @@ class Maze:
         for dx, dy in dead_end_positions:
             # Make sure this cell is a path (not wall)
             if (2 < dx < self.width - 2 and 2 < dy < self.height - 2 and
-                not self.grid[dx][dy].is_start and not self.grid[dx][dy].is_exit):
+                not self._has(dx, dy, START | EXIT)):
                 
                 # Clear the cell itself
-                self.grid[dx][dy].is_wall = False
+                self._clear(dx, dy, WALL)
                 
                 # Mark as DEAD END - true trap
-                self.grid[dx][dy].is_dead_end = True
-                self.grid[dx][dy].is_trap = True
+                self._set(dx, dy, DEAD_END | TRAP)
                 
                 # Make sure it has at least one entrance (so agents can enter)
                 # But once inside, they CANNOT leave (we'll handle this in agent logic)
                 # Create one path leading TO this dead end
-                entrance_dir = random.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
+                entrance_dir = self.rng.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
                 entrance_x = dx + entrance_dir[0]
                 entrance_y = dy + entrance_dir[1]
                 
                 if 2 < entrance_x < self.width - 2 and 2 < entrance_y < self.height - 2:
                     # Also make sure entrance is not on correct path
                     if (entrance_x, entrance_y) not in self.correct_path_cells:
-                        self.grid[entrance_x][entrance_y].is_wall = False
+                        self._clear(entrance_x, entrance_y, WALL)
     
     def _create_trap_zones(self):
         """Create wrong path zones - you can explore and backtrack, but they don't lead to exit"""
@@ -448,8 +529,8 @@ class Maze:
         
         while len(trap_centers) < num_traps and attempts < max_attempts:
             attempts += 1
-            tx = random.randint(5, self.width - 6)
-            ty = random.randint(5, self.height - 6)
+            tx = self.rng.randint(5, self.width - 6)
+            ty = self.rng.randint(5, self.height - 6)
             
             # Skip if on correct path
             if (tx, ty) in self.correct_path_cells:
@@ -481,7 +562,7 @@ class Maze:
                 continue
             
             # Create a small area with paths (wrong path zone)
-            zone_size = random.choice([3, 4])
+            zone_size = self.rng.choice([3, 4])
             offset = zone_size // 2
             
             # Clear some paths in this zone
@@ -494,46 +575,46 @@ class Maze:
                         continue
                     
                     if (2 < x < self.width - 2 and 2 < y < self.height - 2 and
-                        not self.grid[x][y].is_start and not self.grid[x][y].is_exit):
+                        not self._has(x, y, START | EXIT)):
                         # Make it a path, but it's a "wrong path" area
-                        self.grid[x][y].is_wall = False
+                        self._clear(x, y, WALL)
                         # Don't mark as trap - agents can move freely here
             
             # Add some internal walls to make it maze-like
             for _ in range(3):
-                wx = tx + random.randint(-offset, offset)
-                wy = ty + random.randint(-offset, offset)
+                wx = tx + self.rng.randint(-offset, offset)
+                wy = ty + self.rng.randint(-offset, offset)
                 
                 # Skip if on correct path
                 if (wx, wy) in self.correct_path_cells:
                     continue
                 
                 if (2 < wx < self.width - 2 and 2 < wy < self.height - 2 and
-                    not self.grid[wx][wy].is_start and not self.grid[wx][wy].is_exit):
-                    self.grid[wx][wy].is_wall = True
+                    not self._has(wx, wy, START | EXIT)):
+                    self._set(wx, wy, WALL)
             
             # Create entrance
-            entrance_side = random.choice(['top', 'bottom', 'left', 'right'])
+            entrance_side = self.rng.choice(['top', 'bottom', 'left', 'right'])
             if entrance_side == 'top' and ty - offset - 1 > 1:
                 for step in range(2):
                     ey = ty - offset - 1 - step
                     if 2 < tx < self.width - 2 and 1 < ey < self.height - 1:
-                        self.grid[tx][ey].is_wall = False
+                        self._clear(tx, ey, WALL)
             elif entrance_side == 'bottom' and ty + offset + 1 < self.height - 1:
                 for step in range(2):
                     ey = ty + offset + 1 + step
                     if 2 < tx < self.width - 2 and 1 < ey < self.height - 1:
-                        self.grid[tx][ey].is_wall = False
+                        self._clear(tx, ey, WALL)
             elif entrance_side == 'left' and tx - offset - 1 > 1:
                 for step in range(2):
                     ex = tx - offset - 1 - step
                     if 1 < ex < self.width - 1 and 2 < ty < self.height - 2:
-                        self.grid[ex][ty].is_wall = False
+                        self._clear(ex, ty, WALL)
             elif entrance_side == 'right' and tx + offset + 1 < self.width - 1:
                 for step in range(2):
                     ex = tx + offset + 1 + step
                     if 1 < ex < self.width - 1 and 2 < ty < self.height - 2:
-                        self.grid[ex][ty].is_wall = False
+                        self._clear(ex, ty, WALL)
     
     
     def _ensure_solvable_path(self):
@@ -544,9 +625,7 @@ class Maze:
             for dy in [-1, 0, 1]:
                 x, y = sx + dx, sy + dy
                 if 1 < x < self.width - 1 and 1 < y < self.height - 1:
-                    self.grid[x][y].is_wall = False
-                    self.grid[x][y].is_trap = False
-                    self.grid[x][y].is_dead_end = False
+                    self._clear(x, y, WALL | DEAD_END | TRAP)
         
         # Clear immediate area around exit
         ex, ey = self.exit_pos
@@ -554,9 +633,7 @@ class Maze:
             for dy in [-1, 0, 1]:
                 x, y = ex + dx, ey + dy
                 if 1 < x < self.width - 1 and 1 < y < self.height - 1:
-                    self.grid[x][y].is_wall = False
-                    self.grid[x][y].is_trap = False
-                    self.grid[x][y].is_dead_end = False
+                    self._clear(x, y, WALL | DEAD_END | TRAP)
         
         # Find the correct path using BFS and store it
         correct_path = self._find_path_bfs()
@@ -571,152 +648,94 @@ class Maze:
         if correct_path:
             self.correct_path_cells = set(correct_path)
             for x, y in correct_path:
-                self.grid[x][y].is_wall = False
-                self.grid[x][y].is_dead_end = False
-                self.grid[x][y].is_trap = False
+                self._clear(x, y, WALL | DEAD_END | TRAP)
         else:
             # Fallback - use simple guaranteed path
             self.correct_path_cells = set()
             x, y = sx, sy
             while x < ex:
-                self.grid[x][y].is_wall = False
-                self.grid[x][y].is_dead_end = False
-                self.grid[x][y].is_trap = False
+                self._clear(x, y, WALL | DEAD_END | TRAP)
                 self.correct_path_cells.add((x, y))
                 x += 1
             while y < ey:
-                self.grid[x][y].is_wall = False
-                self.grid[x][y].is_dead_end = False
-                self.grid[x][y].is_trap = False
+                self._clear(x, y, WALL | DEAD_END | TRAP)
                 self.correct_path_cells.add((x, y))
                 y += 1
-            self.grid[ex][ey].is_wall = False
-            self.grid[ex][ey].is_dead_end = False
-            self.grid[ex][ey].is_trap = False
+            self._clear(ex, ey, WALL | DEAD_END | TRAP)
             self.correct_path_cells.add((ex, ey))
     
     def _find_path_bfs(self):
         """Use BFS to find a path from start to exit and return the path"""
-        from collections import deque
-        
-        visited = set()
-        queue = deque([(self.start_pos, [self.start_pos])])
-        
-        while queue:
-            (x, y), path = queue.popleft()
-            
-            if (x, y) == self.exit_pos:
-                return path
-            
-            if (x, y) in visited:
-                continue
-            visited.add((x, y))
-            
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if (0 <= nx < self.width and 0 <= ny < self.height and
-                    not self.grid[nx][ny].is_wall and (nx, ny) not in visited):
-                    queue.append(((nx, ny), path + [(nx, ny)]))
-        
-        return None
+        return self.find_path(self.start_pos, self.exit_pos).path
     
     def _generate_random_maze(self):
         """Generate a random solvable maze (original method)"""
         # Clear the maze
-        for x in range(self.width):
-            for y in range(self.height):
-                self.grid[x][y].is_wall = False
+        self.flags.fill(0)
+        self.explored_by.clear()
         
         # Add random walls
         for x in range(self.width):
             for y in range(self.height):
-                if random.random() < self.wall_density:
-                    self.grid[x][y].is_wall = True
+                if self.rng.random() < self.wall_density:
+                    self._set(x, y, WALL)
         
         # Set start position (top-left area)
         self.start_pos = (1, 1)
-        self.grid[1][1].is_wall = False
-        self.grid[1][1].is_start = True
+        self._clear(1, 1, WALL)
+        self._set(1, 1, START)
         
         # Set exit position (bottom-right area)
         self.exit_pos = (self.width - 2, self.height - 2)
-        self.grid[self.width - 2][self.height - 2].is_wall = False
-        self.grid[self.width - 2][self.height - 2].is_exit = True
+        self._clear(self.width - 2, self.height - 2, WALL)
+        self._set(self.width - 2, self.height - 2, EXIT)
         
         # Ensure path exists from start to exit
         self._ensure_path()
         
         # Add borders
         for x in range(self.width):
-            self.grid[x][0].is_wall = True
-            self.grid[x][self.height - 1].is_wall = True
+            self._set(x, 0, WALL)
+            self._set(x, self.height - 1, WALL)
         for y in range(self.height):
-            self.grid[0][y].is_wall = True
-            self.grid[self.width - 1][y].is_wall = True
+            self._set(0, y, WALL)
+            self._set(self.width - 1, y, WALL)
         
         # IMPORTANT: Analyze and mark all actual dead ends
-        self._identify_all_dead_ends()
+        return self._identify_all_dead_ends()
     
     def _identify_all_dead_ends(self):
         """
         Analyze the entire maze and mark ALL cells that are actual dead ends.
         A dead end is a cell with only ONE non-wall neighbor (no way out except back).
-        """
-        dead_end_count = 0
+        Works on the whole interior at once: open-neighbor counts come from summing
+        the four shifted copies of the open mask, and flags are rewritten in bulk.
         
-        for x in range(1, self.width - 1):
-            for y in range(1, self.height - 1):
-                cell = self.grid[x][y]
-                
-                # Skip walls, start, and exit
-                if cell.is_wall or cell.is_start or cell.is_exit:
-                    continue
-                
-                # Count non-wall neighbors
-                neighbors = []
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    nx, ny = x + dx, y + dy
-                    if (0 <= nx < self.width and 0 <= ny < self.height and
-                        not self.grid[nx][ny].is_wall):
-                        neighbors.append((nx, ny))
-                
-                # If only 1 neighbor, this is a dead end!
-                if len(neighbors) == 1:
-                    cell.is_dead_end = True
-                    cell.is_trap = True  # Dead ends are traps
-                    dead_end_count += 1
-                else:
-                    # Make sure it's not marked as dead end
-                    cell.is_dead_end = False
-                    cell.is_trap = False
-        
-        print(f"Identified {dead_end_count} dead ends in the maze")
+        Returns:
+            Number of dead ends marked
+        """
+        is_open = ((self.flags & WALL) == 0).astype(np.uint8)
+        
+        # Count non-wall neighbors of every interior cell
+        open_neighbors = (is_open[1:-1, 2:] + is_open[2:, 1:-1] +
+                          is_open[1:-1, :-2] + is_open[:-2, 1:-1])
+        
+        # Skip walls, start, and exit
+        interior = self.flags[1:-1, 1:-1]  # View - writes go straight into self.flags
+        candidates = (interior & (WALL | START | EXIT)) == 0
+        
+        # If only 1 neighbor, this is a dead end! Dead ends are traps;
+        # every other candidate is cleared so stale marks do not survive
+        dead_ends = candidates & (open_neighbors == 1)
+        marks = np.uint8(DEAD_END | TRAP)
+        interior &= ~(candidates * marks)
+        interior |= dead_ends * marks
+        return int(np.count_nonzero(dead_ends))
     
     
     def _path_exists(self):
         """Check if a path exists from start to exit using BFS"""
-        from collections import deque
-        
-        visited = set()
-        queue = deque([self.start_pos])
-        
-        while queue:
-            x, y = queue.popleft()
-            
-            if (x, y) == self.exit_pos:
-                return True
-            
-            if (x, y) in visited:
-                continue
-            visited.add((x, y))
-            
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if (0 <= nx < self.width and 0 <= ny < self.height and
-                    not self.grid[nx][ny].is_wall and (nx, ny) not in visited):
-                    queue.append((nx, ny))
-        
-        return False
+        return self.find_path(self.start_pos, self.exit_pos).found
     
     def _create_guaranteed_path(self):
         """Create a COMPLEX winding path from start to exit with MANY turns"""
@@ -737,90 +756,74 @@ class Maze:
             # Try to move in current direction
             if direction == 'right' and x < ex - 1:
                 # Move right for a random distance
-                steps = random.randint(3, 6)
+                steps = self.rng.randint(3, 6)
                 for _ in range(steps):
                     if x < ex:
-                        self.grid[x][y].is_wall = False
-                        self.grid[x][y].is_dead_end = False
-                        self.grid[x][y].is_trap = False
+                        self._clear(x, y, WALL | DEAD_END | TRAP)
                         path_cells.append((x, y))
                         x += 1
                         moved = True
                 # Change direction
-                direction = random.choice(['down', 'up']) if y != ey else 'down'
+                direction = self.rng.choice(['down', 'up']) if y != ey else 'down'
                 
             elif direction == 'left' and x > sx + 2:
                 # Move left for a random distance
-                steps = random.randint(2, 4)
+                steps = self.rng.randint(2, 4)
                 for _ in range(steps):
                     if x > sx + 2:
-                        self.grid[x][y].is_wall = False
-                        self.grid[x][y].is_dead_end = False
-                        self.grid[x][y].is_trap = False
+                        self._clear(x, y, WALL | DEAD_END | TRAP)
                         path_cells.append((x, y))
                         x -= 1
                         moved = True
                 # Change direction
-                direction = random.choice(['down', 'right'])
+                direction = self.rng.choice(['down', 'right'])
                 
             elif direction == 'down' and y < ey - 1:
                 # Move down for a random distance
-                steps = random.randint(3, 6)
+                steps = self.rng.randint(3, 6)
                 for _ in range(steps):
                     if y < ey:
-                        self.grid[x][y].is_wall = False
-                        self.grid[x][y].is_dead_end = False
-                        self.grid[x][y].is_trap = False
+                        self._clear(x, y, WALL | DEAD_END | TRAP)
                         path_cells.append((x, y))
                         y += 1
                         moved = True
                 # Change direction - sometimes go left to make it interesting
-                if x > ex and random.random() < 0.3:
+                if x > ex and self.rng.random() < 0.3:
                     direction = 'left'
                 else:
-                    direction = random.choice(['right', 'left']) if x != ex else 'right'
+                    direction = self.rng.choice(['right', 'left']) if x != ex else 'right'
                     
             elif direction == 'up' and y > sy + 2:
                 # Move up for a random distance
-                steps = random.randint(2, 4)
+                steps = self.rng.randint(2, 4)
                 for _ in range(steps):
                     if y > sy + 2:
-                        self.grid[x][y].is_wall = False
-                        self.grid[x][y].is_dead_end = False
-                        self.grid[x][y].is_trap = False
+                        self._clear(x, y, WALL | DEAD_END | TRAP)
                         path_cells.append((x, y))
                         y -= 1
                         moved = True
                 # Change direction
-                direction = random.choice(['right', 'down'])
+                direction = self.rng.choice(['right', 'down'])
             
             # If stuck, move directly toward goal
             if not moved:
                 if x < ex:
-                    self.grid[x][y].is_wall = False
-                    self.grid[x][y].is_dead_end = False
-                    self.grid[x][y].is_trap = False
+                    self._clear(x, y, WALL | DEAD_END | TRAP)
                     path_cells.append((x, y))
                     x += 1
                     direction = 'right'
                 elif y < ey:
-                    self.grid[x][y].is_wall = False
-                    self.grid[x][y].is_dead_end = False
-                    self.grid[x][y].is_trap = False
+                    self._clear(x, y, WALL | DEAD_END | TRAP)
                     path_cells.append((x, y))
                     y += 1
                     direction = 'down'
                 elif x > ex:
-                    self.grid[x][y].is_wall = False
-                    self.grid[x][y].is_dead_end = False
-                    self.grid[x][y].is_trap = False
+                    self._clear(x, y, WALL | DEAD_END | TRAP)
                     path_cells.append((x, y))
                     x -= 1
                     direction = 'left'
                 elif y > ey:
-                    self.grid[x][y].is_wall = False
-                    self.grid[x][y].is_dead_end = False
-                    self.grid[x][y].is_trap = False
+                    self._clear(x, y, WALL | DEAD_END | TRAP)
                     path_cells.append((x, y))
                     y -= 1
                     direction = 'up'
@@ -828,51 +831,24 @@ class Maze:
                     break
         
         # Ensure exit is reachable
-        self.grid[ex][ey].is_wall = False
-        self.grid[ex][ey].is_dead_end = False
-        self.grid[ex][ey].is_trap = False
+        self._clear(ex, ey, WALL | DEAD_END | TRAP)
         path_cells.append((ex, ey))
         
         # Clear cells around the path to make corridors (but keep it narrow)
         for px, py in path_cells:
             # Only clear one random adjacent cell to keep it challenging
-            if random.random() < 0.4:
-                direction = random.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
+            if self.rng.random() < 0.4:
+                direction = self.rng.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
                 dx, dy = direction
                 nx, ny = px + dx, py + dy
                 if 1 < nx < self.width - 2 and 1 < ny < self.height - 2:
-                    self.grid[nx][ny].is_wall = False
-                    self.grid[nx][ny].is_dead_end = False
-                    self.grid[nx][ny].is_trap = False
+                    self._clear(nx, ny, WALL | DEAD_END | TRAP)
     
     def _ensure_path(self):
         """Use BFS to ensure a path exists, carving one if needed"""
-        from collections import deque
-        
-        visited = set()
-        queue = deque([self.start_pos])
-        parent = {self.start_pos: None}
-        
-        while queue:
-            x, y = queue.popleft()
-            
-            if (x, y) == self.exit_pos:
-                # Path exists
-                return
-            
-            if (x, y) in visited:
-                continue
-            visited.add((x, y))
-            
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if (0 <= nx < self.width and 0 <= ny < self.height and
-                    not self.grid[nx][ny].is_wall and (nx, ny) not in visited):
-                    queue.append((nx, ny))
-                    parent[(nx, ny)] = (x, y)
-        
-        # No path found, carve one
-        self._carve_path()
+        if not self._path_exists():
+            # No path found, carve one
+            self._carve_path()
     
     def _carve_path(self):
         """Carve a guaranteed path from start to exit"""
@@ -881,31 +857,111 @@ class Maze:
         
         # Simple path carving: move right then down
         while x < ex:
-            self.grid[x][y].is_wall = False
+            self._clear(x, y, WALL)
             x += 1
         while y < ey:
-            self.grid[x][y].is_wall = False
+            self._clear(x, y, WALL)
             y += 1
-        self.grid[ex][ey].is_wall = False
+        self._clear(ex, ey, WALL)
     
     def get_neighbors(self, x, y):
-        """Get valid neighboring cells (not walls)"""
-        neighbors = []
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if (0 <= nx < self.width and 0 <= ny < self.height and
-                not self.grid[nx][ny].is_wall):
-                neighbors.append((nx, ny))
-        return neighbors
+        """Get valid neighboring cells (not walls) as a cached tuple"""
+        if self._adjacency_stale or self._dirty_cells:
+            self._refresh_adjacency()
+        if 0 <= x < self.width and 0 <= y < self.height:
+            index = x * self.height + y
+            neighbors = self._neighbor_cache[index]
+            if neighbors is None:
+                neighbors = tuple((x + dx, y + dy)
+                                  for dx, dy in _MASK_OFFSETS[self.open_dirs[x, y]])
+                self._neighbor_cache[index] = neighbors
+            return neighbors
+        return tuple((x + dx, y + dy) for dx, dy in DIRECTIONS
+                     if 0 <= x + dx < self.width and 0 <= y + dy < self.height and
+                     not self._has(x + dx, y + dy, WALL))
+    
+    def get_open_dirs(self):
+        """Get the up-to-date (width, height) array of 4-bit open-direction masks"""
+        if self._adjacency_stale or self._dirty_cells:
+            self._refresh_adjacency()
+        return self.open_dirs
+    
+    def get_open_dirs_bytes(self):
+        """Get open_dirs flattened to bytes (index x * height + y), cached until walls change"""
+        if self._adjacency_stale or self._dirty_cells:
+            self._refresh_adjacency()
+        if self._open_dirs_bytes is None:
+            self._open_dirs_bytes = self.open_dirs.tobytes()
+        return self._open_dirs_bytes
+    
+    def find_path(self, start, goal):
+        """Path between two positions as a SearchResult, using self.search_algorithm"""
+        return find_path(self, start, (goal,), self.search_algorithm)
+    
+    def _refresh_adjacency(self):
+        """Bring open_dirs and the neighbor cache in line with the wall flags"""
+        self._open_dirs_bytes = None
+        if self._adjacency_stale:
+            self.open_dirs = open_dirs_from_walls((self.flags & WALL) != 0)
+            self._neighbor_cache = [None] * (self.width * self.height)
+            self._adjacency_stale = False
+            self._dirty_cells.clear()
+            return
+        
+        # Incremental: a wall change at (x, y) only affects the masks of its neighbors
+        touched = set()
+        for x, y in self._dirty_cells:
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.width and 0 <= ny < self.height:
+                    touched.add((nx, ny))
+        self._dirty_cells.clear()
+        for x, y in touched:
+            mask = 0
+            for bit, (dx, dy) in enumerate(DIRECTIONS):
+                nx, ny = x + dx, y + dy
+                if (0 <= nx < self.width and 0 <= ny < self.height and
+                    not self._has(nx, ny, WALL)):
+                    mask |= 1 << bit
+            self.open_dirs[x, y] = mask
+            self._neighbor_cache[x * self.height + y] = None
     
     def get_cell(self, x, y):
-        """Get cell at position"""
+        """Get a Cell-compatible view of the position (None if out of bounds)"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.grid[x][y]
+            return CellView(self, x, y)
         return None
     
+    def has_flag(self, x, y, flag):
+        """Check whether any of the given flag bits are set (False if out of bounds)"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.flags[x, y] & flag)
+        return False
+    
+    def count_dead_ends(self):
+        """Number of open cells flagged as dead ends"""
+        return int(np.count_nonzero((self.flags & (DEAD_END | WALL)) == DEAD_END))
+    
     def mark_dead_end(self, x, y):
         """Mark a position as a dead end"""
-        cell = self.get_cell(x, y)
-        if cell:
-            cell.is_dead_end = True
\ No newline at end of file
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self._set(x, y, DEAD_END)
+    
+    def mark_explored(self, x, y, agent_id):
+        """Record that an agent has explored the cell at (x, y)"""
+        self._set(x, y, VISITED)
+        self.explored_by.setdefault((x, y), set()).add(agent_id)
+    
+    def _has(self, x, y, flag):
+        """Unchecked flag test used by the generators"""
+        return self.flags[x, y] & flag
+    
+    def _set(self, x, y, flag):
+        self.flags[x, y] |= flag
+        if flag & WALL and not self._adjacency_stale:
+            self._dirty_cells.add((x, y))
+    
+    def _clear(self, x, y, flag):
+        self.flags[x, y] &= FLAG_BITS ^ flag
+        if flag & WALL and not self._adjacency_stale:
+            self._dirty_cells.add((x, y))
\ No newline at end of file
@@ -0,0 +1,90 @@
+# environment/maze_cache.py
+
+import hashlib
+import json
+import os
+
+from environment.maze_io import read_maze_file
+
+# Bump whenever the generators change, so stale cached mazes are never reused
+GENERATOR_VERSION = 1
+
+
+class MazeCache:
+    """
+    Content-addressed on-disk store of generated mazes.
+    A maze is identified by (width, height, generator, seed, parameters); the
+    SHA-256 of that key names the file, so identical requests share one entry.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding cached mazes (created on first store)
+        """
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(width, height, generator, seed, params=None):
+        """
+        Build the content address of a maze
+
+        Args:
+            width: Maze width
+            height: Maze height
+            generator: Generator name ('fixed' or 'random')
+            seed: Integer seed the maze was generated from
+            params: Extra generator parameters (e.g. wall density)
+
+        Returns:
+            Hex digest identifying the maze
+        """
+        description = json.dumps({
+            'version': GENERATOR_VERSION,
+            'width': width,
+            'height': height,
+            'generator': generator,
+            'seed': seed,
+            'params': params or {},
+        }, sort_keys=True)
+        return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+    def path_for(self, key):
+        """Get the file path used for a key"""
+        return os.path.join(self.cache_dir, f"{key}.maze")
+
+    def load(self, maze, key):
+        """
+        Load a cached maze into an existing Maze object.
+        The flag array is memory-mapped, so a hit costs the same for any maze size.
+
+        Returns:
+            True if the key was cached and the maze was restored
+        """
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return False
+
+        try:
+            data = read_maze_file(path, mmap=True)
+        except ValueError:  # MazeFormatError, or a file too short to map
+            # Unreadable or truncated entry - regenerate and overwrite it
+            self.misses += 1
+            return False
+        if (data['width'], data['height']) != (maze.width, maze.height):
+            self.misses += 1
+            return False
+
+        maze._restore(data)
+        self.hits += 1
+        return True
+
+    def store(self, maze, key):
+        """Write a freshly generated maze to the cache"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        maze.save(self.path_for(key))
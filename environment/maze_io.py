@@ -0,0 +1,98 @@
+# environment/maze_io.py
+
+import os
+import struct
+
+import numpy as np
+
+# Binary maze file layout (little-endian):
+#   header   MAGIC, version, width, height, start x/y, exit x/y,
+#            number of correct-path cells, byte offset of the flag array
+#   path     correct_path_cells as int32 (x, y) pairs
+#   padding  zero bytes up to the next FLAGS_ALIGNMENT boundary
+#   flags    width * height uint8 bit flags in [x, y] (C) order
+MAGIC = b'MAZE'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHIIiiiiII')
+FLAGS_ALIGNMENT = 64
+
+
+class MazeFormatError(ValueError):
+    """Raised when a file is not a maze file this version can read"""
+
+
+def write_maze_file(path, flags, start_pos, exit_pos, correct_path_cells):
+    """
+    Write a maze to disk in the binary maze format
+
+    Args:
+        path: Destination file path
+        flags: (width, height) uint8 flag array
+        start_pos: Start position (x, y)
+        exit_pos: Exit position (x, y)
+        correct_path_cells: Iterable of (x, y) cells on the solution path
+    """
+    width, height = flags.shape
+    path_cells = np.array(sorted(correct_path_cells), dtype='<i4').reshape(-1, 2)
+    body_start = HEADER.size + path_cells.nbytes
+    flags_offset = -(-body_start // FLAGS_ALIGNMENT) * FLAGS_ALIGNMENT
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, width, height,
+        start_pos[0], start_pos[1], exit_pos[0], exit_pos[1],
+        len(path_cells), flags_offset
+    )
+
+    # Write under a temporary name and rename, so readers (or an open mmap of
+    # the old file) never see a half-written maze
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(path_cells.tobytes())
+        f.write(b'\0' * (flags_offset - body_start))
+        f.write(np.ascontiguousarray(flags, dtype=np.uint8).tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_maze_file(path, mmap=True):
+    """
+    Read a binary maze file
+
+    Args:
+        path: Maze file path
+        mmap: Map the flag array straight from the file (copy-on-write, so
+              simulation writes never reach the disk) instead of reading it
+
+    Returns:
+        Dict with width, height, start_pos, exit_pos, correct_path_cells, flags
+    """
+    with open(path, 'rb') as f:
+        raw_header = f.read(HEADER.size)
+        if len(raw_header) < HEADER.size:
+            raise MazeFormatError(f"{path}: truncated header")
+        (magic, version, _reserved, width, height, start_x, start_y,
+         exit_x, exit_y, path_len, flags_offset) = HEADER.unpack(raw_header)
+        if magic != MAGIC:
+            raise MazeFormatError(f"{path}: not a maze file")
+        if version != FORMAT_VERSION:
+            raise MazeFormatError(f"{path}: unsupported maze format version {version}")
+
+        path_cells = np.frombuffer(f.read(path_len * 8), dtype='<i4').reshape(-1, 2)
+        if mmap:
+            flags = np.memmap(f, dtype=np.uint8, mode='c', offset=flags_offset,
+                              shape=(width, height))
+        else:
+            f.seek(flags_offset)
+            flags = np.fromfile(f, dtype=np.uint8, count=width * height)
+            if flags.size != width * height:
+                raise MazeFormatError(f"{path}: truncated flag array")
+            flags = flags.reshape(width, height)
+
+    return {
+        'width': width,
+        'height': height,
+        'start_pos': (start_x, start_y),
+        'exit_pos': (exit_x, exit_y),
+        'correct_path_cells': set(map(tuple, path_cells.tolist())),
+        'flags': flags,
+    }
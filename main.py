@@ -2,15 +2,20 @@
 # main.py - Main entry point for Multi-Agent Maze Escape Simulation
 
 import sys
+import json
+import time
 import argparse
 from environment.maze import Maze
+from environment.maze_cache import MazeCache
+from utils.pathfinding import ALGORITHMS
+from utils.tracing import EventTracer, EVENT_CATEGORIES
 from simulation.simulator import Simulator
-from visualization.renderer import Renderer
-from simulation.metrics import MetricsCollector
 import config
 
 def run_visualization_mode(args):
     """Run simulation with pygame visualization"""
+    from visualization.renderer import Renderer
+    
     print("Starting Multi-Agent Maze Escape Simulation...")
     print(f"Maze Size: {config.MAZE_WIDTH}x{config.MAZE_HEIGHT}")
     print(f"Max Steps: {config.MAX_STEPS}")
@@ -18,18 +23,31 @@ def run_visualization_mode(args):
     
     # Create maze (fixed by default for better reliability)
     maze = Maze(config.MAZE_WIDTH, config.MAZE_HEIGHT, config.WALL_DENSITY, 
-                use_fixed_maze=not args.random_maze)
-    maze.generate()
+                use_fixed_maze=not args.random_maze, seed=args.seed,
+                search_algorithm=args.search)
+    dead_end_count = maze.generate()
+    print(f"Identified {dead_end_count} dead ends in the maze")
     print("Maze generated successfully!")
     print(f"Start: {maze.start_pos}, Exit: {maze.exit_pos}\n")
     
+    tracer = EventTracer(args.trace, args.trace_file)
+    if tracer.enabled:
+        print(f"Tracing {', '.join(args.trace)} events to {args.trace_file}\n")
+    
     # Create initial simulator with default number of agents
     simulator = Simulator(
         maze,
         config.NUM_AGENTS,
         config.AGENT_ENERGY,
         config.AGENT_VISION_RANGE,
-        config.COMMUNICATION_RANGE
+        config.COMMUNICATION_RANGE,
+        broadcast_capacity=config.BROADCAST_CAPACITY,
+        overflow_policy=config.BROADCAST_OVERFLOW_POLICY,
+        communication_mode=config.COMMUNICATION_MODE,
+        coalesce_window=config.BROADCAST_COALESCE_WINDOW,
+        assignment_method=config.ASSIGNMENT_METHOD,
+        reservation_horizon=config.EVACUATION_RESERVATION_HORIZON,
+        tracer=tracer
     )
     
     # Create renderer - it will handle agent selection on startup
@@ -47,7 +65,8 @@ def run_visualization_mode(args):
     print("  SPACE: Pause/Unpause\n")
     
     # Run renderer
-    results = renderer.run(max_steps=config.MAX_STEPS)
+    with tracer:
+        results = renderer.run(max_steps=config.MAX_STEPS)
     
     # Print results
     print("\n" + "="*60)
@@ -66,12 +85,17 @@ def run_visualization_mode(args):
 
 def run_benchmark_mode(args):
     """Run performance benchmark comparing different agent counts"""
+    from simulation.metrics import MetricsCollector
+    
     print("Running Performance Benchmark...")
     print("This will test multiple agent configurations\n")
     
     # Create maze (use fixed maze for consistent benchmarking)
+    # Seeded mazes are cached on disk so repeated sweeps load instead of regenerating
+    cache = None if args.no_cache else MazeCache(config.MAZE_CACHE_DIR)
     maze = Maze(config.MAZE_WIDTH, config.MAZE_HEIGHT, config.WALL_DENSITY, 
-                use_fixed_maze=not args.random_maze)
+                use_fixed_maze=not args.random_maze, cache=cache,
+                search_algorithm=args.search)
     
     # Create metrics collector
     metrics = MetricsCollector()
@@ -82,6 +106,8 @@ def run_benchmark_mode(args):
     
     print(f"Agent counts to test: {agent_counts}")
     print(f"Trials per configuration: {trials}")
+    print(f"Worker processes: {args.workers if args.workers else 'one per CPU'}")
+    print(f"Maze seed: {args.seed if args.seed is not None else 'unseeded'}")
     print(f"Using: {'Fixed Maze' if not args.random_maze else 'Random Maze'}\n")
     
     # Run comparison
@@ -89,7 +115,9 @@ def run_benchmark_mode(args):
         maze,
         Simulator,
         agent_counts,
-        trials=trials
+        trials=trials,
+        seed=args.seed,
+        workers=args.workers
     )
     
     # Print summary
@@ -101,6 +129,53 @@ def run_benchmark_mode(args):
     
     return comparison_data
 
+def run_headless_mode(args):
+    """
+    Run simulations without any GUI or plotting modules loaded; the only
+    output is one JSON line per agent count with the results and the
+    simulation speed in steps per second
+    """
+    agent_counts = args.agents if args.agents else [config.NUM_AGENTS]
+    cache = None if args.no_cache else MazeCache(config.MAZE_CACHE_DIR)
+    tracer = EventTracer(args.trace, args.trace_file)
+    
+    for num_agents in agent_counts:
+        if tracer.enabled:
+            tracer.step = 0
+            tracer.emit('run', agents=num_agents, seed=args.seed)
+        maze = Maze(config.MAZE_WIDTH, config.MAZE_HEIGHT, config.WALL_DENSITY,
+                    use_fixed_maze=not args.random_maze, seed=args.seed, cache=cache,
+                    search_algorithm=args.search)
+        maze.generate()
+        simulator = Simulator(
+            maze,
+            num_agents,
+            config.AGENT_ENERGY,
+            config.AGENT_VISION_RANGE,
+            config.COMMUNICATION_RANGE,
+            broadcast_capacity=config.BROADCAST_CAPACITY,
+            overflow_policy=config.BROADCAST_OVERFLOW_POLICY,
+            communication_mode=config.COMMUNICATION_MODE,
+            coalesce_window=config.BROADCAST_COALESCE_WINDOW,
+            assignment_method=config.ASSIGNMENT_METHOD,
+            reservation_horizon=config.EVACUATION_RESERVATION_HORIZON,
+            tracer=tracer
+        )
+        
+        start_time = time.perf_counter()
+        results = simulator.run_until_complete(max_steps=args.max_steps)
+        elapsed = time.perf_counter() - start_time
+    
+        print(json.dumps({
+            'num_agents': num_agents,
+            'seed': args.seed,
+            'elapsed': elapsed,
+            'steps_per_second': results['steps'] / elapsed if elapsed > 0 else None,
+            'results': results
+        }), flush=True)
+    
+    tracer.close()
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -109,16 +184,16 @@ def main():
     
     parser.add_argument(
         '--mode',
-        choices=['visual', 'benchmark'],
+        choices=['visual', 'benchmark', 'headless'],
         default='visual',
-        help='Run mode: visual (pygame) or benchmark (performance testing)'
+        help='Run mode: visual (pygame), benchmark (performance testing) or headless (JSON results, no GUI)'
     )
     
     parser.add_argument(
         '--agents',
         type=int,
         nargs='+',
-        help='Agent counts to test in benchmark mode (e.g., --agents 1 3 5)'
+        help='Agent counts to test in benchmark or headless mode (e.g., --agents 1 3 5)'
     )
     
     parser.add_argument(
@@ -128,6 +203,13 @@ def main():
         help='Number of trials per configuration in benchmark mode'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=config.BENCHMARK_WORKERS,
+        help='Processes running benchmark trials in parallel (default: one per CPU, 1 = serial)'
+    )
+    
     parser.add_argument(
         '--no-plot',
         action='store_true',
@@ -140,6 +222,47 @@ def main():
         help='Use random maze generation instead of fixed maze (may be unsolvable)'
     )
     
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=config.MAZE_SEED,
+        help='Seed for reproducible maze generation (benchmark trial i uses seed + i)'
+    )
+    
+    parser.add_argument(
+        '--search',
+        choices=ALGORITHMS,
+        default=config.SEARCH_ALGORITHM,
+        help='Pathfinding algorithm used by the maze generator and agents'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Always regenerate seeded mazes instead of using {config.MAZE_CACHE_DIR}/'
+    )
+    
+    parser.add_argument(
+        '--trace',
+        nargs='+',
+        choices=EVENT_CATEGORIES,
+        default=list(config.TRACE_EVENTS),
+        help='Event categories to record in visual or headless mode'
+    )
+    
+    parser.add_argument(
+        '--trace-file',
+        default=config.TRACE_FILE,
+        help='File recorded events are written to (one JSON object per line)'
+    )
+    
+    parser.add_argument(
+        '--max-steps',
+        type=int,
+        default=config.MAX_STEPS,
+        help='Step limit per simulation in headless mode'
+    )
+    
     args = parser.parse_args()
     
     try:
@@ -147,6 +270,8 @@ def main():
             run_visualization_mode(args)
         elif args.mode == 'benchmark':
             run_benchmark_mode(args)
+        elif args.mode == 'headless':
+            run_headless_mode(args)
     except KeyboardInterrupt:
         print("\n\nSimulation interrupted by user")
         sys.exit(0)
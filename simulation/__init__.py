@@ -1,5 +1,6 @@
 # Simulation package initialization
 from .simulator import Simulator
+from .lockstep import LockstepRunner
 from .metrics import MetricsCollector
 
-__all__ = ['Simulator', 'MetricsCollector']
\ No newline at end of file
+__all__ = ['Simulator', 'LockstepRunner', 'MetricsCollector']
\ No newline at end of file
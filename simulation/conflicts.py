@@ -0,0 +1,86 @@
+# simulation/conflicts.py
+#
+# Bulk move-conflict resolution. Positions are encoded as flat cell indices
+# (x * height + y) so grouping agents by target cell is a sort, not a dict of
+# lists.
+
+import numpy as np
+
+NO_MOVE = -1  # Desired cell value for agents that stay put
+
+
+class MovePlan:
+    """Moves the active agents of one simulation want to make this step"""
+
+    __slots__ = ('agent_ids', 'agents', 'current_cells', 'desired_cells')
+
+    def __init__(self, agent_ids, agents, current_cells, desired_cells):
+        self.agent_ids = agent_ids          # Int array of active agent ids, ascending
+        self.agents = agents                # Matching RobotAgent objects
+        self.current_cells = current_cells  # Encoded current cell per agent
+        self.desired_cells = desired_cells  # Encoded desired cell per agent, NO_MOVE to stay put
+
+
+class MoveResolution:
+    """Outcome of one resolve_moves call"""
+
+    __slots__ = ('allowed', 'conflicts', 'swaps')
+
+    def __init__(self, allowed, conflicts, swaps):
+        self.allowed = allowed      # Boolean array: move granted, per agent
+        self.conflicts = conflicts  # [(cell, contender ids ascending, winner id)], winner id order
+        self.swaps = swaps          # [(agent id, agent id)] pairs trading cells this step
+
+
+def resolve_moves(agent_ids, current_cells, desired_cells, allow_swaps=True):
+    """
+    Grant at most one move into each cell
+
+    Args:
+        agent_ids: Int array of agent ids (lower id wins a contested cell)
+        current_cells: Encoded current cell per agent
+        desired_cells: Encoded desired cell per agent, NO_MOVE to stay put
+        allow_swaps: If False, of two agents trading cells only the lower id moves
+
+    Returns:
+        MoveResolution
+    """
+    agent_ids = np.asarray(agent_ids, dtype=np.int64)
+    current_cells = np.asarray(current_cells, dtype=np.int64)
+    desired_cells = np.asarray(desired_cells, dtype=np.int64)
+    allowed = np.zeros(len(agent_ids), dtype=bool)
+
+    movers = np.flatnonzero(desired_cells != NO_MOVE)
+    if movers.size == 0:
+        return MoveResolution(allowed, [], [])
+
+    # Group requests by cell; within a cell the lowest agent id comes first
+    order = movers[np.lexsort((agent_ids[movers], desired_cells[movers]))]
+    cells = desired_cells[order]
+    starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+    allowed[order[starts]] = True
+
+    conflicts = []
+    sizes = np.diff(np.r_[starts, len(order)])
+    for start, size in zip(starts[sizes > 1].tolist(), sizes[sizes > 1].tolist()):
+        contenders = agent_ids[order[start:start + size]].tolist()
+        conflicts.append((int(cells[start]), contenders, contenders[0]))
+    conflicts.sort(key=lambda conflict: conflict[2])
+
+    # Swap conflicts: granted moves a -> b and b -> a in the same step
+    swaps = []
+    granted = np.flatnonzero(allowed)
+    span = int(max(current_cells.max(), desired_cells.max())) + 1
+    edges = current_cells[granted] * span + desired_cells[granted]
+    reverse = desired_cells[granted] * span + current_cells[granted]
+    swapping = granted[np.isin(edges, reverse) & (current_cells[granted] < desired_cells[granted])]
+    if swapping.size:
+        partner_of = {int(edge): int(agent) for edge, agent in zip(edges, agent_ids[granted])}
+        for k in swapping.tolist():
+            me = int(agent_ids[k])
+            partner = partner_of[int(desired_cells[k]) * span + int(current_cells[k])]
+            swaps.append((min(me, partner), max(me, partner)))
+            if not allow_swaps:
+                loser = k if me > partner else int(np.flatnonzero(agent_ids == partner)[0])
+                allowed[loser] = False
+    return MoveResolution(allowed, conflicts, swaps)
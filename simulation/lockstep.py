@@ -0,0 +1,141 @@
+# simulation/lockstep.py
+#
+# Convenience wrapper that steps many independent (maze, agent team)
+# simulations together. Every instance is a full Simulator - its own maze,
+# blackboard, message log, negotiation, perception and move decisions, all
+# run per instance exactly as in a standalone run. Only the bookkeeping is
+# shared: the agents of all instances live in one stacked AgentPopulation, so
+# per-instance progress is one NumPy reduction, and each step the move
+# conflicts of every instance go through a single resolve_moves call. Cells
+# are offset per instance (instance k's cells start at the sum of the earlier
+# mazes' sizes) and so are agent ids, so requests from different instances
+# never meet and within an instance the lower id still wins. Running N mazes
+# this way costs about as much as running them one after another; use it to
+# drive and compare many runs step by step, not for throughput.
+
+import numpy as np
+from agents.population import AgentPopulation, FINISHED
+from simulation.conflicts import MoveResolution, resolve_moves, NO_MOVE
+from simulation.simulator import Simulator
+
+
+class LockstepRunner:
+    """Advances N independent simulations one step at a time, together"""
+
+    def __init__(self, mazes, num_agents, agent_energy, vision_range, comm_range,
+                 simulator_class=Simulator, **simulator_kwargs):
+        """
+        Initialize the runner
+
+        Args:
+            mazes: One generated Maze per instance
+            num_agents: Agents per instance (int for all, or one count per maze)
+            agent_energy, vision_range, comm_range: As for Simulator
+            simulator_class: Simulator (sub)class run for every instance
+            **simulator_kwargs: Further Simulator arguments, shared by all instances
+        """
+        self.mazes = list(mazes)
+        if isinstance(num_agents, int):
+            num_agents = [num_agents] * len(self.mazes)
+        if len(num_agents) != len(self.mazes):
+            raise ValueError(f"Got {len(num_agents)} agent counts for {len(self.mazes)} mazes")
+        self.num_agents = list(num_agents)
+        self.allow_swaps = simulator_kwargs.get('allow_swaps', True)
+
+        # Instance k owns agents agent_offsets[k] .. agent_offsets[k + 1] - 1 of
+        # the stacked population and encoded cells cell_offsets[k] .. of the stacked grid
+        self.agent_offsets = np.concatenate(([0], np.cumsum(self.num_agents))).astype(np.int64)
+        self.cell_offsets = np.concatenate(
+            ([0], np.cumsum([maze.width * maze.height for maze in self.mazes]))).astype(np.int64)
+        self.population = AgentPopulation(int(self.agent_offsets[-1]), 0, 0, agent_energy)
+
+        self.simulators = []
+        for k, maze in enumerate(self.mazes):
+            view = self.population.view(int(self.agent_offsets[k]), int(self.agent_offsets[k + 1]))
+            self.simulators.append(simulator_class(
+                maze, self.num_agents[k], agent_energy, vision_range, comm_range,
+                population=view, **simulator_kwargs
+            ))
+
+    def __len__(self):
+        return len(self.simulators)
+
+    @property
+    def step_count(self):
+        """Lockstep step counter (the highest of the instances)"""
+        return max((sim.step_count for sim in self.simulators), default=0)
+
+    def completed(self):
+        """Boolean array: True for instances whose simulation has finished"""
+        return np.array([sim.simulation_complete for sim in self.simulators], dtype=bool)
+
+    def finished_agents(self):
+        """Per-instance number of agents that escaped or died (one stacked reduction)"""
+        finished = (self.population.status & FINISHED) != 0
+        owner = np.repeat(np.arange(len(self)), self.num_agents)  # Instance of each stacked agent
+        return np.bincount(owner, weights=finished, minlength=len(self)).astype(np.int64)
+
+    def step(self):
+        """
+        Advance every running instance by one step
+
+        Returns:
+            True if at least one instance is still running
+        """
+        plans = []
+        for k, sim in enumerate(self.simulators):
+            plan = sim.plan_moves()
+            if plan is not None:
+                plans.append((k, plan))
+        if not plans:
+            return False
+
+        # Stack all requests into shared coordinates and resolve them at once
+        agent_ids = np.concatenate([plan.agent_ids + self.agent_offsets[k] for k, plan in plans])
+        current_cells = np.concatenate([plan.current_cells + self.cell_offsets[k] for k, plan in plans])
+        desired_cells = np.concatenate([
+            np.where(plan.desired_cells == NO_MOVE, NO_MOVE, plan.desired_cells + self.cell_offsets[k])
+            for k, plan in plans
+        ])
+        resolution = resolve_moves(agent_ids, current_cells, desired_cells, self.allow_swaps)
+
+        # Hand each instance its slice of the result, back in local coordinates
+        conflicts = {}
+        for cell, contenders, winner in resolution.conflicts:
+            k = int(np.searchsorted(self.cell_offsets, cell, side='right')) - 1
+            base = int(self.agent_offsets[k])
+            conflicts.setdefault(k, []).append(
+                (cell - int(self.cell_offsets[k]), [agent - base for agent in contenders], winner - base))
+        swaps = {}
+        for first, second in resolution.swaps:
+            k = int(np.searchsorted(self.agent_offsets, first, side='right')) - 1
+            base = int(self.agent_offsets[k])
+            swaps.setdefault(k, []).append((first - base, second - base))
+
+        start = 0
+        for k, plan in plans:
+            stop = start + len(plan.agent_ids)
+            local = MoveResolution(resolution.allowed[start:stop], conflicts.get(k, []), swaps.get(k, []))
+            self.simulators[k].apply_moves(plan, local)
+            start = stop
+        return True
+
+    def run_until_complete(self, max_steps=1000):
+        """
+        Run all instances until each one completes or max steps
+
+        Returns:
+            List of per-instance results, in Simulator.get_results format
+        """
+        while self.step_count < max_steps and self.step():
+            pass
+        return self.get_results()
+
+    def get_results(self):
+        """Per-instance results, in Simulator.get_results format"""
+        return [sim.get_results() for sim in self.simulators]
+
+    def reset(self):
+        """Reset every instance"""
+        for sim in self.simulators:
+            sim.reset()
@@ -1,7 +1,8 @@
 # simulation/metrics.py
 
-import matplotlib.pyplot as plt
+import random
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 class MetricsCollector:
     """Collects and analyzes simulation metrics"""
@@ -17,48 +18,68 @@ class MetricsCollector:
             'duration': duration
         })
     
-    def compare_agent_counts(self, maze, simulator_class, agent_counts, trials=5):
+    def compare_agent_counts(self, maze, simulator_class, agent_counts, trials=5, seed=None,
+                             workers=None):
         """
         Compare performance with different numbers of agents.
         Run multiple trials for each agent count.
+        With a seed, trial i uses maze seed (seed + i) for every agent count, so
+        all counts face the same mazes and a cached maze is loaded, not rebuilt.
+        Without one a random base seed is drawn, so each trial still gets its
+        own reproducible maze. Simulations are deterministic given the maze, so
+        a trial gives the same result in whichever worker runs it.
+        
+        Trials run in a process pool. Every worker builds its own maze from
+        `maze`'s settings (the passed maze is only a template and is not
+        modified), results are printed as they finish, and averages are taken
+        in (agent count, trial) order so they do not depend on completion order.
+        
+        Args:
+            maze: Template maze (size, density, generator, cache, search algorithm)
+            simulator_class: Simulator class to run (must be importable by workers)
+            agent_counts: Agent counts to compare
+            trials: Trials per agent count
+            seed: Base maze seed (None = random base seed, no caching)
+            workers: Worker processes (None = one per CPU, 1 = run in this process)
         """
-        comparison_data = {}
+        if seed is None:
+            base_seed, cache = random.randrange(2 ** 31), None
+        else:
+            base_seed, cache = seed, maze.cache
+        maze_settings = {
+            'width': maze.width,
+            'height': maze.height,
+            'wall_density': maze.wall_density,
+            'use_fixed_maze': maze.use_fixed_maze,
+            'cache': cache,
+            'search_algorithm': maze.search_algorithm
+        }
+        tasks = [(simulator_class, maze_settings, num_agents, trial, base_seed + trial)
+                 for num_agents in agent_counts for trial in range(trials)]
+        
+        # Collect trial results keyed by (agent count, trial) as they come in
+        finished = {}
+        
+        def collect(task, trial_result):
+            num_agents, trial = task[2], task[3]
+            finished[(num_agents, trial)] = trial_result
+            print(f"  {num_agents} agent(s), trial {trial + 1}: Steps={trial_result['steps']}, " +
+                  f"Explored={trial_result['explored']}, " +
+                  f"Completed={trial_result['completed']}")
         
+        print(f"\nRunning {len(tasks)} trials...")
+        if workers == 1:
+            for task in tasks:
+                collect(task, _run_trial(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_run_trial, task): task for task in tasks}
+                for future in as_completed(futures):
+                    collect(futures[future], future.result())
+        
+        comparison_data = {}
         for num_agents in agent_counts:
-            print(f"\nTesting with {num_agents} agent(s)...")
-            
-            trial_results = []
-            
-            for trial in range(trials):
-                # Reset maze
-                maze.generate()
-                
-                # Create simulator
-                from config import AGENT_ENERGY, AGENT_VISION_RANGE, COMMUNICATION_RANGE
-                sim = simulator_class(
-                    maze,
-                    num_agents,
-                    AGENT_ENERGY,
-                    AGENT_VISION_RANGE,
-                    COMMUNICATION_RANGE
-                )
-                
-                # Run simulation
-                start_time = time.time()
-                results = sim.run_until_complete(max_steps=1000)
-                duration = time.time() - start_time
-                
-                trial_results.append({
-                    'steps': results['steps'],
-                    'completed': results['completed'],
-                    'explored': results['total_cells_explored'],
-                    'duration': duration,
-                    'path_length': results['best_path_length']
-                })
-                
-                print(f"  Trial {trial + 1}: Steps={results['steps']}, " +
-                      f"Explored={results['total_cells_explored']}, " +
-                      f"Completed={results['completed']}")
+            trial_results = [finished[(num_agents, trial)] for trial in range(trials)]
             
             # Calculate averages
             avg_steps = sum(r['steps'] for r in trial_results) / trials
@@ -78,6 +99,8 @@ class MetricsCollector:
     
     def plot_comparison(self, comparison_data, save_path='comparison.png'):
         """Plot comparison charts"""
+        import matplotlib.pyplot as plt  # Imported here so headless runs never load matplotlib
+        
         agent_counts = sorted(comparison_data.keys())
         
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 10))
@@ -146,4 +169,53 @@ class MetricsCollector:
             print(f"  Fewest Steps:       {best_steps[0]} agents ({best_steps[1]['avg_steps']:.1f} steps)")
             print(f"  Fastest Execution:  {best_speed[0]} agents ({best_speed[1]['avg_duration']:.3f}s)")
         
-        print("="*60)
\ No newline at end of file
+        print("="*60)
+
+
+def _run_trial(task):
+    """
+    Run one benchmark trial (module level so pool workers can unpickle it)
+    
+    Args:
+        task: (simulator_class, maze settings, num_agents, trial, maze_seed)
+    
+    Returns:
+        Trial summary dict (steps, completed, explored, duration, path_length)
+    """
+    simulator_class, maze_settings, num_agents, trial, maze_seed = task
+    from environment.maze import Maze
+    from config import (AGENT_ENERGY, AGENT_VISION_RANGE, COMMUNICATION_RANGE,
+                        BROADCAST_CAPACITY, BROADCAST_OVERFLOW_POLICY, COMMUNICATION_MODE,
+                        BROADCAST_COALESCE_WINDOW, ASSIGNMENT_METHOD,
+                        EVACUATION_RESERVATION_HORIZON)
+    
+    maze = Maze(seed=maze_seed, **maze_settings)
+    maze.generate()
+    
+    # Create simulator
+    sim = simulator_class(
+        maze,
+        num_agents,
+        AGENT_ENERGY,
+        AGENT_VISION_RANGE,
+        COMMUNICATION_RANGE,
+        broadcast_capacity=BROADCAST_CAPACITY,
+        overflow_policy=BROADCAST_OVERFLOW_POLICY,
+        communication_mode=COMMUNICATION_MODE,
+        coalesce_window=BROADCAST_COALESCE_WINDOW,
+        assignment_method=ASSIGNMENT_METHOD,
+        reservation_horizon=EVACUATION_RESERVATION_HORIZON
+    )
+    
+    # Run simulation
+    start_time = time.time()
+    results = sim.run_until_complete(max_steps=1000)
+    duration = time.time() - start_time
+
+    return {
+        'steps': results['steps'],
+        'completed': results['completed'],
+        'explored': results['total_cells_explored'],
+        'duration': duration,
+        'path_length': results['best_path_length']
+    }
@@ -1,25 +1,48 @@
 # simulation/simulator.py
 
 import time
+import numpy as np
 from agents.robot_agent import RobotAgent
+from agents.population import AgentPopulation, REACHED_EXIT, FINISHED
 from agents.communication import CommunicationProtocol
 from coordination.blackboard import Blackboard
 from coordination.negotiation import Negotiator
+from coordination.assignment import AuctionAssigner, ASSIGNMENT_METHODS
+from coordination.reservation import ReservationTable
+from simulation.conflicts import MovePlan, resolve_moves, NO_MOVE
+from utils.tracing import NULL_TRACER
 
 class Simulator:
     """Main simulation controller"""
     
-    def __init__(self, maze, num_agents, agent_energy, vision_range, comm_range):
+    def __init__(self, maze, num_agents, agent_energy, vision_range, comm_range, *,
+                 broadcast_capacity=256, overflow_policy='drop_oldest_read',
+                 communication_mode='global', coalesce_window=10, assignment_method='greedy',
+                 allow_swaps=True, reservation_horizon=None, tracer=None, population=None):
         self.maze = maze
         self.num_agents = num_agents
-        self.blackboard = Blackboard()
-        self.blackboard.maze = maze  # Give blackboard access to maze
+        self.blackboard = Blackboard(maze)  # Knowledge layers sized to the maze
+        self.tracer = NULL_TRACER if tracer is None else tracer  # Structured event sink (utils.tracing)
         
-        # Initialize communication protocol
-        self.communication = CommunicationProtocol()
+        # Initialize communication protocol - 'range' mode limits broadcasts to
+        # agents within comm_range of the sender, 'global' reaches everyone
+        if communication_mode not in ('global', 'range'):
+            raise ValueError(f"Unknown communication mode '{communication_mode}' (expected 'global' or 'range')")
+        if communication_mode == 'global':
+            comm_range = None
+        self.communication = CommunicationProtocol(broadcast_capacity, overflow_policy, comm_range,
+                                                   coalesce_window, self.tracer)
         
-        # Create agents at start position
+        # Create agents at start position - scalar state lives in one shared
+        # struct-of-arrays population, each RobotAgent is a view onto its row
+        # (or in the caller's population, e.g. a view into a LockstepRunner's stacked arrays)
         start_x, start_y = maze.start_pos
+        if population is None:
+            population = AgentPopulation(num_agents, start_x, start_y, agent_energy)
+        else:
+            population.max_energy[:] = agent_energy
+            population.reset(start_x, start_y)
+        self.population = population
         self.agents = []
         for i in range(num_agents):
             agent = RobotAgent(
@@ -28,9 +51,29 @@ class Simulator:
                 start_y=start_y,
                 energy=agent_energy,
                 vision_range=vision_range,
-                comm_range=comm_range
+                comm_range=comm_range,
+                search_algorithm=getattr(maze, 'search_algorithm', 'bfs'),
+                population=self.population,
+                index=i,
+                tracer=self.tracer
             )
             self.agents.append(agent)
+            self.communication.register_agent(i, (start_x, start_y))
+        
+        # Target assignment solver for negotiation conflicts; the auction
+        # keeps its prices between steps
+        if assignment_method not in ASSIGNMENT_METHODS:
+            raise ValueError(f"Unknown assignment method '{assignment_method}' (expected one of {ASSIGNMENT_METHODS})")
+        self.assignment_method = assignment_method
+        self.auction = AuctionAssigner()
+        
+        # Move conflicts: contested cells and pairs of agents trading cells
+        self.allow_swaps = allow_swaps
+        self.move_conflicts = 0
+        self.swap_conflicts = 0
+        
+        # Evacuation: optional space-time reservations so evacuees move in convoy
+        self.reservations = ReservationTable(reservation_horizon) if reservation_horizon else None
         
         self.step_count = 0
         self.simulation_complete = False
@@ -38,83 +81,138 @@ class Simulator:
         
     def step(self):
         """Execute one simulation step"""
-        if self.simulation_complete:
+        plan = self.plan_moves()
+        if plan is None:
             return False
         
+        # Resolve conflicts in bulk: one winner per cell, lowest agent id first
+        # (deterministic, fair over time); others are denied this move this step
+        resolution = resolve_moves(plan.agent_ids, plan.current_cells, plan.desired_cells,
+                                   self.allow_swaps)
+        self.apply_moves(plan, resolution)
+        return True
+    
+    def plan_moves(self):
+        """
+        First half of a step: completion checks, messages, negotiation and
+        every active agent's move decision
+        
+        Returns:
+            MovePlan, or None if the simulation is complete
+        """
+        if self.simulation_complete:
+            return None
+        
         self.step_count += 1
+        tracer = self.tracer
+        tracer.step = self.step_count
+        
+        population = self.population
         
         # Mark the first agent to reach exit as winner
-        for agent in self.agents:
-            if agent.reached_exit and not self.winner_agent:
-                self.winner_agent = agent
+        if not self.winner_agent:
+            reached = population.indices_with(REACHED_EXIT)
+            if reached.size:
+                self.winner_agent = self.agents[reached[0]]
         
         # Check if ALL agents are finished (either at exit OR dead)
-        all_finished = all(agent.reached_exit or agent.is_dead for agent in self.agents)
-        if all_finished:
+        if population.all_finished():
             self.simulation_complete = True
-            return False
+            return None
         
         # Each agent perceives and acts
-        active_agents = [a for a in self.agents if a.is_active()]
+        active_indices = population.active_indices()
+        active_agents = [self.agents[i] for i in active_indices.tolist()]
         
         if not active_agents:
             self.simulation_complete = True
-            return False
+            return None
         
         # STEP 1: All agents process incoming messages
         for agent in active_agents:
             agent.process_messages(self.communication)
         
         # STEP 2: Coordinate exploration (negotiation phase)
-        assignments = Negotiator.coordinate_exploration(active_agents, self.maze, self.blackboard)
+        assignments = Negotiator.coordinate_exploration(active_agents, self.maze, self.blackboard,
+                                                        self.assignment_method, self.auction)
         
-        # Update agent targets based on negotiation
+        # Update agent targets based on negotiation (agent ids index self.agents)
         for agent_id, target in assignments.items():
-            for agent in active_agents:
-                if agent.id == agent_id:
-                    agent.current_target = target
+            self.agents[agent_id].current_target = target
+        
+        # Plan evacuation moves: agents following the shared exit route reserve
+        # cell-time slots, closest to the exit first; an agent whose slot is
+        # taken waits instead of contesting the cell. Cells of the other
+        # agents are kept free for the next step in case they stay put.
+        evacuation_moves = {}
+        if self.reservations is not None:
+            evacuees = [a for a in active_agents
+                        if a.should_evacuate and a.exit_path and a.exit_field is not None]
+            if evacuees:
+                planned = {a.id for a in evacuees}
+                occupied = [a.get_position() for a in active_agents if a.id not in planned]
+                evacuation_moves = self.reservations.plan(evacuees, self.step_count, occupied)
         
         # STEP 3: Each agent decides a move (but we will resolve conflicts before executing)
-        desired_moves = {}   # agent_id -> desired_position or None
-        position_requests = {}  # position -> list of agents wanting it
-
-        # First: each agent perceives and decides their desired next position
-        for agent in active_agents:
+        # Cells are encoded as x * height + y; NO_MOVE marks agents staying put
+        height = self.maze.height
+        current_cells = population.x[active_indices].astype(np.int64) * height + population.y[active_indices]
+        desired_cells = np.full(len(active_agents), NO_MOVE, dtype=np.int64)
+        for k, agent in enumerate(active_agents):
             agent.perceive_environment(self.maze)
             next_pos = agent.decide_next_move(self.maze, self.blackboard, self.communication)
-            desired_moves[agent.id] = next_pos
+            if agent.id in evacuation_moves and not agent.reached_exit:
+                next_pos = evacuation_moves[agent.id]  # Reserved move (None = wait for the convoy ahead)
             if next_pos:
-                position_requests.setdefault(next_pos, []).append(agent)
-
-        # Resolve conflicts where multiple agents want the same target
-        allowed_moves = set()
-        for pos, agents_wanting in position_requests.items():
-            if len(agents_wanting) == 1:
-                # Only one agent wants this position - allow it
-                allowed_moves.add((agents_wanting[0].id, pos))
-            else:
-                # Multiple agents want the same position - pick ONE winner
-                # Priority: lower agent ID (deterministic, fair over time)
-                agents_wanting.sort(key=lambda a: a.id)
-                chosen = agents_wanting[0]
-                allowed_moves.add((chosen.id, pos))
-                print(f"CONFLICT at {pos}: Agents {[a.id for a in agents_wanting]} want it, Agent {chosen.id} gets priority")
-                # Others will be denied this move this step
+                desired_cells[k] = next_pos[0] * height + next_pos[1]
+        
+        return MovePlan(active_indices, active_agents, current_cells, desired_cells)
+    
+    def apply_moves(self, plan, resolution):
+        """
+        Second half of a step: execute the moves granted by resolve_moves,
+        share knowledge and publish this step's messages
+        
+        Args:
+            plan: MovePlan from plan_moves()
+            resolution: MoveResolution for the plan
+        """
+        tracer = self.tracer
+        height = self.maze.height
+        active_agents = plan.agents
+        if tracer.conflict:
+            for cell, contenders, chosen in resolution.conflicts:
+                tracer.record_conflict(divmod(cell, height), contenders, chosen)
+            for first, second in resolution.swaps:
+                tracer.record_swap(first, second)
+        self.move_conflicts += len(resolution.conflicts)
+        self.swap_conflicts += len(resolution.swaps)
 
-        # STEP 4: Execute allowed moves and share knowledge
+        # STEP 4: Execute allowed moves (positions in one go) and share knowledge
+        population = self.population
+        allowed = resolution.allowed
+        moved = plan.agent_ids[allowed]  # Denied moves (collision or no move) stay put
+        xs, ys = np.divmod(plan.desired_cells[allowed], height)
+        population.move(moved, xs, ys)
+        for i, position in zip(moved.tolist(), zip(xs.tolist(), ys.tolist())):
+            agent = self.agents[i]
+            agent.record_move(position)
+            self.communication.update_position(agent.id, position)
+        
+        # Share knowledge regardless of whether we moved
         for agent in active_agents:
-            next_pos = desired_moves.get(agent.id)
-            if next_pos and (agent.id, next_pos) in allowed_moves:
-                agent.move(next_pos)
-            # else: move denied (collision or no move)
-
-            # Share knowledge regardless of whether we moved
             agent.share_knowledge(self.blackboard)
         
-        # STEP 4: Clean up old messages
-        self.communication.clear_old_messages()
+        # Escaped or dead agents never read again - stop holding messages for them
+        finished = plan.agent_ids[(population.status[plan.agent_ids] & FINISHED) != 0]
+        for i in finished.tolist():
+            self.communication.retire_agent(self.agents[i].id)
         
-        return True
+        population.record_arrivals(self.step_count)
+        
+        # STEP 5: Publish batched DEAD_END/WRONG_PATH reports, clean up old messages
+        self.communication.end_step()
+        self.communication.clear_old_messages()
     
     def run_until_complete(self, max_steps=1000):
         """Run simulation until completion or max steps"""
@@ -129,11 +227,15 @@ class Simulator:
             'steps': self.step_count,
             'completed': self.simulation_complete,
             'winner': self.winner_agent.id if self.winner_agent else None,
-            'agents_reached_exit': sum(1 for a in self.agents if a.reached_exit),
+            'agents_reached_exit': self.population.count(REACHED_EXIT),
             'total_cells_explored': len(self.blackboard.explored_cells),
             'dead_ends_found': len(self.blackboard.dead_ends),
             'paths_found': len(self.blackboard.paths_to_exit),
             'best_path_length': self.blackboard.get_best_path()['length'] if self.blackboard.get_best_path() else None,
+            'messages': self.communication.get_stats(),
+            'evacuation': self.get_evacuation_stats(),
+            'move_conflicts': self.move_conflicts,
+            'swap_conflicts': self.swap_conflicts,
             'agent_stats': []
         }
         
@@ -143,25 +245,48 @@ class Simulator:
                 'final_position': agent.get_position(),
                 'energy_remaining': agent.energy,
                 'path_length': len(agent.path_history),
-                'reached_exit': agent.reached_exit
+                'reached_exit': agent.reached_exit,
+                'nodes_expanded': agent.nodes_expanded
             })
         
         return results
     
+    def get_evacuation_stats(self):
+        """
+        Evacuation throughput: agents reaching the exit per step, measured
+        from the first arrival (when EXIT_FOUND goes out) to the last one
+        """
+        arrivals = np.sort(self.population.exit_step[self.population.exit_step >= 0])
+        stats = {
+            'first_arrival': int(arrivals[0]) if arrivals.size else None,
+            'last_arrival': int(arrivals[-1]) if arrivals.size else None,
+            'evacuated': max(0, int(arrivals.size) - 1),  # Agents that followed the finder
+            'throughput': 0.0,
+            'reservation_waits': self.reservations.waits if self.reservations is not None else 0,
+        }
+        if arrivals.size > 1:
+            stats['throughput'] = (arrivals.size - 1) / max(1, int(arrivals[-1] - arrivals[0]))
+        return stats
+    
     def reset(self):
         """Reset simulation"""
         self.blackboard.reset()
         start_x, start_y = self.maze.start_pos
         
+        # Position, energy, status bits and counters for every agent at once
+        self.population.reset(start_x, start_y)
+        self.auction.reset()
+        self.move_conflicts = 0
+        self.swap_conflicts = 0
+        if self.reservations is not None:
+            self.reservations.clear()
+            self.reservations.waits = 0
         for agent in self.agents:
-            agent.x = start_x
-            agent.y = start_y
-            agent.energy = agent.max_energy
             agent.path_history = [(start_x, start_y)]
+            agent.visit_counts = {(start_x, start_y): 1}
+            self.communication.register_agent(agent.id, (start_x, start_y))
             agent.local_map.clear()
             agent.current_target = None
-            agent.reached_exit = False
-            agent.stuck_counter = 0
         
         self.step_count = 0
         self.simulation_complete = False
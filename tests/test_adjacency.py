@@ -0,0 +1,82 @@
+# Tests for the Maze adjacency cache (open-direction masks and neighbor tuples)
+
+import numpy as np
+import pytest
+from environment import Maze
+from environment.cell import DEAD_END, WALL
+from environment.maze import DIRECTIONS
+
+
+def reference_neighbors(maze, x, y):
+    """Neighbors recomputed straight from the wall flags, in DIRECTIONS order"""
+    return tuple((x + dx, y + dy) for dx, dy in DIRECTIONS
+                 if 0 <= x + dx < maze.width and 0 <= y + dy < maze.height
+                 and not maze.flags[x + dx, y + dy] & WALL)
+
+
+def reference_open_dirs(maze):
+    mask = np.zeros(maze.flags.shape, dtype=np.uint8)
+    for x in range(maze.width):
+        for y in range(maze.height):
+            for bit, (dx, dy) in enumerate(DIRECTIONS):
+                if (x + dx, y + dy) in reference_neighbors(maze, x, y):
+                    mask[x, y] |= 1 << bit
+    return mask
+
+
+def check_cache(maze):
+    assert np.array_equal(maze.get_open_dirs(), reference_open_dirs(maze))
+    assert maze.get_open_dirs_bytes() == maze.open_dirs.tobytes()
+    for x in range(-1, maze.width + 1):
+        for y in range(-1, maze.height + 1):
+            assert maze.get_neighbors(x, y) == reference_neighbors(maze, x, y)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_generated_maze_matches_the_walls(seed):
+    maze = Maze(16, 12, 0.3, use_fixed_maze=False, seed=seed)
+    maze.generate()
+
+    check_cache(maze)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_wall_edits_invalidate_only_what_they_touch(seed):
+    maze = Maze(16, 12, 0.3, use_fixed_maze=False, seed=seed)
+    maze.generate()
+    check_cache(maze)  # Fills every neighbor tuple
+    rng = np.random.default_rng(seed)
+
+    for _ in range(40):
+        x, y = rng.integers(0, 16), rng.integers(0, 12)
+        if rng.random() < 0.5:
+            maze._set(x, y, WALL)
+        else:
+            maze._clear(x, y, WALL)
+        assert not maze._adjacency_stale
+        check_cache(maze)
+
+
+def test_non_wall_flags_leave_the_cache_alone():
+    maze = Maze(6, 6)
+    maze.get_neighbors(2, 2)
+    cached = maze._neighbor_cache[2 * 6 + 2]
+
+    maze.mark_dead_end(2, 3)
+    maze.mark_explored(2, 3, 0)
+
+    assert not maze._dirty_cells
+    assert maze.get_neighbors(2, 2) is cached
+    assert maze.has_flag(2, 3, DEAD_END)
+
+
+def test_replacing_the_flags_rebuilds_everything():
+    maze = Maze(6, 6)
+    check_cache(maze)
+    flags = np.zeros((6, 6), dtype=np.uint8)
+    flags[:, 3] = WALL
+
+    maze.set_flags(flags)
+
+    check_cache(maze)
+    assert maze.get_neighbors(2, 2) == ((3, 2), (2, 1), (1, 2))
@@ -0,0 +1,80 @@
+# Tests for coordination.assignment
+
+from itertools import permutations
+
+import numpy as np
+import pytest
+from coordination.assignment import AuctionAssigner, assign_targets, distance_matrix, hungarian
+
+
+class Agent:
+    def __init__(self, agent_id, x, y):
+        self.id = agent_id
+        self.x = x
+        self.y = y
+
+
+def brute_force(cost):
+    """Minimum total cost over every assignment of the smaller side"""
+    n, m = cost.shape
+    if n <= m:
+        return min(sum(cost[row, column] for row, column in enumerate(columns))
+                   for columns in permutations(range(m), n))
+    return brute_force(cost.T)
+
+
+def check_assignment(pairs, cost):
+    """Pairs use distinct rows and columns and cover the smaller side"""
+    rows = [row for row, _ in pairs]
+    columns = [column for _, column in pairs]
+    assert len(set(rows)) == len(rows) and len(set(columns)) == len(columns)
+    assert len(pairs) == min(cost.shape)
+    return sum(cost[row, column] for row, column in pairs)
+
+
+def random_costs(seed, count=60):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        n, m = rng.integers(1, 7, size=2)
+        yield rng.integers(0, 20, size=(n, m))
+
+
+def test_hungarian_is_optimal():
+    for cost in random_costs(0):
+        assert check_assignment(hungarian(cost), cost) == brute_force(cost)
+
+
+def test_auction_is_optimal_cold_and_warm():
+    auction = AuctionAssigner()
+    for cost in random_costs(1):
+        targets = [(column, 0) for column in range(cost.shape[1])]
+        assert check_assignment(auction.solve(cost, targets), cost) == brute_force(cost)
+        # Same targets again, now starting from the carried-over prices
+        shifted = np.roll(cost, 1, axis=0)
+        assert check_assignment(auction.solve(shifted, targets), shifted) == brute_force(shifted)
+
+
+def test_empty_problems():
+    assert hungarian(np.zeros((0, 3))) == []
+    assert AuctionAssigner().solve(np.zeros((2, 0)), []) == []
+    assert assign_targets([], [(1, 1)]) == {}
+
+
+def test_distance_matrix_is_manhattan():
+    agents = [Agent(0, 0, 0), Agent(1, 3, 4)]
+
+    assert distance_matrix(agents, [(1, 1), (3, 0)]).tolist() == [[2, 3], [5, 4]]
+
+
+@pytest.mark.parametrize("method", ["hungarian", "auction"])
+def test_assign_targets_minimizes_total_distance(method):
+    # Closest pair first would send agent 0 to (2, 0) and agent 1 on to
+    # (6, 0), 1 + 6 = 7 steps; the optimum is 3 + 2 = 5
+    agents = [Agent(0, 3, 0), Agent(1, 0, 0)]
+
+    assert assign_targets(agents, [(6, 0), (2, 0)], method) == {0: (6, 0), 1: (2, 0)}
+
+
+def test_assign_targets_rejects_unknown_method():
+    with pytest.raises(ValueError, match="Unknown assignment method"):
+        assign_targets([Agent(0, 0, 0)], [(1, 1)], method='greedy')
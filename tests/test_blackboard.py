@@ -0,0 +1,130 @@
+# Tests for coordination.blackboard
+
+import io
+import contextlib
+
+import numpy as np
+import pytest
+
+from coordination.blackboard import Blackboard, Frontier
+from environment.maze import Maze
+
+
+@pytest.fixture(scope='module')
+def maze():
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(20, 20, use_fixed_maze=False, seed=3)
+        maze.generate()
+    return maze
+
+
+def open_cells(maze, seed, count):
+    cells = [(x, y) for x in range(maze.width) for y in range(maze.height)
+             if not maze.get_cell(x, y).is_wall]
+    rng = np.random.default_rng(seed)
+    return [cells[i] for i in rng.choice(len(cells), size=count, replace=False)]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bulk_explore_matches_cell_by_cell(maze, seed):
+    first, second = open_cells(maze, seed, 60)[:30], open_cells(maze, seed + 100, 30)
+    dead_end = open_cells(maze, seed + 200, 3)
+
+    one_by_one = Blackboard(maze)
+    bulk = Blackboard(maze)
+    for cell in dead_end:
+        one_by_one.add_dead_end(cell, 0)
+        bulk.add_dead_end(cell, 0)
+    for batch in (first, second):
+        for cell in batch:
+            one_by_one.add_explored_cell(cell, 0)
+
+    mask = np.zeros((maze.width, maze.height), dtype=bool)
+    mask[tuple(np.array(first).T)] = True
+    added = bulk.add_explored_cells(mask) + bulk.add_explored_cells(second)
+
+    assert added == len(one_by_one.explored_cells)
+    assert set(bulk.explored_cells) == set(one_by_one.explored_cells)
+    assert set(bulk.frontier) == set(one_by_one.frontier)
+    assert len(bulk.frontier) == len(one_by_one.frontier)
+    # The spatial index agrees with the frontier layer
+    cell = next(iter(one_by_one.frontier), None)
+    if cell is not None:
+        assert bulk.nearest_frontier(cell) == cell
+
+
+def test_bulk_explore_counts_only_new_cells(maze):
+    cells = open_cells(maze, 7, 10)
+    blackboard = Blackboard(maze)
+
+    assert blackboard.add_explored_cells(cells[:6]) == 6
+    assert blackboard.add_explored_cells(np.array(cells)) == 4
+    assert blackboard.add_explored_cells([]) == 0
+
+
+def test_bulk_explore_writes_the_layer_in_place(maze):
+    blackboard = Blackboard(maze)
+    bits = blackboard.explored_cells.bits
+    cells = open_cells(maze, 11, 8)
+
+    blackboard.add_explored_cells(np.array(cells))
+
+    assert blackboard.explored_cells.bits is bits
+    assert int(np.count_nonzero(bits)) == len(blackboard.explored_cells) == 8
+
+
+def brute_force_nearest(cells, position, max_distance=None):
+    x, y = position
+    ranked = sorted((abs(cx - x) + abs(cy - y), (cx, cy)) for cx, cy in cells)
+    if not ranked or (max_distance is not None and ranked[0][0] > max_distance):
+        return None
+    return ranked[0][1]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_frontier_nearest_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    frontier = Frontier(60, 40, cell_size=4)
+    cells = set()
+    for x, y in rng.integers(0, (60, 40), size=(int(rng.integers(1, 30)), 2)).tolist():
+        frontier.add((x, y))
+        cells.add((x, y))
+    for x, y in list(cells)[::3]:
+        frontier.discard((x, y))
+        cells.discard((x, y))
+
+    for qx, qy in rng.integers(0, (60, 40), size=(50, 2)).tolist():
+        for max_distance in (None, 0, 3, 9, 25):
+            expected = brute_force_nearest(cells, (qx, qy), max_distance)
+            assert frontier.nearest((qx, qy), max_distance) == expected
+
+
+def test_frontier_nearest_breaks_ties_by_position():
+    frontier = Frontier(10, 10)
+    assert frontier.nearest((5, 5)) is None
+    for cell in [(7, 5), (5, 3), (3, 5), (5, 7)]:
+        frontier.add(cell)
+
+    assert frontier.nearest((5, 5)) == (3, 5)
+    assert frontier.nearest((5, 5), max_distance=1) is None
+    frontier.discard((3, 5))
+    assert frontier.nearest((5, 5), max_distance=2) == (5, 3)
+
+
+def test_frontier_tracks_explored_and_dead_end_cells(maze):
+    blackboard = Blackboard(maze)
+    cells = open_cells(maze, 5, 40)
+    for i, cell in enumerate(cells):
+        if i % 7 == 3:
+            blackboard.add_dead_end(cell, 0)
+        else:
+            blackboard.add_explored_cell(cell, 0)
+
+    # Open neighbours of explored cells that are neither explored nor dead ends
+    expected = {n for cell in cells if cell in blackboard.explored_cells
+                for n in maze.get_neighbors(*cell)
+                if n not in blackboard.explored_cells and n not in blackboard.dead_ends}
+    assert set(blackboard.frontier) == expected
+    assert all(blackboard.is_frontier(cell) for cell in expected)
+    for cell in cells[:10]:
+        assert blackboard.nearest_frontier(cell) == brute_force_nearest(expected, cell)
@@ -0,0 +1,93 @@
+# Tests for environment.cell: the flag array and its Cell-compatible views
+
+import numpy as np
+import pytest
+from agents.robot_agent import RobotAgent
+from environment import Maze
+from environment.cell import Cell, DEAD_END, EXIT, TRAP, VISITED, WALL
+
+FLAG_ATTRIBUTES = {'is_wall': WALL, 'is_exit': EXIT, 'is_dead_end': DEAD_END,
+                   'is_trap': TRAP, 'visited': VISITED}
+
+
+def make_maze(seed=3):
+    maze = Maze(20, 20, 0.3, use_fixed_maze=False, seed=seed)
+    maze.generate()
+    return maze
+
+
+@pytest.mark.parametrize('attribute, flag', FLAG_ATTRIBUTES.items())
+def test_view_attributes_round_trip_through_the_flags(attribute, flag):
+    maze = Maze(5, 4)
+    cell = maze.get_cell(2, 3)
+
+    setattr(cell, attribute, True)
+    assert maze.flags[2, 3] == flag and getattr(maze.grid[2][3], attribute)
+    assert np.count_nonzero(maze.flags) == 1
+
+    setattr(cell, attribute, False)
+    assert not getattr(cell, attribute) and not maze.flags.any()
+
+
+def test_views_match_the_flags_of_a_generated_maze():
+    maze = make_maze()
+
+    for x in range(maze.width):
+        for y in range(maze.height):
+            cell = maze.grid[x][y]
+            for attribute, flag in FLAG_ATTRIBUTES.items():
+                assert getattr(cell, attribute) == bool(maze.flags[x, y] & flag)
+                assert maze.has_flag(x, y, flag) == getattr(cell, attribute)
+
+
+def test_views_compare_like_cells_and_hold_no_state():
+    maze = Maze(5, 5)
+
+    assert maze.get_cell(1, 2) == Cell(1, 2) == maze.grid[1][2]
+    assert hash(maze.get_cell(1, 2)) == hash(Cell(1, 2))
+    assert maze.get_cell(1, 2) != maze.get_cell(2, 1)
+    assert maze.get_cell(5, 0) is None and maze.get_cell(0, -1) is None
+    assert not maze.has_flag(-1, 0, WALL) and not maze.has_flag(0, 5, WALL)
+    assert (len(maze.grid), len(maze.grid[0])) == (5, 5)
+
+
+def test_explored_by_is_allocated_on_demand_and_reset():
+    maze = Maze(5, 5)
+    maze.mark_explored(1, 1, 7)
+    cell = maze.get_cell(1, 1)
+
+    assert cell.visited and cell.explored_by == {7}
+    assert maze.explored_by.keys() == {(1, 1)}
+
+    cell.reset_exploration()
+    assert not cell.visited and (1, 1) not in maze.explored_by
+
+
+def test_wall_writes_through_a_view_update_the_neighbors():
+    maze = Maze(5, 5)
+    assert (2, 3) in maze.get_neighbors(2, 2)
+
+    maze.get_cell(2, 3).is_wall = True
+    assert (2, 3) not in maze.get_neighbors(2, 2)
+
+    maze.grid[2][3].is_wall = False
+    assert (2, 3) in maze.get_neighbors(2, 2)
+
+
+@pytest.mark.parametrize('position', [(1, 1), (0, 0), (10, 10), (19, 18)])
+def test_perception_matches_get_cell(position):
+    maze = make_maze()
+    agent = RobotAgent(0, *position, 100, 2, None)
+
+    (x0, y0), block = agent.perceive_environment(maze)
+
+    expected = {}
+    for nx in range(position[0] - 2, position[0] + 3):
+        for ny in range(position[1] - 2, position[1] + 3):
+            cell = maze.get_cell(nx, ny)
+            if cell:
+                expected[(nx, ny)] = {'is_wall': cell.is_wall, 'is_exit': cell.is_exit}
+    assert agent.local_map == expected
+    assert (x0, y0) == min(expected)
+    assert np.array_equal(block, maze.flags[x0:x0 + block.shape[0], y0:y0 + block.shape[1]])
+    assert block.size == len(expected)
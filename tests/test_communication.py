@@ -0,0 +1,280 @@
+# Tests for agents.communication
+
+import random
+
+import pytest
+
+from agents.communication import CommunicationProtocol, OVERFLOW_POLICIES
+
+
+def make_protocol(policy, capacity=3, readers=3, **kwargs):
+    protocol = CommunicationProtocol(capacity, policy, **kwargs)
+    for agent_id in range(readers):
+        protocol.register_agent(agent_id)
+    return protocol
+
+
+def fill_with_unread_reports(protocol, sender=0):
+    for i in range(protocol.capacity):
+        protocol.broadcast(sender, 'DEAD_END', {'position': (i, 1), 'agent_id': sender})
+
+
+@pytest.mark.parametrize('policy', OVERFLOW_POLICIES)
+def test_exit_found_survives_a_ring_full_of_unread_reports(policy):
+    protocol = make_protocol(policy)
+    fill_with_unread_reports(protocol)
+
+    protocol.broadcast(0, 'EXIT_FOUND', {'position': (5, 5), 'agent_id': 0})
+
+    for reader in (1, 2):
+        types = [msg.message_type for msg in protocol.receive_messages(reader)]
+        assert types == ['DEAD_END'] * 3 + ['EXIT_FOUND']
+    assert protocol.capacity > 3  # Nothing was read, so the ring had to grow
+
+
+def test_exit_found_evicts_a_read_message_before_growing():
+    protocol = make_protocol('block')
+    fill_with_unread_reports(protocol)
+    protocol.receive_messages(1)
+    protocol.receive_messages(2)
+
+    protocol.broadcast(0, 'EXIT_FOUND', {'position': (5, 5), 'agent_id': 0})
+
+    assert protocol.capacity == 3
+    assert [msg.message_type for msg in protocol.receive_messages(1)] == ['EXIT_FOUND']
+
+
+@pytest.mark.parametrize('policy', OVERFLOW_POLICIES)
+def test_blocked_report_is_held_and_delivered_once_readers_catch_up(policy):
+    protocol = make_protocol(policy)
+    fill_with_unread_reports(protocol)
+
+    assert protocol.broadcast(0, 'WRONG_PATH', {'position': (9, 9), 'agent_id': 0}) is None
+    assert protocol.get_stats()['held'] == 1
+
+    # Readers catch up, the step ends and old messages are cleared: the held report goes out
+    assert [msg.message_type for msg in protocol.receive_messages(1)] == ['DEAD_END'] * 3
+    assert len(protocol.receive_messages(2)) == 3
+    protocol.end_step()
+    protocol.clear_old_messages(max_age=0)
+
+    assert protocol.get_stats()['held'] == 0
+    delivered = protocol.receive_messages(1)
+    assert [(msg.message_type, msg.content['position']) for msg in delivered] == [('WRONG_PATH', (9, 9))]
+
+
+def test_held_messages_keep_broadcast_order():
+    protocol = make_protocol('block')
+    fill_with_unread_reports(protocol)
+    protocol.broadcast(0, 'WRONG_PATH', {'position': (7, 7), 'agent_id': 0})
+    protocol.broadcast(0, 'WRONG_PATH', {'position': (8, 8), 'agent_id': 0})
+    for reader in (1, 2):
+        protocol.receive_messages(reader)
+
+    protocol.clear_old_messages(max_age=0)
+
+    assert [msg.content['position'] for msg in protocol.receive_messages(1)] == [(7, 7), (8, 8)]
+
+
+def test_drop_oldest_read_evicts_only_read_messages():
+    protocol = make_protocol('drop_oldest_read')
+    fill_with_unread_reports(protocol)
+    for reader in (1, 2):
+        protocol.receive_messages(reader)
+
+    protocol.broadcast(0, 'WRONG_PATH', {'position': (9, 9), 'agent_id': 0})
+
+    stats = protocol.get_stats()
+    assert (stats['dropped_read'], stats['held'], stats['retained']) == (1, 0, 3)
+
+
+def report(protocol, sender, position, message_type='DEAD_END'):
+    protocol.broadcast(sender, message_type, {'position': position, 'agent_id': sender})
+
+
+def test_same_cell_from_several_senders_is_one_batch_entry():
+    protocol = make_protocol('drop_oldest_read', capacity=16, readers=4, coalesce_window=10)
+    report(protocol, 0, (3, 3))
+    report(protocol, 1, (3, 3))
+    report(protocol, 2, (3, 3))
+    protocol.end_step()
+
+    batch, = protocol.broadcast_messages
+    assert batch.content['positions'] == [(3, 3)]
+    assert protocol.deduplicated == 2
+    # Every agent hears about the cell once, reporters included
+    for reader in range(4):
+        reports = [r for msg in protocol.receive_messages(reader) for r in msg.reports_for(reader)]
+        assert [r['position'] for r in reports] == [(3, 3)]
+
+
+def test_repeat_within_window_is_suppressed_for_any_sender():
+    protocol = make_protocol('drop_oldest_read', capacity=16, readers=3, coalesce_window=10)
+    report(protocol, 0, (3, 3))
+    report(protocol, 1, (3, 3))
+    protocol.end_step()
+    report(protocol, 2, (3, 3))
+    protocol.end_step()
+
+    assert len(protocol.broadcast_messages) == 1
+    assert protocol.deduplicated == 2
+
+
+def test_later_report_only_reaches_agents_that_missed_the_first():
+    protocol = make_protocol('drop_oldest_read', capacity=16, readers=3, coalesce_window=10)
+    report(protocol, 0, (3, 3))
+    protocol.end_step()
+    report(protocol, 1, (3, 3))  # Agent 0 has not heard about the cell from anyone else
+    protocol.end_step()
+
+    first, second = protocol.broadcast_messages
+    assert second.content['reports'][0][1] == frozenset({0})
+    assert [r['position'] for msg in protocol.receive_messages(0) for r in msg.reports_for(0)] == [(3, 3)]
+    assert [r['position'] for msg in protocol.receive_messages(2) for r in msg.reports_for(2)] == [(3, 3)]
+
+
+def test_range_mode_merges_recipients_of_the_same_cell():
+    protocol = CommunicationProtocol(16, 'drop_oldest_read', comm_range=2, coalesce_window=10)
+    for agent_id, position in enumerate([(0, 0), (1, 0), (10, 0), (11, 0)]):
+        protocol.register_agent(agent_id, position)
+    report(protocol, 0, (5, 5))
+    report(protocol, 2, (5, 5))
+    protocol.end_step()
+
+    batch, = protocol.broadcast_messages
+    assert batch.content['positions'] == [(5, 5)]
+    # The reporters are out of each other's range, so only their neighbours hear it
+    assert batch.recipients == frozenset({1, 3})
+    heard = {reader: [r['position'] for r in batch.reports_for(reader)] for reader in range(4)}
+    assert heard == {0: [], 1: [(5, 5)], 2: [], 3: [(5, 5)]}
+
+
+def test_unknown_and_retired_readers_get_no_broadcasts_and_no_cursor():
+    protocol = make_protocol('drop_oldest_read', readers=2)
+    protocol.retire_agent(1)
+    fill_with_unread_reports(protocol)
+
+    assert protocol.receive_messages(1) == []
+    assert protocol.receive_messages(7) == []
+    assert set(protocol.read_cursors) == {0}
+
+    # Only the sender is registered and it has read everything, so nothing pins the ring
+    protocol.broadcast(0, 'WRONG_PATH', {'position': (9, 9), 'agent_id': 0})
+    assert protocol.get_stats()['dropped_read'] == 1
+
+
+def test_coalesce_keeps_trap_reports_apart_from_plain_dead_ends():
+    protocol = make_protocol('coalesce')
+    protocol.broadcast(0, 'DEAD_END', {'position': (4, 4), 'agent_id': 0})
+    protocol.broadcast(0, 'DEAD_END', {'position': (5, 5), 'agent_id': 0})
+    protocol.broadcast(0, 'DEAD_END', {'position': (6, 6), 'agent_id': 0})
+
+    # Same cell and type again: folded into the retained report
+    protocol.broadcast(0, 'DEAD_END', {'position': (4, 4), 'agent_id': 0})
+    assert protocol.get_stats()['coalesced'] == 1
+
+    # Same cell as a trap: different news, so it must not be folded away
+    protocol.broadcast(0, 'DEAD_END', {'position': (4, 4), 'agent_id': 0, 'is_trap': True})
+    assert protocol.get_stats()['coalesced'] == 1
+    assert protocol.get_stats()['held'] == 1
+
+    for reader in (1, 2):
+        protocol.receive_messages(reader)
+    protocol.end_step()
+    traps = [msg.content['position'] for msg in protocol.receive_messages(1) if msg.content.get('is_trap')]
+    assert traps == [(4, 4)]
+
+
+def test_each_broadcast_reaches_every_other_reader_once():
+    protocol = make_protocol('drop_oldest_read', capacity=32)
+    for sender in (0, 1, 2, 0):
+        protocol.broadcast(sender, 'WRONG_PATH', {'position': (sender, 1), 'agent_id': sender})
+
+    first = protocol.receive_messages(1)
+    protocol.broadcast(2, 'WRONG_PATH', {'position': (2, 2), 'agent_id': 2})
+
+    assert [msg.sender_id for msg in first] == [0, 2, 0]
+    assert [msg.sender_id for msg in protocol.receive_messages(1)] == [2]
+    assert protocol.receive_messages(1) == []
+    assert [msg.sender_id for msg in protocol.receive_messages(0)] == [1, 2, 2]
+    assert [msg.sequence for msg in protocol.receive_messages(2)] == [0, 1, 3]
+
+
+def test_cursors_start_at_registration_and_skip_cleared_messages():
+    protocol = make_protocol('drop_oldest_read', capacity=32, readers=2)
+    report(protocol, 0, (1, 1))
+    protocol.register_agent(5)
+    report(protocol, 0, (2, 2))
+
+    assert [msg.content['position'] for msg in protocol.receive_messages(5)] == [(2, 2)]
+    assert protocol.read_cursors == {0: 2, 1: 0, 5: 2}
+
+    protocol.receive_messages(1)
+    protocol.clear_old_messages(max_age=1)
+    report(protocol, 0, (3, 3))
+    assert protocol.broadcast_base == 1
+    assert [msg.content['position'] for msg in protocol.receive_messages(1)] == [(3, 3)]
+
+
+def test_direct_messages_are_delivered_once_alongside_broadcasts():
+    protocol = make_protocol('drop_oldest_read', capacity=32)
+    protocol.send_message(0, 1, 'PATH_SHARED', {'path': [(1, 1)]})
+    report(protocol, 0, (4, 4))
+
+    messages = protocol.receive_messages(1)
+
+    assert [msg.message_type for msg in messages] == ['DEAD_END', 'PATH_SHARED']
+    assert messages[1].sequence is None
+    assert protocol.receive_messages(1) == []
+
+
+@pytest.mark.parametrize('policy', OVERFLOW_POLICIES)
+def test_bounded_ring_never_loses_unread_messages(policy):
+    rng = random.Random(policy)
+    protocol = make_protocol(policy, capacity=4, readers=4)
+    received = {reader: [] for reader in range(4)}
+    sent = []
+
+    for step in range(200):
+        for _ in range(rng.randrange(4)):
+            sender = rng.randrange(4)
+            sent.append((sender, step))
+            report(protocol, sender, (len(sent), step), 'WRONG_PATH')
+        for reader in rng.sample(range(4), rng.randrange(3)):
+            received[reader] += protocol.receive_messages(reader)
+        protocol.end_step()
+        protocol.clear_old_messages(max_age=2)
+        assert protocol.get_stats()['retained'] <= protocol.capacity == 4
+
+    while protocol.get_stats()['held']:
+        for reader in range(4):
+            received[reader] += protocol.receive_messages(reader)
+        protocol.clear_old_messages(max_age=0)
+    for reader in range(4):
+        received[reader] += protocol.receive_messages(reader)
+        expected = [(i + 1, step) for i, (sender, step) in enumerate(sent) if sender != reader]
+        assert [msg.content['position'] for msg in received[reader]] == expected
+
+    stats = protocol.get_stats()
+    assert stats['dropped_read'] + stats['expired'] + stats['retained'] == len(sent)
+    assert stats['grown'] == stats['coalesced'] == 0
+    assert (stats['dropped_read'] == 0) == (policy == 'block')
+
+
+@pytest.mark.parametrize('policy, position, counters', [
+    ('block', (9, 9), {'blocked_sends': 1, 'held': 1, 'dropped_read': 0, 'coalesced': 0}),
+    ('drop_oldest_read', (9, 9), {'blocked_sends': 0, 'held': 0, 'dropped_read': 1, 'coalesced': 0}),
+    ('coalesce', (9, 9), {'blocked_sends': 0, 'held': 0, 'dropped_read': 1, 'coalesced': 0}),
+    ('coalesce', (1, 1), {'blocked_sends': 0, 'held': 0, 'dropped_read': 0, 'coalesced': 1}),
+])
+def test_overflow_policy_counters_on_a_full_read_ring(policy, position, counters):
+    protocol = make_protocol(policy)
+    fill_with_unread_reports(protocol)
+    for reader in (1, 2):
+        protocol.receive_messages(reader)
+
+    protocol.broadcast(0, 'DEAD_END', {'position': position, 'agent_id': 0})
+
+    stats = protocol.get_stats()
+    assert {name: stats[name] for name in counters} == counters
+    assert stats['retained'] == 3 and stats['capacity'] == 3
@@ -0,0 +1,71 @@
+# Tests for simulation.conflicts
+
+import numpy as np
+import pytest
+from simulation.conflicts import resolve_moves, NO_MOVE
+
+
+def test_lowest_id_wins_a_contested_cell():
+    resolution = resolve_moves([4, 1, 7], [10, 20, 30], [5, 5, 5])
+
+    assert resolution.allowed.tolist() == [False, True, False]
+    assert resolution.conflicts == [(5, [1, 4, 7], 1)]
+    assert resolution.swaps == []
+
+
+def test_uncontested_moves_and_stationary_agents():
+    resolution = resolve_moves([0, 1, 2], [1, 2, 3], [4, NO_MOVE, 6])
+
+    assert resolution.allowed.tolist() == [True, False, True]
+    assert resolution.conflicts == []
+
+
+def test_conflicts_are_reported_in_winner_order():
+    resolution = resolve_moves([3, 0, 2, 5], [1, 2, 3, 4], [9, 8, 8, 9])
+
+    assert resolution.allowed.tolist() == [True, True, False, False]
+    assert resolution.conflicts == [(8, [0, 2], 0), (9, [3, 5], 3)]
+
+
+def test_no_moves():
+    resolution = resolve_moves([0, 1], [1, 2], [NO_MOVE, NO_MOVE])
+
+    assert not resolution.allowed.any()
+    assert resolution.conflicts == [] and resolution.swaps == []
+
+
+@pytest.mark.parametrize("allow_swaps", [True, False])
+def test_swaps(allow_swaps):
+    # Agents 2 and 6 trade cells; agent 4 walks on undisturbed
+    resolution = resolve_moves([6, 4, 2], [11, 30, 12], [12, 31, 11], allow_swaps=allow_swaps)
+
+    assert resolution.swaps == [(2, 6)]
+    assert resolution.allowed.tolist() == [allow_swaps, True, True]
+
+
+def test_swap_needs_both_moves_granted():
+    # Agent 1 beats agent 3 to cell 5, so agent 0's move 5 -> 7 is no swap with 3
+    resolution = resolve_moves([0, 1, 3], [5, 8, 7], [7, 5, 5], allow_swaps=False)
+
+    assert resolution.swaps == []
+    assert resolution.allowed.tolist() == [True, True, False]
+    assert resolution.conflicts == [(5, [1, 3], 1)]
+
+
+def test_matches_cell_by_cell_resolution():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        n = int(rng.integers(1, 30))
+        agent_ids = rng.permutation(100)[:n]
+        current = rng.permutation(40)[:n]
+        desired = np.where(rng.random(n) < 0.2, NO_MOVE, rng.integers(0, 40, n))
+
+        resolution = resolve_moves(agent_ids, current, desired)
+
+        winners = {}
+        for agent, cell in zip(agent_ids.tolist(), desired.tolist()):
+            if cell != NO_MOVE:
+                winners[cell] = min(winners.get(cell, agent), agent)
+        expected = [cell != NO_MOVE and winners[cell] == agent
+                    for agent, cell in zip(agent_ids.tolist(), desired.tolist())]
+        assert resolution.allowed.tolist() == expected
@@ -0,0 +1,66 @@
+# Tests for the vectorized dead-end / trap classification in Maze
+
+import numpy as np
+import pytest
+from environment import Maze
+from environment.cell import DEAD_END, EXIT, START, TRAP, WALL
+
+
+def reference_dead_ends(maze):
+    """The original per-cell loop, applied to a copy of the flags"""
+    flags = maze.flags.copy()
+    count = 0
+    for x in range(1, maze.width - 1):
+        for y in range(1, maze.height - 1):
+            if flags[x, y] & (WALL | START | EXIT):
+                continue
+            open_neighbors = sum(not flags[x + dx, y + dy] & WALL
+                                 for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0)))
+            if open_neighbors == 1:
+                flags[x, y] |= DEAD_END | TRAP
+                count += 1
+            else:
+                flags[x, y] &= ~np.uint8(DEAD_END | TRAP)
+    return flags, count
+
+
+def random_flags(seed, width=17, height=13):
+    """Random walls with stray dead-end/trap marks, start and exit flags"""
+    rng = np.random.default_rng(seed)
+    flags = np.where(rng.random((width, height)) < 0.4, WALL, 0).astype(np.uint8)
+    flags |= np.where(rng.random((width, height)) < 0.2, DEAD_END | TRAP, 0).astype(np.uint8)
+    flags[1, 1] = START
+    flags[width - 2, height - 2] = EXIT
+    return flags
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_matches_the_per_cell_loop(seed):
+    maze = Maze(17, 13)
+    maze.set_flags(random_flags(seed))
+    expected, expected_count = reference_dead_ends(maze)
+
+    assert maze._identify_all_dead_ends() == expected_count
+    assert np.array_equal(maze.flags, expected)
+
+
+@pytest.mark.parametrize('fixed', [True, False])
+def test_generated_mazes_are_classified_like_the_loop(fixed):
+    maze = Maze(46, 46, 0.3, use_fixed_maze=fixed, seed=5)
+    dead_ends = maze.generate()
+    expected, expected_count = reference_dead_ends(maze)
+
+    assert dead_ends == expected_count == maze.count_dead_ends()
+    assert np.array_equal(maze.flags, expected)
+
+
+def test_count_ignores_marks_on_walls_and_border():
+    maze = Maze(5, 5)
+    flags = np.full((5, 5), WALL, dtype=np.uint8)
+    flags[1:4, 2] = 0
+    flags[0, 0] |= DEAD_END  # Border wall with a stray mark
+    maze.set_flags(flags)
+
+    assert maze._identify_all_dead_ends() == 2
+    assert maze.count_dead_ends() == 2
+    assert maze.has_flag(1, 2, TRAP) and maze.has_flag(3, 2, TRAP) and not maze.has_flag(2, 2, DEAD_END)
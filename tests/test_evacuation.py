@@ -0,0 +1,62 @@
+# Tests for coordination.evacuation.EvacuationField
+
+import numpy as np
+import pytest
+from coordination.evacuation import EvacuationField
+from coordination.exit_path import ExitPath
+from environment import Maze
+from environment.cell import WALL
+from utils.pathfinding import breadth_first
+
+
+def make_field(seed):
+    maze = Maze(30, 30, 0.3, use_fixed_maze=True, seed=seed)
+    maze.generate()
+    path = ExitPath(breadth_first(maze, maze.start_pos, (maze.exit_pos,)).path, maze.height)
+    return maze, path, EvacuationField(maze, path)
+
+
+def open_cells(maze):
+    return [(x, y) for (x, y), flags in np.ndenumerate(maze.flags) if not flags & WALL]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_steps_match_a_bfs_to_the_path(seed):
+    maze, path, field = make_field(seed)
+
+    for cell in open_cells(maze):
+        search = breadth_first(maze, cell, list(path))
+        if cell in path:
+            assert field.step_toward_path(cell) is None and field.distance_to_path(cell) == 0
+        elif not search.found:
+            assert field.step_toward_path(cell) is None and field.distance_to_path(cell) == -1
+        else:
+            assert field.distance_to_path(cell) == search.cost
+            assert field.step_toward_path(cell) == search.path[1]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_next_cell_routes_reach_the_exit(seed):
+    maze, path, field = make_field(seed)
+
+    for cell in open_cells(maze):
+        route = [cell]
+        while route[-1] != maze.exit_pos and field.next_cell(route[-1]) is not None:
+            route.append(field.next_cell(route[-1]))
+            assert route[-1] in maze.get_neighbors(*route[-2])
+        expected = len(route) - 1 if route[-1] == maze.exit_pos else -1
+        assert field.distance_to_exit(cell) == expected
+        if cell in path:
+            assert route == list(path)[path.index(cell):]
+
+
+def test_accepts_a_plain_list_and_shares_the_path_index():
+    maze, path, field = make_field(0)
+
+    from_list = EvacuationField(maze, list(path))
+
+    assert from_list.exit_path == path
+    assert field.path_index is path.path_index
+    assert field.index_of(maze.exit_pos) == len(path) - 1
+    assert field.index_of((0, 0)) is None
+    assert np.array_equal(from_list.next_dir, field.next_dir)
@@ -0,0 +1,76 @@
+# Tests for coordination.exit_path.ExitPath
+
+import pytest
+from agents.communication import CommunicationProtocol
+from agents.robot_agent import RobotAgent
+from coordination.blackboard import Blackboard
+from coordination.exit_path import ExitPath
+from environment import Maze
+from simulation import Simulator
+
+CELLS = [(1, 1), (1, 2), (2, 2), (3, 2), (3, 3)]
+
+
+def test_behaves_like_the_list_it_replaces():
+    path = ExitPath(CELLS, 10)
+
+    assert len(path) == 5 and list(path) == CELLS and path.to_list() == CELLS
+    assert path[0] == (1, 1) and path[-1] == (3, 3) and path[1:3] == CELLS[1:3]
+    assert (2, 2) in path and (2, 3) not in path
+    assert path.index((3, 2)) == 3 and path.index_of((3, 2)) == 3 and path.index_of((0, 0)) is None
+    with pytest.raises(ValueError):
+        path.index((0, 0))
+    assert path == CELLS and path == tuple(CELLS) and path == ExitPath(path, 10)
+    assert path != CELLS[:-1] and path != ExitPath(CELLS, 11)
+    assert path.cells.tolist() == [x * 10 + y for x, y in CELLS]
+
+
+def test_is_immutable_and_unhashable():
+    path = ExitPath(CELLS, 10)
+
+    with pytest.raises(AttributeError):
+        path.height = 5
+    with pytest.raises(ValueError):
+        path.cells[0] = 0
+    with pytest.raises(TypeError):
+        hash(path)
+
+
+def test_revisited_cells_index_their_first_occurrence():
+    path = ExitPath([(1, 1), (1, 2), (1, 1), (2, 1)], 5)
+
+    assert path.index((1, 1)) == 0 and path[2] == (1, 1)
+
+
+def test_agents_hold_posted_instances_not_copies():
+    maze = Maze(46, 46, 0.3, use_fixed_maze=True, seed=5)
+    maze.generate()
+    simulator = Simulator(maze, 10, 250, 2, 10)
+    simulator.run_until_complete(max_steps=400)
+
+    # Every finder posts one instance; receivers hold one of those, never a copy
+    posted = {id(entry['path']): entry['path'] for entry in simulator.blackboard.paths_to_exit}
+    holders = [agent for agent in simulator.agents if agent.exit_path is not None]
+
+    assert all(isinstance(path, ExitPath) and path[-1] == maze.exit_pos for path in posted.values())
+    assert all(id(agent.exit_path) in posted for agent in holders)
+    assert holders and all(agent.exit_field.path_index is agent.exit_path.path_index for agent in holders)
+
+
+def test_exit_found_hands_out_one_instance():
+    maze = Maze(6, 6)
+    maze.start_pos = (1, 1)
+    maze.get_cell(3, 3).is_exit = True
+    protocol, blackboard = CommunicationProtocol(), Blackboard(maze)
+    finder, *receivers = [RobotAgent(i, 3, 3 if i == 0 else 1, 100, 2, None) for i in range(3)]
+    for agent in (finder, *receivers):
+        protocol.register_agent(agent.id)
+
+    finder.decide_next_move(maze, blackboard, protocol)
+    for agent in receivers:
+        agent.process_messages(protocol)
+
+    posted = blackboard.get_best_path()['path']
+    assert isinstance(posted, ExitPath) and posted[0] == (1, 1) and posted[-1] == (3, 3)
+    assert all(agent.exit_path is posted for agent in receivers)
+    assert receivers[0].exit_field is receivers[1].exit_field
@@ -0,0 +1,44 @@
+# Tests for main.py --mode headless
+
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs the CLI in a fresh interpreter, then reports which GUI/plotting modules got loaded
+RUNNER = """
+import sys
+sys.argv = ['main.py'] + sys.argv[1:]
+import main
+main.main()
+loaded = sorted(name for name in sys.modules if name.split('.')[0] in ('pygame', 'matplotlib', 'renderer'))
+print(repr(loaded), file=sys.stderr)
+"""
+
+
+def run_headless(tmp_path, *options):
+    process = subprocess.run(
+        [sys.executable, '-c', RUNNER, '--mode', 'headless', '--no-cache', *options],
+        cwd=tmp_path, env={**os.environ, 'PYTHONPATH': REPO_ROOT},
+        capture_output=True, text=True, timeout=120, check=True)
+    return process.stdout.splitlines(), process.stderr
+
+
+def test_headless_mode_loads_no_gui_or_plotting_modules(tmp_path):
+    lines, stderr = run_headless(tmp_path, '--agents', '2', '--seed', '1', '--max-steps', '50')
+
+    assert stderr.strip().splitlines()[-1] == '[]'
+    assert not list(tmp_path.iterdir())  # No trace file or cache written
+
+
+def test_headless_mode_prints_only_json_results(tmp_path):
+    lines, _ = run_headless(tmp_path, '--agents', '1', '3', '--seed', '4', '--max-steps', '40')
+
+    records = [json.loads(line) for line in lines]
+    assert [record['num_agents'] for record in records] == [1, 3]
+    for record in records:
+        assert record['seed'] == 4
+        assert record['results']['steps'] <= 40
+        assert record['steps_per_second'] > 0
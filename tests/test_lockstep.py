@@ -0,0 +1,59 @@
+# Tests for simulation.lockstep
+
+import pytest
+from agents.population import DEAD, REACHED_EXIT
+from environment import Maze
+from simulation import LockstepRunner, Simulator
+
+SIZE = 46
+
+
+def make_mazes(seeds, fixed=False):
+    mazes = []
+    for seed in seeds:
+        maze = Maze(SIZE, SIZE, 0.3, use_fixed_maze=fixed, seed=seed)
+        maze.generate()
+        mazes.append(maze)
+    return mazes
+
+
+@pytest.mark.parametrize("allow_swaps", [True, False])
+def test_lockstep_matches_standalone_runs(allow_swaps):
+    seeds, counts = [0, 1, 2, 3], [3, 1, 5, 2]
+
+    standalone = [
+        Simulator(maze, count, 250, 2, 10, allow_swaps=allow_swaps).run_until_complete(max_steps=300)
+        for maze, count in zip(make_mazes(seeds), counts)
+    ]
+    runner = LockstepRunner(make_mazes(seeds), counts, 250, 2, 10, allow_swaps=allow_swaps)
+
+    assert runner.run_until_complete(max_steps=300) == standalone
+
+
+def test_finished_agents_and_completion():
+    runner = LockstepRunner(make_mazes([4, 5]), [2, 3], 250, 2, 10)
+    assert runner.finished_agents().tolist() == [0, 0]
+    assert not runner.completed().any()
+
+    results = runner.run_until_complete(max_steps=300)
+
+    expected = [sim.population.count(REACHED_EXIT) + sim.population.count(DEAD) for sim in runner.simulators]
+    assert runner.finished_agents().tolist() == expected
+    assert runner.completed().tolist() == [result['completed'] for result in results]
+
+
+def test_rejects_mismatched_agent_counts():
+    with pytest.raises(ValueError, match="agent counts"):
+        LockstepRunner(make_mazes([0, 1]), [3], 250, 2, 10)
+
+
+def test_instances_without_agents():
+    # Empty instances first, in the middle and last
+    runner = LockstepRunner(make_mazes([4, 5, 6, 7]), [0, 2, 0, 0], 250, 2, 10)
+    assert runner.finished_agents().tolist() == [0, 0, 0, 0]
+
+    results = runner.run_until_complete(max_steps=300)
+
+    assert [results[k]['completed'] for k in (0, 2, 3)] == [True, True, True]
+    finished = runner.simulators[1].population.count(REACHED_EXIT) + runner.simulators[1].population.count(DEAD)
+    assert runner.finished_agents().tolist() == [0, finished, 0, 0]
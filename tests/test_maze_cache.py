@@ -0,0 +1,82 @@
+# Tests for environment.maze_cache and seeded maze generation
+
+import numpy as np
+import pytest
+from environment import Maze, MazeCache
+
+SIZE = 46
+
+
+def make_maze(seed, cache=None, fixed=True):
+    return Maze(SIZE, SIZE, 0.3, use_fixed_maze=fixed, seed=seed, cache=cache)
+
+
+@pytest.mark.parametrize("fixed", [True, False])
+def test_seed_determines_the_maze(fixed):
+    first, second, other = make_maze(7, fixed=fixed), make_maze(7, fixed=fixed), make_maze(8, fixed=fixed)
+
+    assert first.generate() == second.generate()
+    other.generate()
+
+    assert np.array_equal(first.flags, second.flags)
+    assert not np.array_equal(first.flags, other.flags)
+
+
+@pytest.mark.parametrize("fixed", [True, False])
+def test_cache_round_trip(tmp_path, fixed):
+    cache = MazeCache(str(tmp_path))
+    fresh = make_maze(7, cache, fixed)
+    fresh_dead_ends = fresh.generate()
+
+    cached = make_maze(7, cache, fixed)
+    cached_dead_ends = cached.generate()
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cached_dead_ends == fresh_dead_ends
+    assert np.array_equal(cached.flags, fresh.flags)
+    assert (cached.start_pos, cached.exit_pos) == (fresh.start_pos, fresh.exit_pos)
+    assert cached.correct_path_cells == fresh.correct_path_cells
+    assert np.array_equal(cached.get_open_dirs(), fresh.get_open_dirs())
+
+
+def test_key_covers_every_generator_input():
+    key = MazeCache.make_key(SIZE, SIZE, 'fixed', 7, {'wall_density': 0.3})
+
+    assert key == make_maze(7).cache_key()
+    assert key != MazeCache.make_key(SIZE, SIZE, 'fixed', 8, {'wall_density': 0.3})
+    assert key != MazeCache.make_key(SIZE, SIZE, 'random', 7, {'wall_density': 0.3})
+    assert key != MazeCache.make_key(SIZE, SIZE + 1, 'fixed', 7, {'wall_density': 0.3})
+    assert key != MazeCache.make_key(SIZE, SIZE, 'fixed', 7, {'wall_density': 0.4})
+
+
+def test_store_is_atomic(tmp_path):
+    cache = MazeCache(str(tmp_path / "cache"))
+    maze = make_maze(7, cache)
+    maze.generate()
+    cache.store(maze, maze.cache_key())  # Rewrite the existing entry
+
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == [f"{maze.cache_key()}.maze"]
+
+
+def test_corrupt_entry_is_a_miss_and_gets_rewritten(tmp_path):
+    cache = MazeCache(str(tmp_path))
+    reference = make_maze(7)
+    reference.generate()
+    path = tmp_path / f"{reference.cache_key()}.maze"
+    path.write_bytes(b"garbage")
+
+    maze = make_maze(7, cache)
+    maze.generate()
+
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert np.array_equal(maze.flags, reference.flags)
+    assert make_maze(7, cache).generate() == reference.count_dead_ends()
+    assert cache.hits == 1
+
+
+def test_unseeded_mazes_bypass_the_cache(tmp_path):
+    cache = MazeCache(str(tmp_path))
+    make_maze(None, cache).generate()
+
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,94 @@
+# Tests for environment.maze_io and Maze.save / Maze.load
+
+import numpy as np
+import pytest
+from environment import Maze, MazeFormatError
+from environment.maze import WALL, VISITED
+from environment.maze_io import read_maze_file
+
+SIZE = 46  # The generators need room for their fixed wall layout
+
+
+@pytest.fixture
+def maze():
+    maze = Maze(SIZE, SIZE, 0.3, use_fixed_maze=True, seed=4)
+    maze.generate()
+    return maze
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_round_trip(maze, tmp_path, mmap):
+    path = tmp_path / "fixed.maze"
+    maze.save(path)
+
+    loaded = Maze.load(path, mmap=mmap)
+
+    assert (loaded.width, loaded.height) == (maze.width, maze.height)
+    assert loaded.start_pos == maze.start_pos
+    assert loaded.exit_pos == maze.exit_pos
+    assert loaded.correct_path_cells == maze.correct_path_cells
+    assert np.array_equal(loaded.flags, maze.flags)
+    assert isinstance(loaded.flags, np.memmap) == mmap
+    assert np.array_equal(loaded.get_open_dirs(), maze.get_open_dirs())
+    assert loaded.count_dead_ends() == maze.count_dead_ends()
+
+
+def test_mmap_writes_never_reach_the_file(maze, tmp_path):
+    path = tmp_path / "fixed.maze"
+    maze.save(path)
+    before = path.read_bytes()
+
+    loaded = Maze.load(path, mmap=True)
+    loaded.flags[:, :] |= VISITED
+    loaded.flags[maze.exit_pos] |= WALL
+    del loaded
+
+    assert path.read_bytes() == before
+    assert np.array_equal(Maze.load(path).flags, maze.flags)
+
+
+def test_flag_array_is_aligned(maze, tmp_path):
+    path = tmp_path / "fixed.maze"
+    maze.save(path)
+
+    flags = read_maze_file(path, mmap=True)['flags']
+
+    assert flags.offset % 64 == 0
+
+
+def test_save_leaves_no_temporary_file(maze, tmp_path):
+    maze.save(tmp_path / "fixed.maze")
+    maze.save(tmp_path / "fixed.maze")  # Overwrite in place
+
+    assert [p.name for p in tmp_path.iterdir()] == ["fixed.maze"]
+
+
+def test_rejects_foreign_and_truncated_files(maze, tmp_path):
+    foreign = tmp_path / "foreign.maze"
+    foreign.write_bytes(b"NOPE" + bytes(60))
+    with pytest.raises(MazeFormatError, match="not a maze file"):
+        read_maze_file(foreign)
+
+    path = tmp_path / "fixed.maze"
+    maze.save(path)
+    truncated = tmp_path / "truncated.maze"
+    truncated.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(MazeFormatError, match="truncated flag array"):
+        read_maze_file(truncated, mmap=False)
+    with pytest.raises(ValueError):
+        read_maze_file(truncated, mmap=True)
+
+    truncated.write_bytes(path.read_bytes()[:8])
+    with pytest.raises(MazeFormatError, match="truncated header"):
+        read_maze_file(truncated)
+
+
+def test_rejects_unknown_format_version(maze, tmp_path):
+    path = tmp_path / "fixed.maze"
+    maze.save(path)
+    raw = bytearray(path.read_bytes())
+    raw[4:6] = (99).to_bytes(2, 'little')
+    path.write_bytes(bytes(raw))
+
+    with pytest.raises(MazeFormatError, match="version 99"):
+        read_maze_file(path)
@@ -0,0 +1,50 @@
+# Tests for coordination.blackboard.MessageStore
+
+from coordination.blackboard import Blackboard, MessageStore
+
+
+def post(store, count, msg_type='exploring'):
+    for i in range(count):
+        store.append({'type': msg_type, 'agent_id': i, 'data': {}})
+
+
+def test_recent_follows_list_slicing():
+    blackboard = Blackboard()
+    for i in range(5):
+        blackboard.post_message(i, 'exploring', {})
+    messages = [message['agent_id'] for message in blackboard.messages]
+
+    for count in (0, 1, 3, 5, 9):
+        assert [m['agent_id'] for m in blackboard.get_recent_messages(count)] == messages[-count:]
+    assert len(blackboard.get_recent_messages(0)) == 5
+
+
+def test_store_is_bounded_overall_and_per_type():
+    store = MessageStore(capacity=4)
+    post(store, 6, 'exploring')
+    post(store, 3, 'dead_end')
+
+    assert len(store) == 4
+    assert [m['type'] for m in store] == ['exploring'] + ['dead_end'] * 3
+    assert [m['agent_id'] for m in store.recent(10, 'exploring')] == [2, 3, 4, 5]
+    assert store.count() == 9
+    assert (store.count('exploring'), store.count('dead_end'), store.count('exit_found')) == (6, 3, 0)
+
+
+def test_recent_by_type():
+    store = MessageStore()
+    post(store, 3, 'exploring')
+    post(store, 2, 'dead_end')
+
+    assert [m['agent_id'] for m in store.recent(1, 'exploring')] == [2]
+    assert [m['agent_id'] for m in store.recent(0, 'dead_end')] == [0, 1]
+    assert store.recent(5, 'exit_found') == []
+
+
+def test_clear_resets_counters():
+    store = MessageStore()
+    post(store, 3)
+
+    store.clear()
+
+    assert len(store) == 0 and store.count() == 0 and store.recent() == []
@@ -0,0 +1,51 @@
+# Tests for simulation.metrics.MetricsCollector
+
+import contextlib
+import io
+
+import numpy as np
+from environment import Maze
+from simulation import Simulator
+from simulation.metrics import MetricsCollector, _run_trial
+
+
+def compare(template, workers):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return MetricsCollector().compare_agent_counts(template, Simulator, [1, 4], trials=3,
+                                                       seed=11, workers=workers)
+
+
+def without_duration(trial):
+    return {key: value for key, value in trial.items() if key != 'duration'}
+
+
+def without_durations(comparison):
+    return {num_agents: {'avg_steps': data['avg_steps'], 'avg_explored': data['avg_explored'],
+                         'success_rate': data['success_rate'],
+                         'trials': [without_duration(trial) for trial in data['trials']]}
+            for num_agents, data in comparison.items()}
+
+
+def test_parallel_trials_match_serial_ones():
+    template = Maze(30, 30, 0.3, use_fixed_maze=True)
+    flags = template.flags.copy()
+
+    serial = compare(template, workers=1)
+    parallel = compare(template, workers=3)
+
+    assert list(parallel) == [1, 4]
+    assert without_durations(parallel) == without_durations(serial)
+    assert np.array_equal(template.flags, flags) and template.start_pos is None  # Template untouched
+
+
+def test_trial_i_runs_on_maze_seed_plus_i():
+    template = Maze(30, 30, 0.3, use_fixed_maze=True)
+    settings = {'width': 30, 'height': 30, 'wall_density': 0.3, 'use_fixed_maze': True,
+                'cache': None, 'search_algorithm': 'bfs'}
+
+    trials = compare(template, workers=1)[4]['trials']
+
+    for trial, result in enumerate(trials):
+        expected = _run_trial((Simulator, settings, 4, trial, 11 + trial))
+        assert without_duration(result) == without_duration(expected)
+    assert len({(r['steps'], r['explored']) for r in trials}) > 1  # Each trial got its own maze
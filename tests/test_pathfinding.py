@@ -0,0 +1,132 @@
+# Tests for utils.pathfinding
+
+from collections import deque
+
+import numpy as np
+import pytest
+from agents.robot_agent import RobotAgent
+from environment import Maze
+from utils.pathfinding import (astar_search, bfs, breadth_first, dijkstra, distance_field,
+                               find_path, greedy_best_first)
+
+
+def random_walls(seed, size=15, density=0.25):
+    rng = np.random.default_rng(seed)
+    walls = rng.random((size, size)) < density
+    walls[0, 0] = walls[-1, -1] = False
+    return walls
+
+
+def is_valid_path(walls, path, start, goal):
+    steps_ok = all(abs(ax - bx) + abs(ay - by) == 1 for (ax, ay), (bx, by) in zip(path, path[1:]))
+    return path[0] == start and path[-1] == goal and steps_ok and not any(walls[x, y] for x, y in path)
+
+
+def reference_distances(walls, start):
+    """Plain dict-based BFS distances from start"""
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y)):
+            if (0 <= nx < walls.shape[0] and 0 <= ny < walls.shape[1] and
+                    not walls[nx, ny] and (nx, ny) not in distances):
+                distances[(nx, ny)] = distances[(x, y)] + 1
+                queue.append((nx, ny))
+    return distances
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_breadth_first_finds_shortest_paths(seed):
+    walls = random_walls(seed)
+    distances = reference_distances(walls, (0, 0))
+
+    for goal in [(14, 14), (7, 3), (0, 0)]:
+        result = breadth_first(walls, (0, 0), (goal,))
+        assert result.found == (goal in distances)
+        if result.found:
+            assert result.cost == len(result.path) - 1 == distances[goal]
+            assert is_valid_path(walls, result.path, (0, 0), goal)
+            assert 1 <= result.expanded <= len(distances)
+
+    field = distance_field(walls, [(0, 0)])
+    assert {(x, y): int(d) for (x, y), d in np.ndenumerate(field) if d >= 0} == distances
+
+
+def test_breadth_first_stops_at_the_nearest_goal():
+    walls = np.zeros((10, 10), dtype=bool)
+
+    result = breadth_first(walls, (5, 5), [(0, 0), (5, 7), (9, 9), (50, 50)])
+
+    assert result.path == [(5, 5), (5, 6), (5, 7)]
+    assert not breadth_first(walls, (5, 5), [(50, 50)]).found
+
+
+def test_breadth_first_parent_tree_and_budget():
+    walls = np.zeros((6, 6), dtype=bool)
+    walls[3, :] = True  # Cuts the grid in two
+
+    full = breadth_first(walls, (0, 0), (), early_exit=False)
+    reached = np.frombuffer(full.parent, dtype=np.int32).reshape(6, 6) >= 0
+    expected = np.zeros((6, 6), dtype=bool)
+    expected[:3, :] = True
+    assert np.array_equal(reached, expected)
+    assert full.expanded == 18 and not full.found
+
+    limited = breadth_first(walls, (0, 0), [(2, 5)], max_expansions=5)
+    assert limited.budget_exhausted and not limited.found and limited.expanded == 5
+    assert breadth_first(walls, (0, 0), [(2, 5)]).cost == 7
+
+
+def test_maze_and_agent_searches_use_the_engine():
+    maze = Maze(30, 30, 0.3, use_fixed_maze=False, seed=4)
+    maze.generate()
+    agent = RobotAgent(0, *maze.exit_pos, 100, 2, None)
+
+    path = agent._calculate_clean_path(maze)
+
+    assert path == bfs(maze.start_pos, maze.exit_pos, maze) == maze.find_path(maze.start_pos, maze.exit_pos).path
+    assert path[0] == maze.start_pos and path[-1] == maze.exit_pos
+    assert agent.nodes_expanded == breadth_first(maze, maze.start_pos, (maze.exit_pos,)).expanded > 0
+    assert maze._path_exists()
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_astar_and_dijkstra_find_shortest_paths(seed):
+    walls = random_walls(seed)
+    start, goal = (0, 0), (14, 14)
+    shortest = breadth_first(walls, start, (goal,))
+
+    for result in (astar_search(walls, start, (goal,)), dijkstra(walls, start, (goal,))):
+        assert result.found == shortest.found
+        if shortest.found:
+            assert result.cost == len(shortest.path) - 1
+            assert is_valid_path(walls, result.path, start, goal)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_greedy_early_exit(seed):
+    walls = random_walls(seed)
+    start, goal = (0, 0), (14, 14)
+
+    early = greedy_best_first(walls, start, (goal,))
+    full = greedy_best_first(walls, start, (goal,), early_exit=False)
+
+    assert early.path == full.path
+    assert early.expanded <= full.expanded
+    if early.found:
+        assert is_valid_path(walls, early.path, start, goal)
+    # Without early exit the search tree covers everything BFS can reach
+    reachable = np.frombuffer(breadth_first(walls, start, (), early_exit=False).parent, dtype=np.int32) >= 0
+    assert np.array_equal(np.frombuffer(full.parent, dtype=np.int32) >= 0, reachable)
+
+
+def test_find_path_passes_options_through():
+    walls = np.zeros((6, 6), dtype=bool)
+
+    result = find_path(walls, (0, 0), [(5, 5)], 'greedy', early_exit=False)
+
+    assert result.expanded == 36
+    assert result.path[-1] == (5, 5)
+    with pytest.raises(ValueError, match="Unknown search algorithm"):
+        find_path(walls, (0, 0), [(5, 5)], 'dfs')
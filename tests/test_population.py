@@ -0,0 +1,54 @@
+# Tests for agents.population and the RobotAgent properties backed by it
+
+import numpy as np
+from agents.population import AgentPopulation, DEAD, REACHED_EXIT
+from agents.robot_agent import RobotAgent
+
+
+def make_agents(count, population):
+    return [RobotAgent(i, 1, 1, 100, 2, None, population=population) for i in range(count)]
+
+
+def test_properties_read_and_write_the_population_row():
+    population = AgentPopulation(3, 1, 1, 100)
+    agents = make_agents(3, population)
+
+    agents[1].x, agents[1].y = 4, 5
+    agents[2].is_dead = True
+
+    assert population.x.tolist() == [1, 4, 1] and population.y.tolist() == [1, 5, 1]
+    assert agents[1].get_position() == (4, 5) and type(agents[1].x) is int
+    assert agents[2].is_dead and not agents[2].is_active() and agents[0].is_active()
+    assert population.indices_with(DEAD).tolist() == [2]
+    assert agents[0].last_position is None
+
+
+def test_bulk_move_matches_per_agent_moves():
+    bulk = AgentPopulation(4, 1, 1, 100)
+    single = AgentPopulation(4, 1, 1, 100)
+    bulk_agents, single_agents = make_agents(4, bulk), make_agents(4, single)
+    moves = [([1, 3], [2, 1], [1, 2]), ([3], [3], [2])]
+
+    for indices, xs, ys in moves:
+        bulk.move(np.array(indices), np.array(xs), np.array(ys))
+        for i, x, y in zip(indices, xs, ys):
+            bulk_agents[i].record_move((x, y))
+            single_agents[i].move((x, y))
+
+    for field in ('x', 'y', 'last_x', 'last_y'):
+        assert np.array_equal(getattr(bulk, field), getattr(single, field))
+    for moved, reference in zip(bulk_agents, single_agents):
+        assert moved.path_history == reference.path_history
+        assert moved.visit_counts == reference.visit_counts
+        assert moved.last_position == reference.last_position
+    assert bulk_agents[3].get_position() == (3, 2) and bulk_agents[3].last_position == (1, 2)
+
+
+def test_record_arrivals_stamps_each_agent_once():
+    population = AgentPopulation(3, 0, 0, 10)
+    population.set_status(1, REACHED_EXIT, True)
+
+    assert population.record_arrivals(4) == 1
+    population.set_status(2, REACHED_EXIT, True)
+    assert population.record_arrivals(7) == 1
+    assert population.exit_step.tolist() == [-1, 4, 7]
@@ -0,0 +1,70 @@
+# Tests for coordination.reservation
+
+from coordination.reservation import ReservationTable
+
+
+class CorridorField:
+    """Evacuation route along y = 0 toward x = exit_x"""
+
+    def __init__(self, exit_x):
+        self.exit_pos = (exit_x, 0)
+
+    def next_cell(self, position):
+        x, y = position
+        return (x + 1, y) if x < self.exit_pos[0] else None
+
+    def distance_to_exit(self, position):
+        return self.exit_pos[0] - position[0]
+
+
+class Evacuee:
+    def __init__(self, agent_id, position, field):
+        self.id = agent_id
+        self.position = position
+        self.exit_field = field
+
+    def get_position(self):
+        return self.position
+
+
+def test_convoy_moves_together_behind_the_leader():
+    field = CorridorField(10)
+    agents = [Evacuee(0, (1, 0), field), Evacuee(1, (2, 0), field), Evacuee(2, (3, 0), field)]
+
+    moves = ReservationTable(horizon=4).plan(agents, step=0)
+
+    # Everyone steps into the cell the agent ahead is leaving
+    assert moves == {0: (2, 0), 1: (3, 0), 2: (4, 0)}
+
+
+def test_followers_wait_behind_a_blocked_leader():
+    field = CorridorField(10)
+    agents = [Evacuee(0, (1, 0), field), Evacuee(1, (2, 0), field)]
+    table = ReservationTable(horizon=4)
+
+    # Another agent sits in front of the leader and may stay there
+    moves = table.plan(agents, step=0, occupied=[(3, 0)])
+
+    assert moves == {1: None, 0: None}
+    assert table.waits == 2
+
+
+def test_two_agents_never_reserve_the_same_cell():
+    field = CorridorField(10)
+    side_field = CorridorField(10)
+    side_field.next_cell = lambda position: (5, 0)  # Both want (5, 0) next step
+    agents = [Evacuee(0, (4, 0), field), Evacuee(1, (2, 1), side_field)]
+
+    moves = ReservationTable(horizon=2).plan(agents, step=0)
+
+    assert moves[0] == (5, 0)  # Closer to the exit, planned first
+    assert moves[1] is None
+
+
+def test_the_exit_is_not_held_after_arrival():
+    field = CorridorField(3)
+    agents = [Evacuee(0, (2, 0), field), Evacuee(1, (1, 0), field)]
+
+    moves = ReservationTable(horizon=4).plan(agents, step=0)
+
+    assert moves == {0: (3, 0), 1: (2, 0)}
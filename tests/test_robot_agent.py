@@ -0,0 +1,53 @@
+# Tests for agents.robot_agent.RobotAgent
+
+from collections import Counter
+
+from agents.communication import CommunicationProtocol
+from agents.robot_agent import RobotAgent
+from coordination.blackboard import Blackboard
+from environment import Maze
+from simulation import Simulator
+
+
+def run_checking_visit_counts(fixed, seed, steps):
+    maze = Maze(46, 46, 0.3, use_fixed_maze=fixed, seed=seed)
+    maze.generate()
+    simulator = Simulator(maze, 8, 250, 2, 10)
+
+    for _ in range(steps):
+        simulator.step()
+        for agent in simulator.agents:
+            assert agent.visit_counts == Counter(agent.path_history)
+
+
+def test_visit_counts_track_path_history():
+    run_checking_visit_counts(True, 0, 200)
+    run_checking_visit_counts(False, 0, 300)
+
+
+def test_dead_end_backtrack_forgets_the_popped_visit():
+    maze = Maze(6, 6)
+    agent = RobotAgent(0, 1, 1, 100, 2, None)
+    for position in [(2, 1), (2, 2), (2, 3)]:
+        agent.move(position)
+    agent.known_dead_ends.update(maze.get_neighbors(2, 3))  # Every way out is reported dead
+
+    target = agent.decide_next_move(maze, Blackboard(maze), CommunicationProtocol())
+
+    assert target == (2, 2)
+    assert agent.path_history == [(1, 1), (2, 1), (2, 2)]
+    assert agent.visit_counts == Counter(agent.path_history)
+    agent.move(target)
+    assert agent.visit_counts == Counter(agent.path_history)
+
+
+def test_move_and_forget_keep_counts_in_step():
+    agent = RobotAgent(0, 1, 1, 100, 2, None)
+    for position in [(1, 2), (1, 1), (1, 2), (2, 2)]:
+        agent.move(position)
+
+    assert agent.visit_counts == {(1, 1): 2, (1, 2): 2, (2, 2): 1}
+
+    agent._forget_visit(agent.path_history.pop())
+    agent._forget_visit(agent.path_history.pop())
+    assert agent.visit_counts == Counter(agent.path_history) == {(1, 1): 2, (1, 2): 1}
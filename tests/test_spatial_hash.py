@@ -0,0 +1,76 @@
+# Tests for utils.spatial_hash and range-limited delivery built on it
+
+import random
+
+import pytest
+from agents.communication import CommunicationProtocol
+from agents.robot_agent import RobotAgent
+from utils.spatial_hash import SpatialHash
+
+
+def in_range(positions, x, y, radius):
+    return sorted(item for item, (px, py) in positions.items() if abs(px - x) + abs(py - y) <= radius)
+
+
+@pytest.mark.parametrize('cell_size, radius', [(1, 1), (3, 3), (3, 5), (8, 2), (0, 0)])
+def test_query_matches_brute_force(cell_size, radius):
+    rng = random.Random(cell_size * 10 + radius)
+    index = SpatialHash(cell_size)
+    positions = {}
+
+    for _ in range(500):
+        item = rng.randrange(40)
+        if rng.random() < 0.2:
+            index.remove(item)
+            positions.pop(item, None)
+        else:
+            # Mostly short moves, sometimes a jump across the grid
+            x, y = positions.get(item, (rng.randrange(30), rng.randrange(30)))
+            if rng.random() < 0.1:
+                x, y = rng.randrange(30), rng.randrange(30)
+            x, y = max(0, x + rng.randint(-1, 1)), max(0, y + rng.randint(-1, 1))
+            index.update(item, x, y)
+            positions[item] = (x, y)
+        qx, qy = rng.randrange(30), rng.randrange(30)
+        assert sorted(index.query(qx, qy, radius)) == in_range(positions, qx, qy, radius)
+
+    assert len(index) == len(positions)
+    assert sum(len(bucket) for bucket in index.buckets.values()) == len(positions)
+    assert all(index.buckets.values())  # Emptied buckets are dropped
+
+
+def test_broadcasts_reach_only_agents_in_range():
+    protocol = CommunicationProtocol(16, comm_range=3)
+    for agent_id, position in enumerate([(0, 0), (2, 1), (3, 1), (10, 10)]):
+        protocol.register_agent(agent_id, position)
+
+    protocol.broadcast(0, 'WRONG_PATH', {'position': (0, 0), 'agent_id': 0})
+    protocol.update_position(3, (1, 1))  # Moves into range after the broadcast
+    protocol.broadcast(0, 'WRONG_PATH', {'position': (0, 1), 'agent_id': 0})
+
+    heard = {reader: [msg.content['position'] for msg in protocol.receive_messages(reader)]
+             for reader in range(4)}
+    assert heard == {0: [], 1: [(0, 0), (0, 1)], 2: [], 3: [(0, 1)]}
+    assert sorted(protocol.agents_in_range((0, 0))) == [0, 1, 3]
+
+    protocol.retire_agent(1)
+    assert sorted(protocol.agents_in_range((0, 0))) == [0, 3]
+
+
+def test_unlimited_range_reaches_every_reader():
+    protocol = CommunicationProtocol(16)
+    for agent_id in range(3):
+        protocol.register_agent(agent_id, (agent_id * 100, 0))
+
+    protocol.broadcast(0, 'WRONG_PATH', {'position': (0, 0), 'agent_id': 0})
+
+    assert [len(protocol.receive_messages(reader)) for reader in range(3)] == [0, 1, 1]
+    assert sorted(protocol.agents_in_range((0, 0))) == [0, 1, 2]
+
+
+def test_agents_check_their_own_range():
+    near, far, limited = (RobotAgent(0, 5, 5, 100, 2, None), RobotAgent(1, 9, 5, 100, 2, None),
+                          RobotAgent(2, 5, 8, 100, 2, 3))
+
+    assert near.can_communicate_with(far)  # Unlimited range
+    assert limited.can_communicate_with(near) and not limited.can_communicate_with(far)
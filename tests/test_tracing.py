@@ -0,0 +1,57 @@
+# Tests for utils.tracing
+
+import json
+
+import pytest
+from environment import Maze
+from simulation import Simulator
+from utils.tracing import EVENT_CATEGORIES, EventTracer, NULL_TRACER
+
+
+def read_events(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_only_enabled_categories_are_flagged():
+    tracer = EventTracer(['conflict', 'death'], path=None)
+
+    assert tracer.enabled
+    assert [category for category in EVENT_CATEGORIES if getattr(tracer, category)] == ['conflict', 'death']
+    tracer.close()
+    assert not NULL_TRACER.enabled
+    assert not any(getattr(NULL_TRACER, category) for category in EVENT_CATEGORIES)
+
+
+def test_rejects_unknown_categories():
+    with pytest.raises(ValueError, match="Unknown event categories"):
+        EventTracer(['conflicts'])
+
+
+def test_events_are_written_as_json_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with EventTracer(['conflict'], path=str(path)) as tracer:
+        tracer.step = 3
+        tracer.record_conflict(12, [1, 4], 1)
+        tracer.record_swap(2, 5)
+        assert tracer.events == 2
+
+    assert not tracer.enabled and not tracer.conflict
+    assert read_events(path) == [
+        {'t': 3, 'e': 'conflict', 'cell': 12, 'agents': [1, 4], 'winner': 1},
+        {'t': 3, 'e': 'swap', 'agents': [2, 5]},
+    ]
+
+
+def test_simulation_trace_is_stamped_and_filtered(tmp_path):
+    maze = Maze(46, 46, 0.3, use_fixed_maze=False, seed=2)
+    maze.generate()
+    path = tmp_path / "events.jsonl"
+
+    with EventTracer(['broadcast'], path=str(path)) as tracer:
+        results = Simulator(maze, 5, 250, 2, 10, tracer=tracer).run_until_complete(max_steps=300)
+
+    events = read_events(path)
+    assert events and {event['e'] for event in events} == {'broadcast'}
+    steps = [event['t'] for event in events]
+    assert steps == sorted(steps) and steps[-1] <= results['steps']
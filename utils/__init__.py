@@ -1,2 +1,7 @@
 # Utils package initialization
-__all__ = []
\ No newline at end of file
+from .pathfinding import (SearchResult, breadth_first, dijkstra, astar_search,
+                          greedy_best_first, find_path)
+from .spatial_hash import SpatialHash
+
+__all__ = ['SearchResult', 'breadth_first', 'dijkstra', 'astar_search',
+           'greedy_best_first', 'find_path', 'SpatialHash']
@@ -1,103 +1,410 @@
 # Helper algorithms for pathfinding
+#
+# All searches share one representation: cells are flat indices
+# (x * height + y), walls are folded into a 4-bit open-direction mask per cell,
+# and the open/closed sets live in flat arrays (parent pointers, a closed
+# bytearray, g-costs) sized to the grid. Each function accepts either a Maze
+# (its cached masks are reused) or a raw (width, height) grid array.
 
+from array import array
 from collections import deque
+from functools import lru_cache
 import heapq
 
+import numpy as np
+
+ALGORITHMS = ('bfs', 'dijkstra', 'astar', 'greedy')
+
+_INFINITY = float('inf')
+
+
+class SearchResult:
+    """Outcome of a search: the path found (or None) and the work it took"""
+
+    __slots__ = ('path', 'expanded', 'cost', 'parent', 'budget_exhausted')
+
+    def __init__(self, path, expanded, cost=None, parent=None, budget_exhausted=False):
+        self.path = path          # List of (x, y) from start to goal, or None
+        self.expanded = expanded  # Number of nodes taken off the frontier
+        self.cost = cost          # Path cost (number of moves for unit costs)
+        self.parent = parent      # Flat parent-pointer array (-1 = never reached)
+        self.budget_exhausted = budget_exhausted  # Stopped by max_expansions
+
+    @property
+    def found(self):
+        return self.path is not None
+
+    def __repr__(self):
+        length = len(self.path) if self.path else None
+        return f"SearchResult(length={length}, expanded={self.expanded})"
+
+
+def open_dirs_from_walls(walls):
+    """
+    Compute 4-bit open-direction masks for a grid.
+    Bit i is set when the neighbor at Maze DIRECTIONS[i] -- (0, 1), (1, 0),
+    (0, -1), (-1, 0) -- is inside the grid and not a wall.
+
+    Args:
+        walls: (width, height) boolean array, True for walls
+
+    Returns:
+        (width, height) uint8 array of masks
+    """
+    is_open = (~walls).astype(np.uint8)
+    mask = np.zeros(walls.shape, dtype=np.uint8)
+    mask[:, :-1] |= is_open[:, 1:]       # (0, 1)
+    mask[:-1, :] |= is_open[1:, :] << 1  # (1, 0)
+    mask[:, 1:] |= is_open[:, :-1] << 2  # (0, -1)
+    mask[1:, :] |= is_open[:-1, :] << 3  # (-1, 0)
+    return mask
+
+
+def manhattan(goals):
+    """
+    Build the default heuristic: Manhattan distance to the nearest goal
+
+    Args:
+        goals: Collection of goal positions
+
+    Returns:
+        Callable (x, y) -> estimated remaining cost
+    """
+    goals = list(goals)
+    if len(goals) == 1:
+        gx, gy = goals[0]
+        return lambda x, y: abs(x - gx) + abs(y - gy)
+    return lambda x, y: min(abs(x - gx) + abs(y - gy) for gx, gy in goals)
+
+
+def breadth_first(grid, start, goals, max_expansions=None, early_exit=True):
+    """
+    Parent-pointer Breadth-First Search (unit move cost)
+
+    Args:
+        grid: Maze object or (width, height) wall/flag array
+        start: Starting position (x, y)
+        goals: Collection of goal positions; the search stops at the nearest one
+        max_expansions: Give up after expanding this many nodes (None = no limit)
+        early_exit: Stop at the first goal; when False the whole reachable area is
+                    searched and result.parent holds the complete BFS tree
+
+    Returns:
+        SearchResult with the shortest path to the nearest goal (None if no goal is
+        reachable or the budget ran out) and the number of nodes expanded
+    """
+    width, height, open_dirs = _search_space(grid)
+    goal_indices = _goal_indices(goals, width, height)
+    mask_steps = _mask_steps(height)
+    parent = array('i', [-1]) * (width * height)
+    start_index = start[0] * height + start[1]
+    parent[start_index] = start_index
+    queue = deque([start_index])
+    expanded = 0
+    found = -1
+
+    while queue:
+        if max_expansions is not None and expanded >= max_expansions:
+            return _finish(found, parent, height, expanded, budget_exhausted=True)
+        index = queue.popleft()
+        expanded += 1
+
+        if found < 0 and index in goal_indices:
+            found = index
+            if early_exit:
+                break
+
+        for step in mask_steps[open_dirs[index]]:
+            neighbor = index + step
+            if parent[neighbor] < 0:
+                parent[neighbor] = index
+                queue.append(neighbor)
+
+    return _finish(found, parent, height, expanded)
+
+
+def distance_field(grid, sources):
+    """
+    Multi-source BFS: move count from every cell to the nearest source
+
+    Args:
+        grid: Maze object or (width, height) wall/flag array
+        sources: Collection of source positions (distance 0)
+
+    Returns:
+        (width, height) int32 array of distances, -1 where no source is reachable
+    """
+    width, height, open_dirs = _search_space(grid)
+    mask_steps = _mask_steps(height)
+    distance = array('i', [-1]) * (width * height)
+    queue = deque()
+    for index in _goal_indices(sources, width, height):
+        distance[index] = 0
+        queue.append(index)
+
+    while queue:
+        index = queue.popleft()
+        next_distance = distance[index] + 1
+        for step in mask_steps[open_dirs[index]]:
+            neighbor = index + step
+            if distance[neighbor] < 0:
+                distance[neighbor] = next_distance
+                queue.append(neighbor)
+
+    return np.frombuffer(distance, dtype=np.int32).reshape(width, height).copy()
+
+
+def dijkstra(grid, start, goals, costs=None, max_expansions=None, early_exit=True):
+    """
+    Dijkstra's algorithm
+
+    Args:
+        grid: Maze object or (width, height) wall/flag array
+        start: Starting position (x, y)
+        goals: Collection of goal positions
+        costs: Optional (width, height) array with the cost of entering each cell
+               (default 1 everywhere, which makes this equivalent to BFS)
+        max_expansions: Give up after expanding this many nodes (None = no limit)
+        early_exit: Stop once the cheapest goal is settled
+
+    Returns:
+        SearchResult with the cheapest path and its cost
+    """
+    return _best_first(grid, start, goals, None, costs, max_expansions, early_exit, True)
+
+
+def astar_search(grid, start, goals, heuristic=None, costs=None, max_expansions=None,
+                 early_exit=True):
+    """
+    A* search
+
+    Args:
+        grid: Maze object or (width, height) wall/flag array
+        start: Starting position (x, y)
+        goals: Collection of goal positions
+        heuristic: Callable (x, y) -> estimate of the remaining cost; must be
+                   consistent (h(a) <= cost(a, b) + h(b) for neighbors a, b) for
+                   the path to be optimal, since nodes are closed when first
+                   taken off the frontier (default: manhattan)
+        costs: Optional (width, height) array with the cost of entering each cell
+        max_expansions: Give up after expanding this many nodes (None = no limit)
+        early_exit: Stop once the first goal is settled
+
+    Returns:
+        SearchResult with the path found and its cost
+    """
+    goals = list(goals)
+    if heuristic is None:
+        heuristic = manhattan(goals)
+    return _best_first(grid, start, goals, heuristic, costs, max_expansions, early_exit, True)
+
+
+def greedy_best_first(grid, start, goals, heuristic=None, max_expansions=None,
+                      early_exit=True):
+    """
+    Greedy best-first search: always expands the node that looks closest to a goal.
+    Usually expands far fewer nodes than A* but the path is not guaranteed shortest.
+
+    Args:
+        grid: Maze object or (width, height) wall/flag array
+        start: Starting position (x, y)
+        goals: Collection of goal positions
+        heuristic: Callable (x, y) -> estimated distance (default: manhattan)
+        max_expansions: Give up after expanding this many nodes (None = no limit)
+        early_exit: Stop at the first goal taken off the frontier; when False the
+                    whole reachable area is searched (the path is the same) and
+                    result.parent holds the complete search tree
+
+    Returns:
+        SearchResult with the path found
+    """
+    goals = list(goals)
+    if heuristic is None:
+        heuristic = manhattan(goals)
+    return _best_first(grid, start, goals, heuristic, None, max_expansions, early_exit, False)
+
+
+def find_path(grid, start, goals, algorithm='bfs', **options):
+    """
+    Run a search chosen by name
+
+    Args:
+        grid: Maze object or (width, height) wall/flag array
+        start: Starting position (x, y)
+        goals: Collection of goal positions
+        algorithm: One of ALGORITHMS ('bfs', 'dijkstra', 'astar', 'greedy')
+        options: Extra keyword arguments for that search
+
+    Returns:
+        SearchResult
+    """
+    if algorithm == 'bfs':
+        return breadth_first(grid, start, goals, **options)
+    if algorithm == 'dijkstra':
+        return dijkstra(grid, start, goals, **options)
+    if algorithm == 'astar':
+        return astar_search(grid, start, goals, **options)
+    if algorithm == 'greedy':
+        return greedy_best_first(grid, start, goals, **options)
+    raise ValueError(f"Unknown search algorithm {algorithm!r}, expected one of {ALGORITHMS}")
+
 
 def bfs(start, goal, maze):
     """
     Breadth-First Search pathfinding algorithm
-    
+
     Args:
         start: Starting position (x, y)
         goal: Goal position (x, y)
         maze: Maze object
-    
+
     Returns:
         List of positions representing the path, or None if no path exists
     """
-    queue = deque([start])
-    visited = {start}
-    parent = {start: None}
-    
-    while queue:
-        current = queue.popleft()
-        
-        if current == goal:
-            # Reconstruct path
-            path = []
-            while current is not None:
-                path.append(current)
-                current = parent[current]
-            return path[::-1]
-        
-        # TODO: Explore neighbors
-        # for neighbor in get_neighbors(current, maze):
-        #     if neighbor not in visited:
-        #         visited.add(neighbor)
-        #         parent[neighbor] = current
-        #         queue.append(neighbor)
-    
-    return None
+    return breadth_first(maze, start, (goal,)).path
 
 
 def a_star(start, goal, maze):
     """
     A* pathfinding algorithm
-    
+
     Args:
         start: Starting position (x, y)
         goal: Goal position (x, y)
         maze: Maze object
-    
+
     Returns:
         List of positions representing the path, or None if no path exists
     """
-    def heuristic(pos1, pos2):
-        # Manhattan distance
-        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
-    
-    open_set = [(0, start)]
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-    
-    while open_set:
-        current = heapq.heappop(open_set)[1]
-        
-        if current == goal:
-            # Reconstruct path
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            return path[::-1]
-        
-        # TODO: Explore neighbors
-        # for neighbor in get_neighbors(current, maze):
-        #     tentative_g_score = g_score[current] + 1
-        #     
-        #     if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-        #         came_from[neighbor] = current
-        #         g_score[neighbor] = tentative_g_score
-        #         f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
-        #         heapq.heappush(open_set, (f_score[neighbor], neighbor))
-    
-    return None
+    return astar_search(maze, start, (goal,)).path
 
 
 def get_neighbors(position, maze):
     """
     Get valid neighboring positions
-    
+
     Args:
         position: Current position (x, y)
         maze: Maze object
-    
+
     Returns:
         List of valid neighboring positions
     """
-    # TODO: Implement neighbor finding based on maze walls
-    neighbors = []
-    return neighbors
+    return list(maze.get_neighbors(position[0], position[1]))
+
+
+def _search_space(grid):
+    """Get (width, height, flat open-direction bytes) for a Maze or a raw grid array"""
+    if hasattr(grid, 'get_open_dirs_bytes'):
+        return grid.width, grid.height, grid.get_open_dirs_bytes()
+
+    # Imported here: environment.maze itself imports this module
+    from environment.cell import WALL
+
+    walls = np.asarray(grid)
+    if walls.ndim != 2:
+        raise ValueError(f"Expected a 2-D grid array, got shape {walls.shape}")
+    if walls.dtype != np.bool_:
+        walls = (walls & WALL) != 0  # Maze flag array
+    width, height = walls.shape
+    return width, height, open_dirs_from_walls(walls).tobytes()
+
+
+def _goal_indices(goals, width, height):
+    """Flatten goal positions, dropping any outside the grid"""
+    return {x * height + y for x, y in goals if 0 <= x < width and 0 <= y < height}
+
+
+@lru_cache(maxsize=32)
+def _mask_steps(height):
+    """Flat-index offsets for each 4-bit open-direction mask (order of Maze DIRECTIONS)"""
+    offsets = (1, height, -1, -height)  # (0, 1), (1, 0), (0, -1), (-1, 0)
+    return tuple(
+        tuple(offset for bit, offset in enumerate(offsets) if mask & (1 << bit))
+        for mask in range(16)
+    )
+
+
+def _best_first(grid, start, goals, heuristic, costs, max_expansions, early_exit, use_g):
+    """
+    Shared priority-queue engine for Dijkstra (no heuristic), A* (g + h) and
+    greedy best-first (h only, use_g=False). Nodes are closed when popped.
+    """
+    width, height, open_dirs = _search_space(grid)
+    goal_indices = _goal_indices(goals, width, height)
+    mask_steps = _mask_steps(height)
+    size = width * height
+    step_cost = None
+    if costs is not None:
+        step_cost = np.asarray(costs, dtype=np.float64).reshape(size).tolist()
+
+    parent = array('i', [-1]) * size
+    closed = bytearray(size)
+    g_cost = array('d', [_INFINITY]) * size
+    start_index = start[0] * height + start[1]
+    parent[start_index] = start_index
+    g_cost[start_index] = 0.0
+
+    def priority(g, index):
+        if heuristic is None:
+            return g
+        h = heuristic(*divmod(index, height))
+        return g + h if use_g else h
+
+    counter = 0  # FIFO tie-break among equal priorities
+    open_heap = [(priority(0.0, start_index), counter, start_index)]
+    expanded = 0
+    found = -1
+
+    while open_heap:
+        if max_expansions is not None and expanded >= max_expansions:
+            return _finish(found, parent, height, expanded, g_cost, budget_exhausted=True)
+        _, _, index = heapq.heappop(open_heap)
+        if closed[index]:
+            continue  # Stale heap entry
+        closed[index] = 1
+        expanded += 1
+
+        if found < 0 and index in goal_indices:
+            found = index
+            if early_exit:
+                break
+
+        g = g_cost[index]
+        for step in mask_steps[open_dirs[index]]:
+            neighbor = index + step
+            if closed[neighbor]:
+                continue
+            new_g = g + (step_cost[neighbor] if step_cost is not None else 1.0)
+            # Greedy search never revisits; the others relax when a cheaper route appears
+            improved = new_g < g_cost[neighbor] if use_g else parent[neighbor] < 0
+            if improved:
+                g_cost[neighbor] = new_g
+                parent[neighbor] = index
+                counter += 1
+                heapq.heappush(open_heap, (priority(new_g, neighbor), counter, neighbor))
+
+    return _finish(found, parent, height, expanded, g_cost)
+
+
+def _finish(found, parent, height, expanded, g_cost=None, budget_exhausted=False):
+    """Package a search outcome, rebuilding the path to the goal if one was reached"""
+    if found < 0:
+        return SearchResult(None, expanded, parent=parent, budget_exhausted=budget_exhausted)
+    path = _reconstruct_path(parent, found, height)
+    cost = g_cost[found] if g_cost is not None else len(path) - 1
+    return SearchResult(path, expanded, cost=cost, parent=parent,
+                        budget_exhausted=budget_exhausted)
+
+
+def _reconstruct_path(parent, index, height):
+    """Follow parent pointers back to the start and return the path as (x, y) tuples"""
+    path = []
+    while True:
+        path.append(divmod(index, height))
+        previous = parent[index]
+        if previous == index:
+            break
+        index = previous
+    path.reverse()
+    return path
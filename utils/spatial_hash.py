@@ -0,0 +1,83 @@
+# Uniform-grid spatial hash
+#
+# Items (agent ids) are bucketed by the grid cell their position falls in,
+# with cells `cell_size` maze squares wide. With cell_size equal to the query
+# radius, a range query only visits the 3x3 block of buckets around the
+# query point, so its cost follows the number of nearby items rather than
+# the size of the population. Moving an item touches at most two buckets.
+
+
+class SpatialHash:
+    """Uniform-grid bucket index of item positions"""
+
+    def __init__(self, cell_size):
+        """
+        Initialize an empty index
+
+        Args:
+            cell_size: Width of a bucket in maze cells (use the typical query radius)
+        """
+        self.cell_size = max(1, int(cell_size))
+        self.buckets = {}    # (bucket x, bucket y) -> set of items
+        self.positions = {}  # item -> (x, y)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def _bucket_key(self, x, y):
+        return (x // self.cell_size, y // self.cell_size)
+
+    def update(self, item, x, y):
+        """Insert an item or move it to (x, y)"""
+        new_key = self._bucket_key(x, y)
+        old_position = self.positions.get(item)
+        self.positions[item] = (x, y)
+        if old_position is not None:
+            old_key = self._bucket_key(*old_position)
+            if old_key == new_key:
+                return
+            self._discard(old_key, item)
+        self.buckets.setdefault(new_key, set()).add(item)
+
+    def remove(self, item):
+        """Remove an item (no-op if absent)"""
+        position = self.positions.pop(item, None)
+        if position is not None:
+            self._discard(self._bucket_key(*position), item)
+
+    def _discard(self, key, item):
+        bucket = self.buckets[key]
+        bucket.discard(item)
+        if not bucket:
+            del self.buckets[key]
+
+    def query(self, x, y, radius):
+        """
+        Find items within a Manhattan radius
+
+        Args:
+            x, y: Query position
+            radius: Maximum Manhattan distance (inclusive)
+
+        Returns:
+            List of items whose position is within radius of (x, y)
+        """
+        cell_size = self.cell_size
+        low_x, high_x = (x - radius) // cell_size, (x + radius) // cell_size
+        low_y, high_y = (y - radius) // cell_size, (y + radius) // cell_size
+        buckets, positions = self.buckets, self.positions
+
+        found = []
+        for bucket_x in range(low_x, high_x + 1):
+            for bucket_y in range(low_y, high_y + 1):
+                bucket = buckets.get((bucket_x, bucket_y))
+                if not bucket:
+                    continue
+                for item in bucket:
+                    item_x, item_y = positions[item]
+                    if abs(item_x - x) + abs(item_y - y) <= radius:
+                        found.append(item)
+        return found
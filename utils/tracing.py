@@ -0,0 +1,110 @@
+# Structured event tracing
+#
+# Diagnostics that used to be print() calls are emitted as typed events
+# through an EventTracer. Every category has a plain boolean attribute on
+# the tracer, and call sites guard on it:
+#
+#     if tracer.conflict:
+#         tracer.record_conflict(cell, contenders, winner)
+#
+# so a disabled category costs one attribute check - no string formatting,
+# no call. Enabled events are written one per line as compact JSON
+# ({"t": step, "e": event, ...}) to a buffered file.
+
+import json
+import sys
+
+# Event categories (each one a boolean flag on the tracer)
+EVENT_CATEGORIES = ('conflict', 'death', 'broadcast', 'evacuation', 'oscillation')
+
+
+class EventTracer:
+    """Per-category switchable sink for simulation events"""
+
+    def __init__(self, categories=(), path=None, buffer_size=1 << 20):
+        """
+        Initialize the tracer
+
+        Args:
+            categories: Event categories to record (subset of EVENT_CATEGORIES)
+            path: File the events are written to (None = standard output)
+            buffer_size: Write buffer size in bytes
+        """
+        unknown = set(categories) - set(EVENT_CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown event categories {sorted(unknown)} (expected some of {EVENT_CATEGORIES})")
+        for category in EVENT_CATEGORIES:
+            setattr(self, category, category in categories)
+
+        self.step = 0  # Stamped on every event; the simulator advances it
+        self.events = 0  # Events written so far
+        self.path = path
+        self._stream = None
+        if categories:
+            self._stream = sys.stdout if path is None else open(path, 'w', buffering=buffer_size)
+        self._encode = json.JSONEncoder(separators=(',', ':')).encode
+
+    @property
+    def enabled(self):
+        """True if any category is being recorded"""
+        return self._stream is not None
+
+    def emit(self, event, **fields):
+        """Write one event (callers check the category flag first)"""
+        record = {'t': self.step, 'e': event}
+        record.update(fields)
+        self._stream.write(self._encode(record) + '\n')
+        self.events += 1
+
+    def record_conflict(self, cell, agents, winner):
+        """Several agents wanted the same cell; `winner` got it"""
+        self.emit('conflict', cell=cell, agents=agents, winner=winner)
+
+    def record_swap(self, first, second):
+        """Two agents traded cells in one step"""
+        self.emit('swap', agents=[first, second])
+
+    def record_death(self, agent_id, position):
+        """An agent walked into a dead end before the exit was known"""
+        self.emit('death', agent=agent_id, pos=position)
+
+    def record_broadcast(self, message):
+        """A broadcast entered the message log"""
+        recipients = message.recipients
+        self.emit('broadcast', sender=message.sender_id, type=message.message_type,
+                  seq=message.sequence, to=None if recipients is None else len(recipients))
+
+    def record_reroute(self, agent_id, position, reason):
+        """An evacuating agent left the plain follow-the-path behaviour (`reason` says why)"""
+        self.emit('evacuation', agent=agent_id, pos=position, reason=reason)
+
+    def record_oscillation(self, agent_id, cells, counter):
+        """An agent kept revisiting the same few cells"""
+        self.emit('oscillation', agent=agent_id, cells=sorted(cells), counter=counter)
+
+    def flush(self):
+        """Push buffered events to the file"""
+        if self._stream is not None:
+            self._stream.flush()
+
+    def close(self):
+        """Flush and close the file (standard output is only flushed)"""
+        if self._stream is sys.stdout:
+            self._stream.flush()
+        elif self._stream is not None:
+            self._stream.close()
+        self._stream = None
+        for category in EVENT_CATEGORIES:
+            setattr(self, category, False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+
+# Shared tracer with every category off - the default for agents and
+# protocols created without one
+NULL_TRACER = EventTracer()
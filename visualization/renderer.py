@@ -3,6 +3,7 @@
 import pygame
 import config
 import math
+from environment.cell import WALL, START, EXIT, DEAD_END, TRAP
 
 class Renderer:
     """Handles visualization using pygame"""
@@ -47,9 +48,15 @@ class Renderer:
         
     def draw_maze(self):
         """Draw the maze grid"""
+        # Read the flag array and the blackboard's explored layer once per frame
+        # instead of one cell object per lookup
+        flag_rows = self.maze.flags.tolist()
+        explored_rows = self.simulator.blackboard.explored_mask().tolist()
         for x in range(self.maze.width):
+            column = flag_rows[x]
+            explored_column = explored_rows[x] if x < len(explored_rows) else ()
             for y in range(self.maze.height):
-                cell = self.maze.get_cell(x, y)
+                flags = column[y]
                 rect = pygame.Rect(
                     self.maze_offset_x + x * config.CELL_SIZE,
                     y * config.CELL_SIZE,
@@ -58,17 +65,17 @@ class Renderer:
                 )
                 
                 # Determine cell color
-                if cell.is_wall:
+                if flags & WALL:
                     color = config.COLOR_WALL
-                elif cell.is_exit:
+                elif flags & EXIT:
                     color = config.COLOR_EXIT
-                elif cell.is_start:
+                elif flags & START:
                     color = config.COLOR_START
-                elif cell.is_trap:
+                elif flags & TRAP:
                     color = config.COLOR_TRAP  # Show traps in dark red
-                elif cell.is_dead_end:
+                elif flags & DEAD_END:
                     color = config.COLOR_DEAD_END
-                elif len(cell.explored_by) > 0:
+                elif y < len(explored_column) and explored_column[y]:
                     color = config.COLOR_EXPLORED
                 else:
                     color = config.COLOR_PATH
@@ -194,7 +201,7 @@ class Renderer:
                 self.message_log.append({
                     'text': msg_text, 
                     'time': current_time, 
-                    'agent_id': msg.sender_id,
+                    'agent_id': msg.sender_id if not msg.is_batch else msg.content['reports'][0][0],
                     'msg_type': msg.message_type
                 })
                 if len(self.message_log) > self.max_log_messages:
@@ -203,14 +210,17 @@ class Renderer:
                 # Add visual communication effect ONLY for important messages
                 # Show circles only for DEAD_END and EXIT_FOUND
                 if msg.message_type in ['DEAD_END', 'EXIT_FOUND']:
-                    if msg.sender_id < len(self.simulator.agents):
-                        agent = self.simulator.agents[msg.sender_id]
-                        self.active_communications.append({
-                            'from': agent.get_position(),
-                            'type': msg.message_type,
-                            'time': current_time,
-                            'agent_id': msg.sender_id
-                        })
+                    # A batch carries one report per original sender
+                    senders = [sender for sender, _, _ in msg.content['reports']] if msg.is_batch else [msg.sender_id]
+                    for sender_id in senders:
+                        if sender_id < len(self.simulator.agents):
+                            agent = self.simulator.agents[sender_id]
+                            self.active_communications.append({
+                                'from': agent.get_position(),
+                                'type': msg.message_type,
+                                'time': current_time,
+                                'agent_id': sender_id
+                            })
         
         # Draw active communications (expanding circles)
         to_remove = []
@@ -260,6 +270,11 @@ class Renderer:
         msg_type = msg.message_type
         content = msg.content
         
+        if msg.is_batch:
+            senders = sorted({sender for sender, _, _ in content['reports']})
+            positions = content['positions']
+            label = 'Dead ends' if msg_type == 'DEAD_END' else 'Wrong paths'
+            return f"Agents {senders} → ALL: {label} at {positions}"
         if msg_type == 'DEAD_END':
             pos = content.get('position', 'unknown')
             is_trap = content.get('is_trap', False)
@@ -669,7 +684,14 @@ class Renderer:
             num_agents,
             config.AGENT_ENERGY,
             config.AGENT_VISION_RANGE,
-            config.COMMUNICATION_RANGE
+            config.COMMUNICATION_RANGE,
+            broadcast_capacity=config.BROADCAST_CAPACITY,
+            overflow_policy=config.BROADCAST_OVERFLOW_POLICY,
+            communication_mode=config.COMMUNICATION_MODE,
+            coalesce_window=config.BROADCAST_COALESCE_WINDOW,
+            assignment_method=config.ASSIGNMENT_METHOD,
+            reservation_horizon=config.EVACUATION_RESERVATION_HORIZON,
+            tracer=self.simulator.tracer
         )
         
         # Reset visualization state
@@ -690,11 +712,12 @@ class Renderer:
             config.MAZE_WIDTH,
             config.MAZE_HEIGHT,
             config.WALL_DENSITY,
-            use_fixed_maze=False  # Always generate random maze on M key
+            use_fixed_maze=False,  # Always generate random maze on M key
+            search_algorithm=self.maze.search_algorithm
         )
-        self.maze.generate()
+        dead_end_count = self.maze.generate()
         
-        print(f"New maze generated!")
+        print(f"New maze generated! Identified {dead_end_count} dead ends")
         print(f"Start: {self.maze.start_pos}, Exit: {self.maze.exit_pos}")
         
         # Create new simulator with default number of agents
@@ -703,7 +726,14 @@ class Renderer:
             config.NUM_AGENTS,
             config.AGENT_ENERGY,
             config.AGENT_VISION_RANGE,
-            config.COMMUNICATION_RANGE
+            config.COMMUNICATION_RANGE,
+            broadcast_capacity=config.BROADCAST_CAPACITY,
+            overflow_policy=config.BROADCAST_OVERFLOW_POLICY,
+            communication_mode=config.COMMUNICATION_MODE,
+            coalesce_window=config.BROADCAST_COALESCE_WINDOW,
+            assignment_method=config.ASSIGNMENT_METHOD,
+            reservation_horizon=config.EVACUATION_RESERVATION_HORIZON,
+            tracer=self.simulator.tracer
         )
         
         # Reset all visualization state